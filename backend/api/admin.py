@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import WorkoutPlan
+from .models import WorkoutPlan, AICallLog, PlanTemplate
 
 @admin.register(WorkoutPlan)
 class WorkoutPlanAdmin(admin.ModelAdmin):
@@ -7,3 +7,15 @@ class WorkoutPlanAdmin(admin.ModelAdmin):
     list_filter = ('created_at',)
     search_fields = ('name', 'user__username')
 
+
+@admin.register(AICallLog)
+class AICallLogAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'method', 'model', 'latency_ms', 'ttfb_ms', 'prompt_tokens', 'output_tokens', 'finish_reason', 'parse_outcome')
+    list_filter = ('method', 'model', 'parse_outcome', 'finish_reason')
+
+
+@admin.register(PlanTemplate)
+class PlanTemplateAdmin(admin.ModelAdmin):
+    list_display = ('template_key', 'plan_type', 'times_served', 'updated_at')
+    list_filter = ('plan_type', 'goal')
+    search_fields = ('template_key',)
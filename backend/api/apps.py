@@ -3,4 +3,47 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'api'
\ No newline at end of file
+    name = 'api'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .authentication import invalidate_user_cache
+        from .models import User
+
+        # Drop cached session users whenever their row changes
+        post_save.connect(invalidate_user_cache, sender=User, dispatch_uid='auth_user_cache_save')
+        post_delete.connect(invalidate_user_cache, sender=User, dispatch_uid='auth_user_cache_delete')
+
+        # Drop cached dashboards when anything shown on them changes
+        from .services.dashboard import DASHBOARD_MODELS, invalidate_dashboard_for_instance
+        for model in DASHBOARD_MODELS + [User]:
+            post_save.connect(invalidate_dashboard_for_instance, sender=model, dispatch_uid=f'dashboard_save_{model.__name__}')
+            post_delete.connect(invalidate_dashboard_for_instance, sender=model, dispatch_uid=f'dashboard_delete_{model.__name__}')
+
+        # Keep the daily nutrition rollup in step with NutritionLog
+        from django.db.models.signals import pre_save
+        from .models import NutritionLog
+        from .services import nutrition_rollup
+        pre_save.connect(nutrition_rollup.remember_previous_day, sender=NutritionLog, dispatch_uid='nutrition_rollup_pre_save')
+        post_save.connect(nutrition_rollup.update_rollup_on_save, sender=NutritionLog, dispatch_uid='nutrition_rollup_save')
+        post_delete.connect(nutrition_rollup.update_rollup_on_delete, sender=NutritionLog, dispatch_uid='nutrition_rollup_delete')
+
+        # Drop cached training analytics when a user's workout logs change
+        from .models import WorkoutLog
+        from .services.training_analytics import invalidate_training_analytics_for_instance
+        post_save.connect(invalidate_training_analytics_for_instance, sender=WorkoutLog, dispatch_uid='training_analytics_save')
+        post_delete.connect(invalidate_training_analytics_for_instance, sender=WorkoutLog, dispatch_uid='training_analytics_delete')
+
+        # Drop cached goal progress when a user's weight history changes
+        from .models import UserMetrics
+        from .services.goal_progress import invalidate_goal_progress_for_instance
+        post_save.connect(invalidate_goal_progress_for_instance, sender=UserMetrics, dispatch_uid='goal_progress_save')
+        post_delete.connect(invalidate_goal_progress_for_instance, sender=UserMetrics, dispatch_uid='goal_progress_delete')
+
+        # Keep the user's progress totals in step when a plan goes away
+        from .models import WorkoutPlan
+        from .services.plan_completion import refresh_user_counters_on_plan_delete
+        post_delete.connect(refresh_user_counters_on_plan_delete, sender=WorkoutPlan, dispatch_uid='progress_counters_plan_delete')
+
+        # Register system checks
+        from . import checks  # noqa: F401
@@ -1,17 +1,56 @@
 """
 Custom authentication classes for session-based authentication
 """
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from .models import User
 
 
+# -------------------------------
+# Authenticated user cache
+# -------------------------------
+# Users are cached for AUTH_USER_CACHE_TTL seconds across requests so that
+# authenticated API calls don't hit the database just to resolve the session.
+# Any save or delete of a User invalidates its entry (see ApiConfig.ready).
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def get_cached_user(user_id):
+    """
+    Return the User for user_id from the cross-request cache, loading it from
+    the database on a miss. Raises User.DoesNotExist like User.objects.get.
+    """
+    ttl = getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+    if ttl <= 0:
+        return User.objects.get(id=user_id)
+
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.get(id=user_id)
+        cache.set(key, user, ttl)
+    return user
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def invalidate_user_cache(sender, instance, **kwargs):
+    """post_save / post_delete receiver for the User model."""
+    invalidate_cached_user(instance.pk)
+
+
 class SessionAuthentication(BaseAuthentication):
     """
     Custom session authentication that uses Django sessions
     and our custom User model.
     """
-    
+
     def authenticate(self, request):
         """
         Authenticate the request using session data.
@@ -19,18 +58,27 @@ class SessionAuthentication(BaseAuthentication):
         """
         # Check if user_id exists in session
         user_id = request.session.get('user_id')
-        
+
         if not user_id:
             return None
-        
+
+        # Request-scoped cache: the underlying HttpRequest may be wrapped by
+        # more than one DRF Request (e.g. nested api_view calls)
+        http_request = getattr(request, '_request', request)
+        cached = getattr(http_request, '_session_user', None)
+        if cached is not None and str(cached.id) == str(user_id):
+            return (cached, None)
+
         try:
-            user = User.objects.get(id=user_id)
-            return (user, None)  # DRF expects (user, auth) tuple
+            user = get_cached_user(user_id)
         except User.DoesNotExist:
             # Session references non-existent user, clear it
             request.session.flush()
             return None
-    
+
+        http_request._session_user = user
+        return (user, None)  # DRF expects (user, auth) tuple
+
     def authenticate_header(self, request):
         """
         Return a string to be used as the value of the WWW-Authenticate
@@ -0,0 +1,32 @@
+"""
+Django system checks for deployment configuration
+"""
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+DB_POOL_MODES = ('none', 'persistent', 'pgbouncer')
+
+
+@register('database')
+def check_database_connection_budget(app_configs, **kwargs):
+    """Warn when persistent connections could exceed the database connection cap."""
+    mode = getattr(settings, 'DB_POOL_MODE', 'none')
+    if mode not in DB_POOL_MODES:
+        return [Error(
+            f"DB_POOL_MODE must be one of {', '.join(DB_POOL_MODES)}, got {mode!r}",
+            id='api.E001',
+        )]
+    if mode == 'none':
+        return []
+
+    connections = settings.WEB_CONCURRENCY * settings.WEB_THREADS
+    if connections > settings.DB_CONNECTION_LIMIT:
+        return [Warning(
+            f"{settings.WEB_CONCURRENCY} workers x {settings.WEB_THREADS} threads can hold "
+            f"{connections} persistent database connections, above DB_CONNECTION_LIMIT "
+            f"({settings.DB_CONNECTION_LIMIT})",
+            hint="Lower WEB_CONCURRENCY/WEB_THREADS, use DB_POOL_MODE=pgbouncer with "
+                 "Supabase's transaction pooler, or set DB_POOL_MODE=none.",
+            id='api.W001',
+        )]
+    return []
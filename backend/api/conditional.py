@@ -0,0 +1,55 @@
+"""
+Conditional GET (ETag / If-None-Match) helpers.
+
+ETags are weak - the same JSON may be sent gzipped or brotli-compressed -
+and are compared weakly, as RFC 9110 requires for If-None-Match. Views
+compute the ETag from cheap version data (a row's updated_at, a cached
+payload's hash) and only build the body when the client's copy is stale,
+so a 304 costs no serialization at all.
+"""
+import hashlib
+
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """Weak ETag from the given version parts."""
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def content_etag(content):
+    """Weak ETag hashed from rendered content (bytes)."""
+    return f'W/"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+
+
+def _opaque(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def etag_matches(request, etag):
+    """True when the request's If-None-Match names etag (or is *)."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in parse_etags(header)}
+
+
+def conditional_response(request, etag, build_data):
+    """
+    304 when the client already has etag, otherwise a 200 with
+    build_data(). Either way the ETag is set and clients are told to
+    revalidate (private, no-cache) before reusing their copy.
+    """
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(build_data())
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
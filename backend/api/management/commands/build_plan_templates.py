@@ -0,0 +1,123 @@
+from django.core.management.base import BaseCommand
+from api.models import PlanTemplate
+from api.services import plan_templates, get_ai_service, get_exercise_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Pre-generate workout and meal plan templates for the common parameter grid'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            choices=['workout', 'meal', 'all'],
+            default='all',
+            help='Which template library to build (default: all)',
+        )
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='Regenerate templates that already exist',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the grid cells that would be generated without calling Gemini',
+        )
+
+    def handle(self, *args, **options):
+        existing = set(PlanTemplate.objects.values_list('template_key', flat=True))
+        overwrite = options['overwrite']
+
+        workout_cells = []
+        meal_cells = []
+        if options['type'] in ('workout', 'all'):
+            workout_cells = [
+                cell for cell in plan_templates.workout_grid()
+                if overwrite or plan_templates.workout_template_key(*cell) not in existing
+            ]
+        if options['type'] in ('meal', 'all'):
+            meal_cells = [
+                cell for cell in plan_templates.meal_grid()
+                if overwrite or plan_templates.meal_template_key(*cell) not in existing
+            ]
+
+        self.stdout.write(f'{len(workout_cells)} workout and {len(meal_cells)} meal templates to generate')
+        if options['dry_run']:
+            for cell in workout_cells:
+                self.stdout.write(f'  {plan_templates.workout_template_key(*cell)}')
+            for cell in meal_cells:
+                self.stdout.write(f'  {plan_templates.meal_template_key(*cell)}')
+            return
+        if not workout_cells and not meal_cells:
+            self.stdout.write(self.style.SUCCESS('Template library is up to date'))
+            return
+
+        ai_service = get_ai_service()
+
+        built = failed = 0
+        if workout_cells:
+            exercise_service = get_exercise_service()
+            for goal, level, days in workout_cells:
+                if self._build_workout(ai_service, exercise_service, goal, level, days):
+                    built += 1
+                else:
+                    failed += 1
+
+        for goal, calories, preferences in meal_cells:
+            if self._build_meal(ai_service, goal, calories, preferences):
+                built += 1
+            else:
+                failed += 1
+
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(f'Built {built} templates ({failed} failed)'))
+
+    def _build_workout(self, ai_service, exercise_service, goal, level, days):
+        key = plan_templates.workout_template_key(goal, level, days)
+        try:
+            ai_result = ai_service.generate_exercise_plan(
+                user_goal=goal,
+                experience_level=level,
+                days_per_week=days,
+                user_profile={}
+            )
+            if not ai_result.get('success'):
+                self.stdout.write(self.style.ERROR(f'{key}: {ai_result.get("error", "generation failed")}'))
+                return False
+
+            enriched = exercise_service.enrich_workout_plan(ai_result)
+            if enriched.get('success'):
+                plan_templates.store_workout_template(goal, level, days, enriched['data'], enriched.get('enrichment_stats'))
+            else:
+                plan_templates.store_workout_template(goal, level, days, ai_result['data'])
+                self.stdout.write(self.style.WARNING(f'{key}: stored without enrichment'))
+            self.stdout.write(f'{key}: ok')
+            return True
+        except Exception as e:
+            logger.error(f"Failed to build workout template {key}: {e}")
+            self.stdout.write(self.style.ERROR(f'{key}: {e}'))
+            return False
+
+    def _build_meal(self, ai_service, goal, calories, preferences):
+        key = plan_templates.meal_template_key(goal, calories, preferences)
+        try:
+            ai_result = ai_service.generate_meal_plan(
+                user_goal=goal,
+                daily_calorie_target=calories,
+                dietary_preferences=preferences,
+                user_profile={}
+            )
+            if not ai_result.get('success'):
+                self.stdout.write(self.style.ERROR(f'{key}: {ai_result.get("error", "generation failed")}'))
+                return False
+
+            plan_templates.store_meal_template(goal, calories, preferences, ai_result['data'])
+            self.stdout.write(f'{key}: ok')
+            return True
+        except Exception as e:
+            logger.error(f"Failed to build meal template {key}: {e}")
+            self.stdout.write(self.style.ERROR(f'{key}: {e}'))
+            return False
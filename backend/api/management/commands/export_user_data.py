@@ -0,0 +1,59 @@
+import sys
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from api.models import User
+from api.services.export import EXPORT_SOURCES, FORMATS, export_stream
+
+
+class Command(BaseCommand):
+    help = "Stream a user's full history to a file (or stdout) as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument('user', help='User id or username')
+        parser.add_argument(
+            '--format',
+            choices=list(FORMATS),
+            default='ndjson',
+            help='Output format (default: ndjson)',
+        )
+        parser.add_argument(
+            '--type',
+            action='append',
+            choices=list(EXPORT_SOURCES),
+            help='Record type to export; repeat for several (default: all, csv needs exactly one)',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Gzip the output',
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write (default: stdout)',
+        )
+
+    def handle(self, *args, **options):
+        lookup = Q(username=options['user'])
+        try:
+            lookup |= Q(id=uuid.UUID(options['user']))
+        except ValueError:
+            pass
+        user = User.objects.filter(lookup).first()
+        if user is None:
+            raise CommandError(f"User {options['user']} not found")
+
+        try:
+            stream = export_stream(user, options['format'], options['type'], gzip=options['gzip'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                written = sum(output.write(chunk) for chunk in stream)
+            self.stderr.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}"))
+        else:
+            for chunk in stream:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
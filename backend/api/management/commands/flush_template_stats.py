@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.services import plan_templates
+
+
+class Command(BaseCommand):
+    help = 'Add plan template hits counted in the cache to PlanTemplate.times_served (run periodically)'
+
+    def handle(self, *args, **options):
+        count = plan_templates.flush_served_counts()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {count} plan template hits'))
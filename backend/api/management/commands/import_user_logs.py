@@ -0,0 +1,56 @@
+import json
+import sys
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from api.models import User
+from api.services.log_import import FORMATS, IMPORT_TYPES, import_logs
+
+
+class Command(BaseCommand):
+    help = "Import a user's historical workout/nutrition logs from an NDJSON or CSV file (optionally gzipped)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('user', help='User id or username')
+        parser.add_argument('path', help="File to import ('-' for stdin)")
+        parser.add_argument(
+            '--format',
+            choices=list(FORMATS),
+            help='Input format (default: from the file name, else ndjson)',
+        )
+        parser.add_argument(
+            '--type',
+            choices=list(IMPORT_TYPES),
+            help='Record type (required for csv; filters ndjson)',
+        )
+
+    def handle(self, *args, **options):
+        lookup = Q(username=options['user'])
+        try:
+            lookup |= Q(id=uuid.UUID(options['user']))
+        except ValueError:
+            pass
+        user = User.objects.filter(lookup).first()
+        if user is None:
+            raise CommandError(f"User {options['user']} not found")
+
+        path = options['path']
+        import_format = options['format'] or ('csv' if path.lower().endswith(('.csv', '.csv.gz')) else 'ndjson')
+        try:
+            if path == '-':
+                summary = import_logs(user, sys.stdin.buffer, import_format, options['type'])
+            else:
+                with open(path, 'rb') as stream:
+                    summary = import_logs(user, stream, import_format, options['type'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in summary['errors']:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        if summary['errors_truncated']:
+            self.stderr.write(f"... {summary['invalid'] - len(summary['errors'])} more invalid rows")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {summary['created']} of {summary['processed']} rows "
+            f"({summary['duplicates']} duplicates, {summary['invalid']} invalid, {summary['skipped']} skipped)"
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from api.services import nutrition_rollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily nutrition summary table from NutritionLog'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Only rebuild summaries for this user id',
+        )
+
+    def handle(self, *args, **options):
+        count = nutrition_rollup.rebuild(user_id=options['user'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {count} daily nutrition summaries'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from api.services import plan_completion
+
+
+class Command(BaseCommand):
+    help = 'Reset workout streaks that were not extended yesterday or today (run daily)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Also recompute completed counts and percentages from the completion rows',
+        )
+        parser.add_argument(
+            '--user',
+            help='Only rebuild counters for this user id (with --rebuild)',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            users = plan_completion.rebuild_counters(user_id=options['user'])
+            self.stdout.write(f'Rebuilt progress counters for {users} users')
+
+        plans, users = plan_completion.reset_stale_streaks()
+        self.stdout.write(self.style.SUCCESS(f'Reset {plans} plan streaks and {users} user streaks'))
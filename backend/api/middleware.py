@@ -0,0 +1,93 @@
+"""
+Custom middleware
+"""
+import re
+import time
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SESSION_REFRESHED_AT_KEY = '_refreshed_at'
+
+COMPRESSIBLE_CONTENT_TYPES = ('application/json',)
+BROTLI_QUALITY = 5
+
+re_accepts_brotli = re.compile(r'\bbr\b')
+
+
+class SlidingSessionMiddleware:
+    """
+    Sliding session expiry without a session write on every request.
+
+    Replaces SESSION_SAVE_EVERY_REQUEST: an authenticated session is only
+    marked modified (so SessionMiddleware saves it and re-issues the cookie
+    with a fresh max-age) once less than SESSION_REFRESH_THRESHOLD seconds
+    of its lifetime remain. Must be listed after SessionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        session = getattr(request, 'session', None)
+        if session is not None and session.get('user_id'):
+            self.refresh(session)
+        return response
+
+    def refresh(self, session):
+        now = int(time.time())
+        if session.modified:
+            # Being saved anyway; the cookie expiry restarts now
+            session[SESSION_REFRESHED_AT_KEY] = now
+            return
+
+        refreshed_at = session.get(SESSION_REFRESHED_AT_KEY)
+        if refreshed_at is None:
+            session[SESSION_REFRESHED_AT_KEY] = now
+            return
+
+        remaining = settings.SESSION_COOKIE_AGE - (now - refreshed_at)
+        if remaining < settings.SESSION_REFRESH_THRESHOLD:
+            session[SESSION_REFRESHED_AT_KEY] = now
+
+
+class JSONCompressionMiddleware(GZipMiddleware):
+    """
+    Compress JSON responses of at least RESPONSE_COMPRESSION_MIN_BYTES.
+
+    Uses brotli when the client accepts it and the brotli package is
+    installed, otherwise gzip through GZipMiddleware (which adds its BREACH
+    mitigation and weakens strong ETags). Smaller, streaming and non-JSON
+    responses - exports, 304s - pass through untouched. Must be listed
+    above any middleware that reads or changes the response body.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+        if len(response.content) < getattr(settings, 'RESPONSE_COMPRESSION_MIN_BYTES', 1024):
+            return response
+
+        if brotli is not None and re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            patch_vary_headers(response, ('Accept-Encoding',))
+            compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+            etag = response.get('ETag')
+            if etag and etag.startswith('"'):
+                response.headers['ETag'] = 'W/' + etag
+            response.headers['Content-Encoding'] = 'br'
+            return response
+
+        return super().process_response(request, response)
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:52
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0007_add_is_active_to_workout_plan"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AICallLog",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("model", models.CharField(max_length=100)),
+                ("method", models.CharField(max_length=100)),
+                ("prompt_tokens", models.IntegerField(blank=True, null=True)),
+                ("output_tokens", models.IntegerField(blank=True, null=True)),
+                (
+                    "ttfb_ms",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Time to first streamed chunk in milliseconds",
+                        null=True,
+                    ),
+                ),
+                ("latency_ms", models.FloatField(blank=True, null=True)),
+                (
+                    "finish_reason",
+                    models.CharField(blank=True, max_length=50, null=True),
+                ),
+                (
+                    "parse_outcome",
+                    models.CharField(
+                        choices=[
+                            ("full", "Full"),
+                            ("partial", "Partial"),
+                            ("failed", "Failed"),
+                            ("error", "Error"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "estimated_cost_usd",
+                    models.DecimalField(
+                        blank=True, decimal_places=6, max_digits=10, null=True
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "ai_call_logs",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:56
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0008_aicalllog"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlanTemplate",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "plan_type",
+                    models.CharField(
+                        choices=[("workout", "Workout Plan"), ("meal", "Meal Plan")],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "template_key",
+                    models.CharField(
+                        help_text="Normalized lookup key for the generation parameters",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                ("goal", models.CharField(max_length=100)),
+                (
+                    "experience_level",
+                    models.CharField(blank=True, default="", max_length=50),
+                ),
+                ("days_per_week", models.IntegerField(blank=True, null=True)),
+                ("daily_calorie_target", models.IntegerField(blank=True, null=True)),
+                ("dietary_preferences", models.JSONField(blank=True, default=list)),
+                ("plan_data", models.JSONField(default=dict)),
+                ("enrichment_stats", models.JSONField(blank=True, default=dict)),
+                ("times_served", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "plan_templates",
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:06
+
+from django.db import migrations, models
+
+
+def backfill_summary_columns(apps, schema_editor):
+    WorkoutPlan = apps.get_model("api", "WorkoutPlan")
+    for workout_plan in WorkoutPlan.objects.all().iterator():
+        data = workout_plan.workout_plan_data or {}
+        plan = data.get("data") if isinstance(data.get("data"), dict) else data
+        days = [day for day in plan.get("days") or [] if isinstance(day, dict)]
+        exercise_count = sum(len(day.get("exercises") or []) for day in days)
+        completed = 0
+        for day in (data.get("exercise_completions") or {}).values():
+            if isinstance(day, dict):
+                completed += sum(1 for entry in day.values() if isinstance(entry, dict) and entry.get("completed"))
+        WorkoutPlan.objects.filter(pk=workout_plan.pk).update(
+            day_count=len(days),
+            exercise_count=exercise_count,
+            completed_exercise_count=min(completed, exercise_count),
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0009_plantemplate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workoutplan",
+            name="completed_exercise_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="workoutplan",
+            name="day_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="workoutplan",
+            name="exercise_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_summary_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0010_workoutplan_summary_columns"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                fields=["user", "-created_at"], name="goals_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="goal",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["user", "-created_at"],
+                name="goals_user_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mealplan",
+            index=models.Index(
+                fields=["user", "-created_at"], name="meal_plans_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="nutritionlog",
+            index=models.Index(
+                fields=["user", "-date_eaten"], name="nutrition_log_user_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="usermetrics",
+            index=models.Index(
+                fields=["user", "-date_recorded"], name="user_metrics_user_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workoutlog",
+            index=models.Index(
+                fields=["user", "-date_performed"], name="workout_log_user_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workoutplan",
+            index=models.Index(
+                fields=["user", "-created_at"], name="workout_plans_user_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workoutplan",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["user"],
+                name="workout_plans_user_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workoutplancompletionlog",
+            index=models.Index(
+                fields=["user", "-logged_at"], name="completion_logs_user_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workoutplancompletionlog",
+            index=models.Index(
+                fields=["workout_plan", "-logged_at"], name="completion_logs_plan_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0011_user_time_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="nutritionlog",
+            name="client_id",
+            field=models.UUIDField(
+                blank=True,
+                help_text="Client-generated idempotency key for bulk uploads",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="workoutlog",
+            name="client_id",
+            field=models.UUIDField(
+                blank=True,
+                help_text="Client-generated idempotency key for bulk uploads",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="workoutlog",
+            name="date_performed",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddConstraint(
+            model_name="nutritionlog",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("client_id__isnull", False)),
+                fields=("user", "client_id"),
+                name="nutrition_log_client_id_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="workoutlog",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("client_id__isnull", False)),
+                fields=("user", "client_id"),
+                name="workout_log_client_id_uniq",
+            ),
+        ),
+    ]
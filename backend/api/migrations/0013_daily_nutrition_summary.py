@@ -0,0 +1,96 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:13
+
+from django.db import migrations, models
+import django.db.models.functions
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+
+
+def backfill_daily_summaries(apps, schema_editor):
+    NutritionLog = apps.get_model("api", "NutritionLog")
+    DailyNutritionSummary = apps.get_model("api", "DailyNutritionSummary")
+    total = models.DecimalField(max_digits=12, decimal_places=4)
+    aggregates = {
+        field: models.functions.Coalesce(
+            models.Sum(models.F(field) * models.F("quantity"), output_field=total),
+            models.Value(Decimal("0")),
+            output_field=total,
+        )
+        for field in ["calories", "protein", "carbs", "sugar"]
+    }
+    aggregates["entry_count"] = models.Count("id")
+    for meal_type in ["breakfast", "lunch", "dinner", "snack"]:
+        aggregates[f"{meal_type}_count"] = models.Count("id", filter=models.Q(meal_type=meal_type))
+    rows = (
+        NutritionLog.objects.annotate(day=models.functions.TruncDate("date_eaten"))
+        .values("user_id", "day")
+        .annotate(**aggregates)
+        .order_by()
+    )
+    DailyNutritionSummary.objects.bulk_create(
+        [DailyNutritionSummary(user_id=row.pop("user_id"), date=row.pop("day"), **row) for row in rows.iterator()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0012_log_client_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyNutritionSummary",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "calories",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=10),
+                ),
+                (
+                    "protein",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=9),
+                ),
+                (
+                    "carbs",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=9),
+                ),
+                (
+                    "sugar",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=9),
+                ),
+                ("entry_count", models.IntegerField(default=0)),
+                ("breakfast_count", models.IntegerField(default=0)),
+                ("lunch_count", models.IntegerField(default=0)),
+                ("dinner_count", models.IntegerField(default=0)),
+                ("snack_count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="api.user"
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "daily_nutrition_summary",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailynutritionsummary",
+            constraint=models.UniqueConstraint(
+                fields=("user", "date"), name="daily_nutrition_user_date_uniq"
+            ),
+        ),
+        migrations.RunPython(backfill_daily_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+from django.utils.dateparse import parse_datetime
+
+
+def move_completions_to_table(apps, schema_editor):
+    WorkoutPlan = apps.get_model("api", "WorkoutPlan")
+    ExerciseCompletion = apps.get_model("api", "ExerciseCompletion")
+    plans = WorkoutPlan.objects.filter(workout_plan_data__has_key="exercise_completions")
+    for workout_plan in plans.iterator():
+        data = workout_plan.workout_plan_data
+        rows = []
+        for day_key, day in (data.pop("exercise_completions") or {}).items():
+            if not isinstance(day, dict):
+                continue
+            for exercise_key, entry in day.items():
+                try:
+                    day_number = int(str(day_key).replace("day_", ""))
+                    exercise_index = int(str(exercise_key).replace("exercise_", ""))
+                except ValueError:
+                    continue
+                if not isinstance(entry, dict) or day_number < 0 or exercise_index < 0:
+                    continue
+                completed_at = entry.get("completed_at")
+                rows.append(ExerciseCompletion(
+                    workout_plan=workout_plan,
+                    day_number=day_number,
+                    exercise_index=exercise_index,
+                    completed=bool(entry.get("completed")),
+                    completed_at=parse_datetime(completed_at) if isinstance(completed_at, str) else None,
+                ))
+        ExerciseCompletion.objects.bulk_create(rows)
+        completed = sum(1 for row in rows if row.completed)
+        WorkoutPlan.objects.filter(pk=workout_plan.pk).update(
+            workout_plan_data=data,
+            completed_exercise_count=min(completed, workout_plan.exercise_count),
+        )
+
+
+def move_completions_to_json(apps, schema_editor):
+    """Rebuild workout_plan_data['exercise_completions'] from the rows before the table is dropped."""
+    WorkoutPlan = apps.get_model("api", "WorkoutPlan")
+    ExerciseCompletion = apps.get_model("api", "ExerciseCompletion")
+    completions = {}
+    for row in ExerciseCompletion.objects.order_by("workout_plan_id", "day_number", "exercise_index").iterator():
+        completions.setdefault(row.workout_plan_id, {}).setdefault(f"day_{row.day_number}", {})[
+            f"exercise_{row.exercise_index}"
+        ] = {
+            "completed": row.completed,
+            "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+        }
+    for workout_plan in WorkoutPlan.objects.filter(pk__in=list(completions)).iterator():
+        data = workout_plan.workout_plan_data if isinstance(workout_plan.workout_plan_data, dict) else {}
+        data["exercise_completions"] = completions[workout_plan.pk]
+        WorkoutPlan.objects.filter(pk=workout_plan.pk).update(workout_plan_data=data)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0013_daily_nutrition_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExerciseCompletion",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("day_number", models.PositiveIntegerField()),
+                ("exercise_index", models.PositiveIntegerField()),
+                ("completed", models.BooleanField(default=False)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "workout_plan",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exercise_completions",
+                        to="api.workoutplan",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "exercise_completions",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="exercisecompletion",
+            constraint=models.UniqueConstraint(
+                fields=("workout_plan", "day_number", "exercise_index"),
+                name="exercise_completion_uniq",
+            ),
+        ),
+        migrations.RunPython(move_completions_to_table, move_completions_to_json),
+    ]
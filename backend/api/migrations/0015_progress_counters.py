@@ -0,0 +1,78 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:22
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Least
+
+
+def backfill_progress_counters(apps, schema_editor):
+    User = apps.get_model("api", "User")
+    WorkoutPlan = apps.get_model("api", "WorkoutPlan")
+    WorkoutPlan.objects.filter(exercise_count__gt=0).update(
+        completion_percent=models.ExpressionWrapper(
+            Least(models.F("completed_exercise_count"), models.F("exercise_count")) * 100.0 / models.F("exercise_count"),
+            output_field=models.FloatField(),
+        )
+    )
+    totals = (
+        WorkoutPlan.objects.filter(user=models.OuterRef("pk"))
+        .values("user")
+        .annotate(total=models.Sum("completed_exercise_count"))
+        .values("total")
+    )
+    User.objects.update(completed_exercise_count=Coalesce(models.Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0014_exercise_completions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="completed_exercise_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="last_workout_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="longest_workout_streak",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="workout_streak",
+            field=models.IntegerField(
+                default=0,
+                help_text="Consecutive days, up to the last workout day, with a completed exercise",
+            ),
+        ),
+        migrations.AddField(
+            model_name="workoutplan",
+            name="completion_percent",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="workoutplan",
+            name="current_streak",
+            field=models.IntegerField(
+                default=0,
+                help_text="Consecutive days, up to last_completed_on, with a completed exercise",
+            ),
+        ),
+        migrations.AddField(
+            model_name="workoutplan",
+            name="last_completed_on",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="workoutplan",
+            name="longest_streak",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_progress_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0015_progress_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mealplan",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="workoutplan",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:41
+
+from django.db import migrations, models
+
+
+def backfill_day_exercise_counts(apps, schema_editor):
+    WorkoutPlan = apps.get_model("api", "WorkoutPlan")
+    for workout_plan in WorkoutPlan.objects.only("workout_plan_data").iterator():
+        data = workout_plan.workout_plan_data or {}
+        plan = data.get("data") if isinstance(data.get("data"), dict) else data
+        days = [day for day in plan.get("days") or [] if isinstance(day, dict)]
+        counts = {}
+        for position, day in enumerate(days, start=1):
+            counts.setdefault(str(day.get("day_number") or position), len(day.get("exercises") or []))
+        WorkoutPlan.objects.filter(pk=workout_plan.pk).update(day_exercise_counts=counts)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0016_plan_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workoutplan",
+            name="day_exercise_counts",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(backfill_day_exercise_counts, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,35 @@
 from django.db import models
+from django.db.models.functions import Least
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 import uuid
 
+class CounterFieldsModel(models.Model):
+    """
+    Base for models with counter columns (COUNTER_FIELDS) that are only
+    written by atomic UPDATEs in api.services.plan_completion. A plain
+    save() of an existing, possibly stale instance skips them.
+    """
+    COUNTER_FIELDS = []
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in deferred and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
 # -------------------------------
 # User Management & Core Tracking Module
 # -------------------------------
 
-class User(models.Model):
+class User(CounterFieldsModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     username = models.CharField(max_length=50, unique=True, default='')
     email = models.EmailField(max_length=255, unique=True, default='')
@@ -16,6 +39,15 @@ class User(models.Model):
     last_login_date = models.DateField(null=True, blank=True)
     login_streak = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    # Progress counters across all workout plans, kept in step with
+    # exercise completions
+    completed_exercise_count = models.IntegerField(default=0)
+    workout_streak = models.IntegerField(default=0, help_text="Consecutive days, up to the last workout day, with a completed exercise")
+    longest_workout_streak = models.IntegerField(default=0)
+    last_workout_date = models.DateField(null=True, blank=True)
+
+    COUNTER_FIELDS = ['completed_exercise_count', 'workout_streak', 'longest_workout_streak', 'last_workout_date']
     
     class Meta:
         db_table = 'users'
@@ -34,6 +66,9 @@ class UserMetrics(models.Model):
     
     class Meta:
         db_table = 'user_metrics'
+        indexes = [
+            models.Index(fields=['user', '-date_recorded'], name='user_metrics_user_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} metrics on {self.date_recorded}"
@@ -63,6 +98,10 @@ class Goal(models.Model):
     class Meta:
         db_table = 'goals'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='goals_user_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='goals_user_active_idx', condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
@@ -73,7 +112,7 @@ class Goal(models.Model):
 # -------------------------------
 
 
-class WorkoutPlan(models.Model):
+class WorkoutPlan(CounterFieldsModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=255, default='')
@@ -83,13 +122,130 @@ class WorkoutPlan(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=False, help_text="Whether this is the user's currently active workout plan")
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
+    # Also bumped by the counter UPDATEs in api.services.plan_completion;
+    # detail ETags are derived from it
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Summary columns derived from workout_plan_data on save, so list views
+    # can skip loading the JSON
+    day_count = models.IntegerField(default=0)
+    exercise_count = models.IntegerField(default=0)
+    # {"<day_number>": exercises in that day}; bounds completion ticks
+    day_exercise_counts = models.JSONField(default=dict, blank=True)
+    # Maintained from ExerciseCompletion rows by api.services.plan_completion
+    completed_exercise_count = models.IntegerField(default=0)
+    completion_percent = models.FloatField(default=0)
+    current_streak = models.IntegerField(default=0, help_text="Consecutive days, up to last_completed_on, with a completed exercise")
+    longest_streak = models.IntegerField(default=0)
+    last_completed_on = models.DateField(null=True, blank=True)
+
+    SUMMARY_FIELDS = ['day_count', 'exercise_count', 'day_exercise_counts']
+    COUNTER_FIELDS = ['completed_exercise_count', 'completion_percent', 'current_streak', 'longest_streak', 'last_completed_on']
     
     class Meta:
         db_table = 'workout_plans'
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='workout_plans_user_created_idx'),
+            # set_active / active plan lookups only touch the user's active plan
+            models.Index(fields=['user'], name='workout_plans_user_active_idx', condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return self.name
 
+    def refresh_summary(self):
+        """Recompute the summary columns from workout_plan_data."""
+        data = self.workout_plan_data or {}
+        # Enriched plans nest the AI response under 'data'
+        plan = data.get('data') if isinstance(data.get('data'), dict) else data
+        days = [day for day in plan.get('days') or [] if isinstance(day, dict)]
+        self.day_count = len(days)
+        self.exercise_count = sum(len(day.get('exercises') or []) for day in days)
+        # Days are numbered by day_number, falling back to 1-based position;
+        # the first day with a number wins, as in plan_completion.plan_exercise
+        counts = {}
+        for position, day in enumerate(days, start=1):
+            counts.setdefault(str(day.get('day_number') or position), len(day.get('exercises') or []))
+        self.day_exercise_counts = counts
+
+    def has_exercise(self, day_number, exercise_index):
+        """True when (day_number, exercise_index) points at an exercise in the plan."""
+        return 0 <= exercise_index < self.day_exercise_counts.get(str(day_number), 0)
+
+    @staticmethod
+    def exercise_slots(day_exercise_counts):
+        """Q over ExerciseCompletion rows that point at an exercise in a plan with these day counts."""
+        slots = models.Q(pk__in=[])
+        for day_number, count in day_exercise_counts.items():
+            if str(day_number).isdigit() and count:
+                slots |= models.Q(day_number=int(day_number), exercise_index__lt=count)
+        return slots
+
+    def save(self, *args, **kwargs):
+        deferred = self.get_deferred_fields()
+        if 'workout_plan_data' not in deferred:
+            if isinstance(self.workout_plan_data, dict):
+                # Completions live in ExerciseCompletion; a client echoing
+                # back the merged plan JSON must not store a stale copy
+                self.workout_plan_data.pop('exercise_completions', None)
+            self.refresh_summary()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'workout_plan_data' in update_fields:
+                kwargs['update_fields'] = set(update_fields) | set(self.SUMMARY_FIELDS)
+        if kwargs.get('update_fields'):
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'updated_at'}
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding and 'workout_plan_data' not in deferred:
+            # exercise_count may have changed; rescale against the stored count
+            WorkoutPlan.objects.filter(pk=self.pk).update(completion_percent=self.completion_percent_expression())
+
+    @staticmethod
+    def completion_percent_expression():
+        """completed_exercise_count / exercise_count as a percentage, computed in the database."""
+        return models.Case(
+            models.When(
+                exercise_count__gt=0,
+                then=models.ExpressionWrapper(
+                    Least(models.F('completed_exercise_count'), models.F('exercise_count')) * 100.0
+                    / models.F('exercise_count'),
+                    output_field=models.FloatField(),
+                ),
+            ),
+            default=models.Value(0.0),
+            output_field=models.FloatField(),
+        )
+
+    def completion_map(self):
+        """Completion rows in the legacy ``exercise_completions`` JSON shape."""
+        completions = {}
+        for completion in self.exercise_completions.all():
+            completions.setdefault(f"day_{completion.day_number}", {})[f"exercise_{completion.exercise_index}"] = {
+                'completed': completion.completed,
+                'completed_at': completion.completed_at.isoformat() if completion.completed_at else None,
+            }
+        return completions
+
+
+class ExerciseCompletion(models.Model):
+    """Completion state of one exercise (day_number, exercise_index) in a workout plan"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    workout_plan = models.ForeignKey(WorkoutPlan, on_delete=models.CASCADE, related_name='exercise_completions')
+    day_number = models.PositiveIntegerField()
+    exercise_index = models.PositiveIntegerField()
+    completed = models.BooleanField(default=False)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'exercise_completions'
+        constraints = [
+            models.UniqueConstraint(fields=['workout_plan', 'day_number', 'exercise_index'], name='exercise_completion_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.workout_plan_id} day {self.day_number} exercise {self.exercise_index}: {self.completed}"
+
 
 class WorkoutPlanCompletionLog(models.Model):
     """Logs completion events for workout plans to track history"""
@@ -103,6 +259,10 @@ class WorkoutPlanCompletionLog(models.Model):
     class Meta:
         db_table = 'workout_plan_completion_logs'
         ordering = ['-logged_at']
+        indexes = [
+            models.Index(fields=['user', '-logged_at'], name='completion_logs_user_idx'),
+            models.Index(fields=['workout_plan', '-logged_at'], name='completion_logs_plan_idx'),
+        ]
     
     def __str__(self):
         return f"{self.workout_plan.name} - {self.action} on {self.logged_at.date()}"
@@ -112,15 +272,22 @@ class WorkoutLog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     exercise_name = models.CharField(max_length=255, default='')
-    date_performed = models.DateTimeField(auto_now_add=True)
+    date_performed = models.DateTimeField(default=timezone.now)
     sets_performed = models.IntegerField(default=1)
     reps_performed = models.IntegerField(default=1)
     duration_minutes = models.IntegerField(null=True, blank=True)
     calories_burned = models.IntegerField(null=True, blank=True)
     perceived_effort = models.IntegerField(null=True, blank=True)  # RPE scale 1-10
+    client_id = models.UUIDField(null=True, blank=True, help_text="Client-generated idempotency key for bulk uploads")
 
     class Meta:
         db_table = 'workout_log'
+        indexes = [
+            models.Index(fields=['user', '-date_performed'], name='workout_log_user_date_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], condition=models.Q(client_id__isnull=False), name='workout_log_client_id_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.exercise_name} on {self.date_performed.date()}"
@@ -150,14 +317,51 @@ class NutritionLog(models.Model):
     protein = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)  # grams
     carbs = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)  # grams
     sugar = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)  # grams
+    client_id = models.UUIDField(null=True, blank=True, help_text="Client-generated idempotency key for bulk uploads")
 
     class Meta:
         db_table = 'nutrition_log'
+        indexes = [
+            models.Index(fields=['user', '-date_eaten'], name='nutrition_log_user_date_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'client_id'], condition=models.Q(client_id__isnull=False), name='nutrition_log_client_id_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.food_name} on {self.date_eaten.date()}"
 
 
+class DailyNutritionSummary(models.Model):
+    """
+    Per-user per-day totals of NutritionLog (nutrients multiplied by quantity).
+    Maintained from NutritionLog save/delete (see api.services.nutrition_rollup);
+    rebuild with `manage.py rebuild_nutrition_rollups`.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    calories = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    protein = models.DecimalField(max_digits=9, decimal_places=2, default=0)  # grams
+    carbs = models.DecimalField(max_digits=9, decimal_places=2, default=0)  # grams
+    sugar = models.DecimalField(max_digits=9, decimal_places=2, default=0)  # grams
+    entry_count = models.IntegerField(default=0)
+    breakfast_count = models.IntegerField(default=0)
+    lunch_count = models.IntegerField(default=0)
+    dinner_count = models.IntegerField(default=0)
+    snack_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'daily_nutrition_summary'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='daily_nutrition_user_date_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date}: {self.calories} kcal"
+
+
 class MealPlan(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -174,9 +378,76 @@ class MealPlan(models.Model):
     goal = models.CharField(max_length=100, blank=True, help_text="User's fitness/nutrition goal")
     
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'meal_plans'
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='meal_plans_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+# -------------------------------
+# Plan Template Library Module
+# -------------------------------
+
+class PlanTemplate(models.Model):
+    """Pre-generated (and pre-enriched) plan served for common generation requests"""
+    PLAN_TYPE_CHOICES = [
+        ('workout', 'Workout Plan'),
+        ('meal', 'Meal Plan'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    plan_type = models.CharField(max_length=20, choices=PLAN_TYPE_CHOICES)
+    template_key = models.CharField(max_length=255, unique=True, help_text="Normalized lookup key for the generation parameters")
+    goal = models.CharField(max_length=100)
+    experience_level = models.CharField(max_length=50, blank=True, default='')
+    days_per_week = models.IntegerField(null=True, blank=True)
+    daily_calorie_target = models.IntegerField(null=True, blank=True)
+    dietary_preferences = models.JSONField(default=list, blank=True)
+    plan_data = models.JSONField(default=dict)
+    enrichment_stats = models.JSONField(default=dict, blank=True)
+    times_served = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'plan_templates'
+
+    def __str__(self):
+        return self.template_key
+
+# -------------------------------
+# AI Telemetry Module
+# -------------------------------
+
+class AICallLog(models.Model):
+    """One Gemini generate_content call, persisted when AI_TELEMETRY_PERSIST is enabled"""
+    PARSE_OUTCOME_CHOICES = [
+        ('full', 'Full'),
+        ('partial', 'Partial'),
+        ('failed', 'Failed'),
+        ('error', 'Error'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.CharField(max_length=100)
+    method = models.CharField(max_length=100)
+    prompt_tokens = models.IntegerField(null=True, blank=True)
+    output_tokens = models.IntegerField(null=True, blank=True)
+    ttfb_ms = models.FloatField(null=True, blank=True, help_text="Time to first streamed chunk in milliseconds")
+    latency_ms = models.FloatField(null=True, blank=True)
+    finish_reason = models.CharField(max_length=50, null=True, blank=True)
+    parse_outcome = models.CharField(max_length=20, choices=PARSE_OUTCOME_CHOICES)
+    estimated_cost_usd = models.DecimalField(max_digits=10, decimal_places=6, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'ai_call_logs'
+        ordering = ['-created_at']
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"{self.method} ({self.model}) - {self.parse_outcome} in {self.latency_ms or 0:.0f} ms"
@@ -0,0 +1,89 @@
+"""
+Custom pagination classes
+"""
+import base64
+import binascii
+import uuid
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Newest-first keyset pagination on (timestamp, id).
+
+    The view names its timestamp column in ``cursor_ordering_field``. Each page
+    is fetched with ``timestamp <= t AND NOT (timestamp = t AND id >= i)``,
+    which walks the (user, timestamp DESC) index, so a page costs the same no
+    matter how deep the client has scrolled. There is no COUNT(*) unless the
+    client asks for one with ``?count=true``. Pages only go forward
+    (infinite scroll), so ``previous`` is always null.
+    """
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.field = getattr(view, 'cursor_ordering_field')
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(f'-{self.field}', '-id')
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.count = queryset.count()
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            timestamp, pk = self.decode_cursor(encoded)
+            queryset = queryset.filter(**{f'{self.field}__lte': timestamp}).exclude(
+                **{self.field: timestamp, 'id__gte': pk}
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, obj):
+        raw = f"{getattr(obj, self.field).isoformat()}|{obj.pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, encoded):
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            timestamp, pk = raw.rsplit('|', 1)
+            pk = uuid.UUID(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        parsed = parse_datetime(timestamp)
+        if parsed is None:
+            raise NotFound(self.invalid_cursor_message)
+        return parsed, pk
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link(), 'previous': None, 'results': data}
+        if self.count is not None:
+            response['count'] = self.count
+        return Response(response)
@@ -0,0 +1,59 @@
+"""
+Custom request parsers
+"""
+import io
+import json
+import re
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+# orjson reads integers beyond 64 bits as floats; bodies with digit runs
+# this long go through the stock parser, which keeps them exact
+_LONG_DIGITS = re.compile(rb'\d{19}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser backed by orjson; falls back to the stock parser when the
+    request is not UTF-8 or may hold integers beyond 64 bits. Like the
+    stock parser in strict mode, NaN and Infinity are rejected.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if _LONG_DIGITS.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline-delimited JSON: one object per line, returned as a list.
+    Blank lines are ignored.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        entries = []
+        for line_number, line in enumerate(stream, start=1):
+            loads = json.loads if _LONG_DIGITS.search(line) else orjson.loads
+            line = line.decode(encoding).strip()
+            if not line:
+                continue
+            try:
+                entries.append(loads(line))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error on line {line_number} - {exc}')
+        return entries
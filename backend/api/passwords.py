@@ -0,0 +1,141 @@
+"""
+Password hashing and verification.
+
+New hashes use the first entry of settings.PASSWORD_HASHERS (Argon2 with
+parameters from ARGON2_TIME_COST / ARGON2_MEMORY_COST / ARGON2_PARALLELISM).
+Older hashes - PBKDF2, Argon2 with outdated parameters and the legacy
+SHA-256 ``salt$hash`` format - are still accepted and are replaced with a
+current hash the next time the user logs in.
+
+Login verification runs in a small bounded thread pool, so a burst of
+logins is limited to PASSWORD_VERIFY_WORKERS concurrent hashes instead of
+tying up every CPU core; argon2 releases the GIL, so the pool hashes in
+parallel. Database writes stay on the request thread.
+"""
+import hashlib
+import hmac
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, check_password, identify_hasher, make_password
+
+logger = logging.getLogger(__name__)
+
+
+class EasyFitnessArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with cost parameters taken from settings."""
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'ARGON2_TIME_COST', 2)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'ARGON2_MEMORY_COST', 19456)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'ARGON2_PARALLELISM', 1)
+
+
+def hash_password(password):
+    """Hash a password with the preferred hasher."""
+    return make_password(password)
+
+
+def is_legacy_hash(hashed_password):
+    """True for the pre-Django SHA-256 ``salt$hash`` format."""
+    try:
+        identify_hasher(hashed_password)
+        return False
+    except ValueError:
+        return True
+
+
+def _check_legacy(password, hashed_password):
+    try:
+        salt, hashed = hashed_password.split('$')
+    except ValueError:
+        return False
+    return hmac.compare_digest(hashlib.sha256((password + salt).encode()).hexdigest(), hashed)
+
+
+def verify_password(password, hashed_password):
+    """
+    Verify password against hash.
+    Supports both:
+    - Django hashes (argon2$..., pbkdf2_sha256$..., bcrypt...)
+    - Legacy SHA-256 hashes (salt$hash) for backward compatibility
+    """
+    if not hashed_password:
+        return False
+    if is_legacy_hash(hashed_password):
+        return _check_legacy(password, hashed_password)
+    return check_password(password, hashed_password)
+
+
+def check_and_rehash(password, hashed_password):
+    """
+    Verify a password and work out whether its hash needs upgrading.
+    Returns (valid, new_hash); new_hash is None unless the hash is a legacy
+    hash or was made with a non-preferred hasher or outdated parameters.
+    CPU only - safe to run off the request thread.
+    """
+    if not hashed_password:
+        return False, None
+    if is_legacy_hash(hashed_password):
+        if not _check_legacy(password, hashed_password):
+            return False, None
+        return True, hash_password(password)
+
+    new_hash = []
+    valid = check_password(password, hashed_password, setter=lambda raw: new_hash.append(hash_password(raw)))
+    return valid, (new_hash[0] if valid and new_hash else None)
+
+
+# -------------------------------
+# Verification pool
+# -------------------------------
+class PasswordVerificationTimeout(Exception):
+    """Raised when the verification pool is too busy to answer in time."""
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_VERIFY_WORKERS,
+                    thread_name_prefix='password-verify',
+                )
+    return _pool
+
+
+def verify_and_upgrade(user, password):
+    """
+    Verify a user's password on the verification pool and, on success,
+    store an upgraded hash if one is needed.
+    Raises PasswordVerificationTimeout after PASSWORD_VERIFY_TIMEOUT seconds.
+    """
+    if getattr(settings, 'PASSWORD_VERIFY_WORKERS', 0) > 0:
+        future = _get_pool().submit(check_and_rehash, password, user.password_hash)
+        try:
+            valid, new_hash = future.result(timeout=settings.PASSWORD_VERIFY_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordVerificationTimeout('Password verification timed out')
+    else:
+        valid, new_hash = check_and_rehash(password, user.password_hash)
+
+    if valid and new_hash:
+        user.password_hash = new_hash
+        user.save(update_fields=['password_hash'])
+        logger.info(f"Upgraded password hash for user {user.id}")
+    return valid
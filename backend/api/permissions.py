@@ -41,3 +41,20 @@ class IsOwnerOrReadOnly(BasePermission):
             return str(obj.id) == request.session.get('user_id')
         
         return False
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Allow access to operational metrics endpoints.
+    Requires the X-Metrics-Token header to match settings.METRICS_TOKEN;
+    when no token is configured, access is only allowed in DEBUG.
+    """
+    
+    def has_permission(self, request, view):
+        from django.conf import settings
+        from django.utils.crypto import constant_time_compare
+        
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        if not token:
+            return settings.DEBUG
+        return constant_time_compare(request.headers.get('X-Metrics-Token', ''), token)
@@ -1,44 +1,17 @@
 from rest_framework import serializers
-import hashlib
-from django.contrib.auth.hashers import make_password, check_password
 from .models import (
     User,
     UserMetrics,
     Goal,
     WorkoutPlan,
     WorkoutPlanCompletionLog,
+    ExerciseCompletion,
     WorkoutLog,
     NutritionLog,
+    DailyNutritionSummary,
     MealPlan,
 )
-
-def hash_password(password):
-    """
-    Hash password using Django's built-in password hashing (PBKDF2 by default).
-    This is much more secure than SHA-256 as it:
-    - Uses PBKDF2 algorithm with 600,000 iterations (slow by design)
-    - Automatically generates and stores salt
-    - Is resistant to rainbow table and GPU attacks
-    """
-    return make_password(password)
-
-def verify_password(password, hashed_password):
-    """
-    Verify password against hash.
-    Supports both:
-    - New Django hashes (pbkdf2_sha256$...)
-    - Legacy SHA-256 hashes (salt$hash) for backward compatibility
-    """
-    # Check if it's a Django hash (starts with algorithm identifier)
-    if hashed_password.startswith('pbkdf2_') or hashed_password.startswith('argon2') or hashed_password.startswith('bcrypt'):
-        return check_password(password, hashed_password)
-
-    # Legacy SHA-256 support (for existing users)
-    try:
-        salt, hashed = hashed_password.split('$')
-        return hashlib.sha256((password + salt).encode()).hexdigest() == hashed
-    except ValueError:
-        return False
+from .passwords import hash_password, verify_password
 
 # -------------------------------
 # User Serializers
@@ -48,7 +21,9 @@ class UserSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'password', 'gender', 'date_of_birth', 'last_login_date', 'login_streak', 'created_at']
+        fields = ['id', 'username', 'email', 'password', 'gender', 'date_of_birth', 'last_login_date', 'login_streak', 'created_at',
+                  'completed_exercise_count', 'workout_streak', 'longest_workout_streak', 'last_workout_date']
+        read_only_fields = ['completed_exercise_count', 'workout_streak', 'longest_workout_streak', 'last_workout_date']
         extra_kwargs = {
             'password': {'write_only': True},
         }
@@ -103,8 +78,10 @@ class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer for user profile updates (no password)"""
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'gender', 'date_of_birth', 'last_login_date', 'login_streak', 'created_at']
-        read_only_fields = ['id', 'last_login_date', 'login_streak', 'created_at']
+        fields = ['id', 'username', 'email', 'gender', 'date_of_birth', 'last_login_date', 'login_streak', 'created_at',
+                  'completed_exercise_count', 'workout_streak', 'longest_workout_streak', 'last_workout_date']
+        read_only_fields = ['id', 'last_login_date', 'login_streak', 'created_at',
+                            'completed_exercise_count', 'workout_streak', 'longest_workout_streak', 'last_workout_date']
 
 class LoginSerializer(serializers.Serializer):
     """Serializer for login validation"""
@@ -228,21 +205,85 @@ class GoalCreateSerializer(serializers.ModelSerializer):
 # Exercise & Workout Serializers
 # -------------------------------
 
-class WorkoutPlanDetailSerializer(serializers.ModelSerializer):
+class ExerciseCompletionsMixin:
+    """Merges ExerciseCompletion rows back into workout_plan_data['exercise_completions']."""
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        completions = instance.completion_map()
+        if completions and isinstance(data.get('workout_plan_data'), dict):
+            data['workout_plan_data'] = {**data['workout_plan_data'], 'exercise_completions': completions}
+        return data
+
+class WorkoutPlanDetailSerializer(ExerciseCompletionsMixin, serializers.ModelSerializer):
     class Meta:
         model = WorkoutPlan
         fields = '__all__'
 
-class WorkoutPlanSerializer(serializers.ModelSerializer):
+class WorkoutPlanSerializer(ExerciseCompletionsMixin, serializers.ModelSerializer):
     class Meta:
         model = WorkoutPlan
         fields = '__all__'
 
+class WorkoutPlanSummarySerializer(serializers.ModelSerializer):
+    """Plan metadata and summary counts without the workout_plan_data JSON (use with .defer)."""
+    completion_percent = serializers.SerializerMethodField()
+
+    class Meta:
+        model = WorkoutPlan
+        fields = ['id', 'user', 'name', 'description', 'is_active', 'is_completed', 'completed_at', 'created_at',
+                  'day_count', 'exercise_count', 'completed_exercise_count', 'completion_percent',
+                  'current_streak', 'longest_streak', 'last_completed_on']
+
+    def get_completion_percent(self, obj):
+        return round(obj.completion_percent, 1)
+
+class ExerciseCompletionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExerciseCompletion
+        fields = ['day_number', 'exercise_index', 'completed', 'completed_at']
+
+class ExerciseCompletionInputSerializer(serializers.Serializer):
+    day_number = serializers.IntegerField(min_value=0)
+    exercise_index = serializers.IntegerField(min_value=0)
+    completed = serializers.BooleanField(default=True)
+
+class ExerciseCompletionBatchItemSerializer(ExerciseCompletionInputSerializer):
+    """One completion in a batch; the optional fields override the plan's values on the WorkoutLog."""
+    sets_performed = serializers.IntegerField(min_value=1, required=False)
+    reps_performed = serializers.IntegerField(min_value=1, required=False)
+    duration_minutes = serializers.IntegerField(min_value=0, required=False)
+    perceived_effort = serializers.IntegerField(min_value=1, max_value=10, required=False)
+
+class ExerciseCompletionBatchSerializer(serializers.Serializer):
+    completions = ExerciseCompletionBatchItemSerializer(many=True, allow_empty=False, max_length=200)
+    log_workouts = serializers.BooleanField(default=False)
+
 class WorkoutLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkoutLog
         fields = '__all__'
 
+    def validate(self, data):
+        # DRF does not check the conditional (user, client_id) constraint
+        client_id = data.get('client_id')
+        user = data.get('user', getattr(self.instance, 'user', None))
+        if client_id and user:
+            existing = WorkoutLog.objects.filter(user=user, client_id=client_id)
+            if self.instance is not None:
+                existing = existing.exclude(pk=self.instance.pk)
+            if existing.exists():
+                raise serializers.ValidationError({
+                    'client_id': 'A workout log with this client_id already exists.'
+                })
+        return data
+
+class WorkoutLogBulkItemSerializer(serializers.ModelSerializer):
+    """One entry of a bulk upload; the user comes from the session."""
+    class Meta:
+        model = WorkoutLog
+        fields = ['client_id', 'exercise_name', 'date_performed', 'sets_performed', 'reps_performed',
+                  'duration_minutes', 'calories_burned', 'perceived_effort']
+
 class WorkoutPlanCompletionLogSerializer(serializers.ModelSerializer):
     user_username = serializers.CharField(source='user.username', read_only=True)
     workout_plan_name = serializers.CharField(source='workout_plan.name', read_only=True)
@@ -260,6 +301,18 @@ class NutritionLogSerializer(serializers.ModelSerializer):
         model = NutritionLog
         fields = ['id', 'user', 'food_name', 'date_eaten', 'quantity', 'meal_type', 'calories', 'protein', 'carbs', 'sugar']
 
+class NutritionLogBulkItemSerializer(serializers.ModelSerializer):
+    """One entry of a bulk upload; the user comes from the session."""
+    class Meta:
+        model = NutritionLog
+        fields = ['client_id', 'food_name', 'date_eaten', 'quantity', 'meal_type', 'calories', 'protein', 'carbs', 'sugar']
+
+class DailyNutritionSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyNutritionSummary
+        fields = ['date', 'calories', 'protein', 'carbs', 'sugar', 'entry_count',
+                  'breakfast_count', 'lunch_count', 'dinner_count', 'snack_count']
+
 # -------------------------------
 # Meal Plan Serializers
 # -------------------------------
@@ -269,6 +322,14 @@ class MealPlanSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class MealPlanSummarySerializer(serializers.ModelSerializer):
+    """Plan metadata without the meal_plan_data JSON (use with .defer)."""
+    class Meta:
+        model = MealPlan
+        fields = ['id', 'user', 'name', 'description', 'daily_calorie_target', 'days_count',
+                  'dietary_preferences', 'goal', 'created_at']
+
+
 class MealPlanDetailSerializer(serializers.ModelSerializer):
     """Complete detailed serializer for meal plans with all nested data."""
     
@@ -1,3 +1,38 @@
-from .ai_service import GeminiAIService
+"""
+Service layer for external integrations.
 
-__all__ = ['GeminiAIService']
\ No newline at end of file
+The Gemini SDK (with its gRPC/protobuf dependency tree) and the ExerciseDB
+client are expensive to import, so the service classes are resolved lazily:
+``from api.services import GeminiAIService`` only imports the SDK on first
+access. Importing lightweight submodules (admission, telemetry, templates)
+never pulls them in.
+"""
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'GeminiAIService': '.ai_service',
+    'ExerciseDBService': '.exercise_service',
+}
+
+__all__ = ['GeminiAIService', 'ExerciseDBService', 'get_ai_service', 'get_exercise_service']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def get_ai_service():
+    """Create a GeminiAIService, importing the Gemini SDK on first use."""
+    from .ai_service import GeminiAIService
+    return GeminiAIService()
+
+
+def get_exercise_service():
+    """Create an ExerciseDBService, importing its HTTP client on first use."""
+    from .exercise_service import ExerciseDBService
+    return ExerciseDBService()
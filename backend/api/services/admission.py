@@ -0,0 +1,157 @@
+"""
+Admission control for expensive endpoints (Gemini generations).
+
+Limits how many generations run at once in this worker process, both
+globally and per user. Requests over the global cap wait in a bounded queue;
+anything that cannot be admitted in time is rejected with 429 and a
+Retry-After header instead of tying up a worker.
+"""
+from contextlib import contextmanager
+from functools import wraps
+import logging
+import threading
+import time
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted."""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Per-process concurrency limiter with a bounded wait queue.
+
+    Args:
+        global_limit (int): Max generations running at once
+        per_user_limit (int): Max generations running or queued per user
+        max_queue (int): Max requests waiting for a global slot
+        queue_timeout (float): Seconds a request may wait before being rejected
+        retry_after (int): Retry-After value (seconds) sent with rejections
+    """
+
+    def __init__(self, global_limit, per_user_limit, max_queue, queue_timeout, retry_after):
+        self.global_limit = global_limit
+        self.per_user_limit = per_user_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self._condition = threading.Condition()
+        self._active = 0
+        self._queued = 0
+        self._per_user = {}
+        self._rejected = 0
+        self._timed_out = 0
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            global_limit=getattr(settings, 'AI_MAX_CONCURRENT_GENERATIONS', 4),
+            per_user_limit=getattr(settings, 'AI_MAX_CONCURRENT_GENERATIONS_PER_USER', 1),
+            max_queue=getattr(settings, 'AI_ADMISSION_QUEUE_SIZE', 8),
+            queue_timeout=getattr(settings, 'AI_ADMISSION_QUEUE_TIMEOUT', 10),
+            retry_after=getattr(settings, 'AI_ADMISSION_RETRY_AFTER', 30),
+        )
+
+    def _acquire(self, user_key):
+        with self._condition:
+            if self._per_user.get(user_key, 0) >= self.per_user_limit:
+                self._rejected += 1
+                raise AdmissionRejected('Too many concurrent generations for this user', self.retry_after)
+
+            if self._active >= self.global_limit or self._queued:
+                if self._queued >= self.max_queue:
+                    self._rejected += 1
+                    raise AdmissionRejected('Generation queue is full', self.retry_after)
+
+                self._per_user[user_key] = self._per_user.get(user_key, 0) + 1
+                self._queued += 1
+                deadline = time.monotonic() + self.queue_timeout
+                try:
+                    while self._active >= self.global_limit:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._timed_out += 1
+                            self._release_user(user_key)
+                            raise AdmissionRejected('Timed out waiting for a generation slot', self.retry_after)
+                        self._condition.wait(remaining)
+                finally:
+                    self._queued -= 1
+            else:
+                self._per_user[user_key] = self._per_user.get(user_key, 0) + 1
+
+            self._active += 1
+
+    def _release_user(self, user_key):
+        remaining = self._per_user.get(user_key, 0) - 1
+        if remaining > 0:
+            self._per_user[user_key] = remaining
+        else:
+            self._per_user.pop(user_key, None)
+
+    def _release(self, user_key):
+        with self._condition:
+            self._active -= 1
+            self._release_user(user_key)
+            self._condition.notify()
+
+    @contextmanager
+    def admit(self, user_key):
+        """Hold a generation slot for the duration of the block."""
+        self._acquire(user_key)
+        try:
+            yield
+        finally:
+            self._release(user_key)
+
+    def stats(self):
+        """Current load, for autoscaling decisions."""
+        with self._condition:
+            return {
+                'active': self._active,
+                'queued': self._queued,
+                'global_limit': self.global_limit,
+                'per_user_limit': self.per_user_limit,
+                'max_queue': self.max_queue,
+                'queue_timeout_seconds': self.queue_timeout,
+                'active_users': len(self._per_user),
+                'rejected_total': self._rejected,
+                'timed_out_total': self._timed_out,
+            }
+
+
+ai_admission = AdmissionController.from_settings()
+
+
+def admission_controlled(controller):
+    """
+    Decorator for DRF function views. Must sit below ``@api_view`` and
+    ``@permission_classes`` so the session user is already authenticated.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            user_key = request.session.get('user_id') or request.META.get('REMOTE_ADDR')
+            try:
+                with controller.admit(user_key):
+                    return view_func(request, *args, **kwargs)
+            except AdmissionRejected as e:
+                logger.warning(f"Rejected {request.path} for {user_key}: {e.reason}")
+                return Response({
+                    'success': False,
+                    'error': e.reason,
+                    'retry_after': e.retry_after,
+                }, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': str(e.retry_after)})
+        return wrapper
+    return decorator
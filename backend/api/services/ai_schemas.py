@@ -0,0 +1,144 @@
+"""
+Response schemas for Gemini structured output.
+
+The same schema dicts are sent to Gemini as ``response_schema`` and used to
+check the parsed response, so the prompt no longer needs a full JSON example.
+Schemas use the OpenAPI subset understood by the Gemini API.
+"""
+
+# -------------------------------
+# Workout Plan Schema
+# -------------------------------
+WORKOUT_EXERCISE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "exercise_name": {"type": "string"},
+        "sets": {"type": "integer"},
+        "reps": {"type": "string", "description": "Target repetition range, e.g. '8-12'"},
+    },
+    "required": ["exercise_name", "sets", "reps"],
+}
+
+WORKOUT_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "plan_name": {"type": "string"},
+        "plan_description": {"type": "string"},
+        "days": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "day_number": {"type": "integer"},
+                    "day_name": {"type": "string"},
+                    "exercises": {"type": "array", "items": WORKOUT_EXERCISE_SCHEMA},
+                },
+                "required": ["day_number", "day_name", "exercises"],
+            },
+        },
+    },
+    "required": ["plan_name", "plan_description", "days"],
+}
+
+# -------------------------------
+# Meal Plan Schema
+# -------------------------------
+NUTRITION_FIELDS = ["calories", "protein", "carbs", "fat", "trans_fat", "fiber", "sugar"]
+
+NUTRITION_TOTALS_SCHEMA = {
+    "type": "object",
+    "properties": {field: {"type": "number"} for field in NUTRITION_FIELDS},
+}
+
+INGREDIENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "ingredient_name": {"type": "string"},
+        "measure": {"type": "string"},
+        **{field: {"type": "number"} for field in NUTRITION_FIELDS},
+    },
+    "required": ["ingredient_name", "measure", "calories", "protein", "carbs"],
+}
+
+MEAL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "recipe_name": {"type": "string"},
+        "ingredients": {"type": "array", "items": INGREDIENT_SCHEMA},
+        "meal_totals": NUTRITION_TOTALS_SCHEMA,
+        "prep_time": {"type": "integer", "description": "Preparation time in minutes"},
+        "instructions": {"type": "string"},
+    },
+    "required": ["recipe_name", "ingredients", "meal_totals"],
+}
+
+MEAL_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "plan_name": {"type": "string"},
+        "plan_description": {"type": "string"},
+        "days": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "day_number": {"type": "integer"},
+                    "meals": {
+                        "type": "object",
+                        "properties": {
+                            "breakfast": MEAL_SCHEMA,
+                            "lunch": MEAL_SCHEMA,
+                            "dinner": MEAL_SCHEMA,
+                        },
+                    },
+                    "daily_totals": NUTRITION_TOTALS_SCHEMA,
+                },
+                "required": ["day_number", "meals", "daily_totals"],
+            },
+        },
+    },
+    "required": ["plan_name", "plan_description", "days"],
+}
+
+_TYPE_CHECKS = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+}
+
+
+def validate_against_schema(data, schema, path="$"):
+    """
+    Check parsed data against one of the response schemas.
+
+    Only the keywords used above are supported (type, properties, required,
+    items, enum, nullable). Extra keys in the data are allowed.
+
+    Returns:
+        list: Human readable error strings, empty when the data is valid
+    """
+    if data is None:
+        return [] if schema.get("nullable") else [f"{path}: value is null"]
+
+    expected_type = schema.get("type")
+    if expected_type and not _TYPE_CHECKS[expected_type](data):
+        return [f"{path}: expected {expected_type}, got {type(data).__name__}"]
+
+    if "enum" in schema and data not in schema["enum"]:
+        return [f"{path}: {data!r} is not one of {schema['enum']}"]
+
+    errors = []
+    if expected_type == "object":
+        for key in schema.get("required", []):
+            if key not in data:
+                errors.append(f"{path}.{key}: missing required field")
+        for key, child_schema in schema.get("properties", {}).items():
+            if key in data:
+                errors.extend(validate_against_schema(data[key], child_schema, f"{path}.{key}"))
+    elif expected_type == "array" and "items" in schema:
+        for index, item in enumerate(data):
+            errors.extend(validate_against_schema(item, schema["items"], f"{path}[{index}]"))
+    return errors
@@ -1,12 +1,33 @@
 import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from google.generativeai.types import BlockedPromptException, HarmCategory, HarmBlockThreshold, StopCandidateException
 from decouple import config
 import logging
 import json
+import time
+
+from .ai_schemas import WORKOUT_PLAN_SCHEMA, MEAL_PLAN_SCHEMA, validate_against_schema
+from .ai_telemetry import ai_telemetry
 
 logger = logging.getLogger(__name__)
 
 
+def _as_int(value):
+    """Token counts from the SDK are ints; anything else is treated as unknown."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _blocked_reason(exc):
+    """Name of the prompt's block_reason or the candidate's finish_reason carried by a stream exception."""
+    detail = exc.args[0] if exc.args else None
+    field = 'block_reason' if isinstance(exc, BlockedPromptException) else 'finish_reason'
+    reason = getattr(detail, field, None)
+    name = getattr(reason, 'name', None)
+    return name if isinstance(name, str) else 'SAFETY'
+
+
+BLOCKED_RESULT = {"success": False, "error": "Response was blocked by safety filters"}
+
+
 class GeminiAIService:
     """
     Service class for integrating with Google's Gemini AI API.
@@ -59,27 +80,28 @@ class GeminiAIService:
         Returns:
             dict: Structured exercise plan response
         """
+        call = self._start_call("generate_exercise_plan")
         try:
             prompt = self._create_workout_plan_prompt(user_goal, experience_level, days_per_week, user_profile)
             
             # Configure generation with extended timeout
             generation_config = genai.GenerationConfig(
                 response_mime_type="application/json",
+                response_schema=WORKOUT_PLAN_SCHEMA,
                 max_output_tokens=16384,  # Increased token limit for detailed workout plans
                 temperature=0.7
             )
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                request_options={'timeout': 180}  # 3 minutes timeout
-            )
+            response = self._generate_content(call, prompt, generation_config)
+            if response is None:
+                return self._finish_call(call, dict(BLOCKED_RESULT))
             
             logger.info("Exercise plan generated successfully")
-            return self._parse_json_response(response.text, "exercise_plan")
+            return self._finish_call(call, self._parse_json_response(response.text, "exercise_plan", WORKOUT_PLAN_SCHEMA))
             
         except Exception as e:
             logger.error(f"Error generating exercise plan: {e}")
+            self._finish_call(call, None)
             raise
 
     def generate_meal_plan(self, user_goal: str, daily_calorie_target: int, dietary_preferences: list, user_profile: dict):
@@ -95,46 +117,115 @@ class GeminiAIService:
         Returns:
             dict: Structured meal plan response
         """
+        call = self._start_call("generate_meal_plan")
         try:
             prompt = self._create_meal_plan_prompt(user_goal, daily_calorie_target, dietary_preferences, user_profile)
             
             # Configure generation with extended timeout and higher token limit
             generation_config = genai.GenerationConfig(
                 response_mime_type="application/json",
+                response_schema=MEAL_PLAN_SCHEMA,
                 max_output_tokens=32768,  # Significantly increased for very detailed meal plans
                 temperature=0.7
             )
             
-            # Use streaming or configure client timeout
-            response = self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                request_options={'timeout': 180}  # 3 minutes timeout
-            )
-            
-            logger.info("Meal plan generated successfully")
+            response = self._generate_content(call, prompt, generation_config)
             
-            # Check if response was blocked by safety filters
-            if not response.candidates:
+            # Blocked by safety filters (prompt or candidate) while streaming
+            if response is None or not response.candidates:
                 logger.error("No candidates returned - response may have been blocked")
-                return {"success": False, "error": "Response was blocked by safety filters"}
+                return self._finish_call(call, dict(BLOCKED_RESULT))
+            
+            logger.info("Meal plan generated successfully")
             
             candidate = response.candidates[0]
             if candidate.finish_reason.name == "SAFETY":
                 safety_ratings = {rating.category.name: rating.probability.name for rating in candidate.safety_ratings}
                 logger.error(f"Response blocked by safety filters: {safety_ratings}")
-                return {"success": False, "error": f"Response blocked by safety filters: {safety_ratings}"}
+                return self._finish_call(call, {"success": False, "error": f"Response blocked by safety filters: {safety_ratings}"})
             
             if not response.text:
                 logger.error("Empty response text")
-                return {"success": False, "error": "Empty response from AI service"}
+                return self._finish_call(call, {"success": False, "error": "Empty response from AI service"})
             
-            return self._parse_json_response(response.text, "meal_plan")
+            return self._finish_call(call, self._parse_json_response(response.text, "meal_plan", MEAL_PLAN_SCHEMA))
             
         except Exception as e:
             logger.error(f"Error generating meal plan: {e}")
+            self._finish_call(call, None)
             raise
 
+    def _start_call(self, method):
+        """Begin a telemetry record for one generate_content call."""
+        return {
+            'model': self.model_id,
+            'method': method,
+            'prompt_tokens': None,
+            'output_tokens': None,
+            'ttfb_ms': None,
+            'latency_ms': None,
+            'finish_reason': None,
+            'started': time.perf_counter(),
+        }
+
+    def _generate_content(self, call, prompt, generation_config):
+        """
+        Call Gemini with streaming enabled so time to first byte can be measured.
+        The stream is fully consumed, so the returned response behaves like a
+        non-streamed one (``text``, ``candidates``, ``usage_metadata``).
+        Returns None when the stream is stopped by a prompt or candidate block,
+        which the SDK raises while iterating rather than on the first call.
+        """
+        response = self.model.generate_content(
+            prompt,
+            generation_config=generation_config,
+            request_options={'timeout': 180},  # 3 minutes timeout
+            stream=True
+        )
+        try:
+            for _chunk in response:
+                if call['ttfb_ms'] is None:
+                    call['ttfb_ms'] = (time.perf_counter() - call['started']) * 1000
+        except (BlockedPromptException, StopCandidateException) as e:
+            call['latency_ms'] = (time.perf_counter() - call['started']) * 1000
+            call['finish_reason'] = _blocked_reason(e)
+            logger.error(f"Generation blocked ({call['finish_reason']}): {e}")
+            return None
+        call['latency_ms'] = (time.perf_counter() - call['started']) * 1000
+
+        usage = getattr(response, 'usage_metadata', None)
+        call['prompt_tokens'] = _as_int(getattr(usage, 'prompt_token_count', None))
+        call['output_tokens'] = _as_int(getattr(usage, 'candidates_token_count', None))
+        try:
+            finish_reason = response.candidates[0].finish_reason.name if response.candidates else None
+        except Exception:
+            finish_reason = None
+        call['finish_reason'] = finish_reason if isinstance(finish_reason, str) else None
+        return response
+
+    def _finish_call(self, call, result):
+        """
+        Record the call with its parse outcome and hand the result back.
+        ``result`` is None when the call raised before a result was built.
+        """
+        started = call.pop('started', None)
+        if started is None:
+            return result  # already recorded
+
+        if result is None:
+            outcome = 'error'
+        elif not result.get('success'):
+            outcome = 'failed'
+        elif result.get('partial'):
+            outcome = 'partial'
+        else:
+            outcome = 'full'
+
+        if call['latency_ms'] is None:
+            call['latency_ms'] = (time.perf_counter() - started) * 1000
+        ai_telemetry.record({**call, 'parse_outcome': outcome})
+        return result
+
     def _create_workout_plan_prompt(self, user_goal: str, experience_level: str, days_per_week: int, user_profile: dict) -> str:
         """
         Generates a detailed prompt for the Gemini API to create a personalized workout plan.
@@ -149,30 +240,6 @@ class GeminiAIService:
             A formatted string to be used as a prompt for the Gemini API.
         """
         
-        # This is the example JSON structure you want the AI to follow.
-        json_structure_example = {
-          "plan_name": "4-Day Muscle Building Split",
-          "plan_description": "A 4-day split designed to maximize muscle growth by targeting major muscle groups.",
-          "days": [
-            {
-              "day_number": 1,
-              "day_name": "Upper Body Strength",
-              "exercises": [
-                {
-                  "exercise_name": "Bench Press",
-                  "sets": 4,
-                  "reps": "6-8"
-                },
-                {
-                  "exercise_name": "Bent Over Row",
-                  "sets": 4,
-                  "reps": "6-8"
-                }
-              ]
-            }
-          ]
-        }
-
         prompt = f"""
         You are an expert fitness coach and personal trainer. Your task is to create a personalized, {days_per_week}-day workout plan based on the user's profile and goals.
 
@@ -188,9 +255,7 @@ class GeminiAIService:
         3. Provide a clear number of sets and a target repetition range for each exercise.
 
         **Output Format:**
-        You MUST format your response as a single, valid JSON object. Do not include any introductory text, explanations, or markdown formatting like ```json. Your entire response must be the JSON object itself, matching this exact structure:
-
-        {json.dumps(json_structure_example, indent=2)}
+        Respond with a JSON object following the configured response schema: a plan_name, a short plan_description, and one entry in "days" per workout day, each with its exercises, sets and reps.
         """
         
         return prompt.strip()
@@ -209,142 +274,6 @@ class GeminiAIService:
             A formatted string to be used as a prompt for the Gemini API.
         """
 
-        # This is the example JSON structure you want the AI to follow.
-        json_structure_example = {
-          "plan_name": "5-Day High-Protein Meal Plan",
-          "plan_description": "A 5-day meal plan focused on high-protein sources to support muscle repair and growth.",
-          "days": [
-            {
-              "day_number": 1,
-              "meals": {
-                "breakfast": {
-                  "recipe_name": "Scrambled Eggs with Spinach and Feta",
-                  "ingredients": [
-                    {
-                      "ingredient_name": "Eggs",
-                      "measure": "3 large",
-                      "calories": 210,
-                      "protein": 18,
-                      "carbs": 1,
-                      "fat": 15,
-                      "trans_fat": 0,
-                      "fiber": 0,
-                      "sugar": 1
-                    },
-                    {
-                      "ingredient_name": "Spinach",
-                      "measure": "1 cup",
-                      "calories": 7,
-                      "protein": 1,
-                      "carbs": 1,
-                      "fat": 0,
-                      "trans_fat": 0,
-                      "fiber": 1,
-                      "sugar": 0
-                    },
-                    {
-                      "ingredient_name": "Feta Cheese",
-                      "measure": "2 oz",
-                      "calories": 150,
-                      "protein": 8,
-                      "carbs": 2,
-                      "fat": 12,
-                      "trans_fat": 0,
-                      "fiber": 0,
-                      "sugar": 2
-                    }
-                  ],
-                  "meal_totals": {
-                    "calories": 367,
-                    "protein": 27,
-                    "carbs": 4,
-                    "fat": 27,
-                    "trans_fat": 0,
-                    "fiber": 1,
-                    "sugar": 3
-                  },
-                  "prep_time": 10,
-                  "instructions": "Heat pan over medium heat, scramble eggs with spinach, top with crumbled feta"
-                },
-                "lunch": {
-                  "recipe_name": "Grilled Chicken Salad with Vinaigrette",
-                  "ingredients": [
-                    {
-                      "ingredient_name": "Chicken Breast",
-                      "measure": "6 oz",
-                      "calories": 280,
-                      "protein": 53,
-                      "carbs": 0,
-                      "fat": 6,
-                      "trans_fat": 0,
-                      "fiber": 0,
-                      "sugar": 0
-                    },
-                    {
-                      "ingredient_name": "Mixed Greens",
-                      "measure": "3 cups",
-                      "calories": 20,
-                      "protein": 2,
-                      "carbs": 4,
-                      "fat": 0,
-                      "trans_fat": 0,
-                      "fiber": 2,
-                      "sugar": 2
-                    }
-                  ],
-                  "meal_totals": {
-                    "calories": 300,
-                    "protein": 55,
-                    "carbs": 4,
-                    "fat": 6,
-                    "trans_fat": 0,
-                    "fiber": 2,
-                    "sugar": 2
-                  },
-                  "prep_time": 15,
-                  "instructions": "Grill chicken breast, serve over mixed greens with vinaigrette"
-                },
-                "dinner": {
-                  "recipe_name": "Baked Salmon with Quinoa",
-                  "ingredients": [
-                    {
-                      "ingredient_name": "Salmon Fillet",
-                      "measure": "5 oz",
-                      "calories": 350,
-                      "protein": 40,
-                      "carbs": 0,
-                      "fat": 20,
-                      "trans_fat": 0,
-                      "fiber": 0,
-                      "sugar": 0
-                    }
-                  ],
-                  "meal_totals": {
-                    "calories": 350,
-                    "protein": 40,
-                    "carbs": 0,
-                    "fat": 20,
-                    "trans_fat": 0,
-                    "fiber": 0,
-                    "sugar": 0
-                  },
-                  "prep_time": 20,
-                  "instructions": "Bake salmon at 400°F for 15 minutes"
-                }
-              },
-              "daily_totals": {
-                "calories": 1017,
-                "protein": 122,
-                "carbs": 8,
-                "fat": 53,
-                "trans_fat": 0,
-                "fiber": 3,
-                "sugar": 5
-              }
-            }
-          ]
-        }
-        
         prompt = f"""
         You are an expert nutritionist and meal planner. Your task is to create a personalized 5-day meal plan based on the user's profile, goals, and dietary needs.
 
@@ -370,19 +299,45 @@ class GeminiAIService:
         - Use realistic nutritional values based on standard food databases
 
         **Output Format:**
-        You MUST format your response as a single, valid JSON object. Do not include any introductory text, explanations, or markdown formatting like ```json. Your entire response must be the JSON object itself, matching this exact structure:
-
-        {json.dumps(json_structure_example, indent=2)}
+        Respond with a JSON object following the configured response schema: a plan_name, a short plan_description, and one entry in "days" per day with breakfast, lunch and dinner under "meals" plus the day's daily_totals.
         """
         
         return prompt.strip()
 
-    def _parse_json_response(self, response_text, expected_type):
-        """Parse JSON response from AI and handle errors gracefully."""
+    def _parse_json_response(self, response_text, expected_type, schema=None):
+        """
+        Parse JSON response from AI and handle errors gracefully.
+
+        With structured output the response is normally valid JSON matching
+        ``schema``, so it is loaded and checked directly. The brace-repair
+        fallback only runs when that fast path fails (e.g. a truncated
+        response that hit the token limit).
+        """
+        response_text = response_text.strip()
+        try:
+            parsed_data = json.loads(response_text)
+        except json.JSONDecodeError:
+            return self._repair_json_response(response_text, expected_type, schema)
+
+        return self._validated_result(parsed_data, expected_type, schema)
+
+    def _validated_result(self, parsed_data, expected_type, schema, partial=False):
+        """Run the schema check on parsed data and build the result dict."""
+        if schema is not None:
+            errors = validate_against_schema(parsed_data, schema)
+            if errors:
+                logger.error(f"{expected_type} response failed schema validation: {errors[:5]}")
+                return {"success": False, "error": f"AI response did not match {expected_type} schema: {'; '.join(errors[:5])}"}
+
+        logger.info(f"Successfully parsed {expected_type} response")
+        result = {"success": True, "data": parsed_data}
+        if partial:
+            result["partial"] = True
+        return result
+
+    def _repair_json_response(self, response_text, expected_type, schema=None):
+        """Slow path: try to recover a truncated or malformed JSON response."""
         try:
-            # Clean up the response text
-            response_text = response_text.strip()
-            
             # If response is truncated, try to fix common JSON issues
             if not response_text.endswith('}'):
                 logger.warning("Response appears truncated, attempting to fix JSON")
@@ -397,8 +352,7 @@ class GeminiAIService:
                     logger.info(f"Added {missing_braces} closing braces to fix JSON")
             
             parsed_data = json.loads(response_text)
-            logger.info(f"Successfully parsed {expected_type} response")
-            return {"success": True, "data": parsed_data}
+            return self._validated_result(parsed_data, expected_type, schema)
             
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error for {expected_type}: {e}. Raw response: {response_text[:1000]}...")
@@ -415,7 +369,7 @@ class GeminiAIService:
                                 partial_response = response_text[start_idx:end_idx + 1]
                                 parsed_data = json.loads(partial_response)
                                 logger.warning(f"Successfully parsed partial {expected_type} response")
-                                return {"success": True, "data": parsed_data, "partial": True}
+                                return self._validated_result(parsed_data, expected_type, schema, partial=True)
                             except json.JSONDecodeError:
                                 continue
                                 
@@ -426,4 +380,4 @@ class GeminiAIService:
             
         except Exception as e:
             logger.error(f"Unexpected error parsing {expected_type}: {e}")
-            return {"success": False, "error": f"Unexpected error: {str(e)}"}
\ No newline at end of file
+            return {"success": False, "error": f"Unexpected error: {str(e)}"}
@@ -0,0 +1,133 @@
+"""
+Per-call telemetry for Gemini generations.
+
+Every ``generate_content`` call made by ``GeminiAIService`` is recorded in an
+in-process ring buffer (and optionally the ``ai_call_logs`` table) so latency,
+token usage and cost can be aggregated for capacity planning.
+"""
+from collections import deque
+from decimal import Decimal
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PARSE_OUTCOMES = ('full', 'partial', 'failed', 'error')
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100.0 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _distribution(values):
+    """p50/p95/p99 and max for a list of numbers, ignoring missing values."""
+    values = sorted(v for v in values if v is not None)
+    return {
+        'p50': _percentile(values, 50),
+        'p95': _percentile(values, 95),
+        'p99': _percentile(values, 99),
+        'max': values[-1] if values else None,
+    }
+
+
+def estimate_cost(model, prompt_tokens, output_tokens):
+    """
+    Estimate the USD cost of a call from ``settings.AI_TOKEN_PRICES_PER_MILLION``.
+    Returns None when the model has no configured price or tokens are unknown.
+    """
+    prices = getattr(settings, 'AI_TOKEN_PRICES_PER_MILLION', {}).get(model)
+    if not prices or prompt_tokens is None or output_tokens is None:
+        return None
+    cost = (Decimal(str(prices['input'])) * prompt_tokens
+            + Decimal(str(prices['output'])) * output_tokens) / Decimal(1_000_000)
+    return cost.quantize(Decimal('0.000001'))
+
+
+class AITelemetry:
+    """Thread-safe ring buffer of AI call records with aggregate statistics."""
+
+    def __init__(self, maxlen=None):
+        if maxlen is None:
+            maxlen = getattr(settings, 'AI_TELEMETRY_BUFFER_SIZE', 500)
+        self._records = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, call):
+        """
+        Store one call record.
+
+        Args:
+            call (dict): model, method, prompt_tokens, output_tokens, ttfb_ms,
+                latency_ms, finish_reason and parse_outcome
+        """
+        call = dict(call)
+        call['estimated_cost_usd'] = estimate_cost(call['model'], call.get('prompt_tokens'), call.get('output_tokens'))
+        with self._lock:
+            self._records.append(call)
+
+        if getattr(settings, 'AI_TELEMETRY_PERSIST', False):
+            self._persist(call)
+        return call
+
+    def _persist(self, call):
+        """Write the record to the database; telemetry must never break a generation."""
+        try:
+            from api.models import AICallLog
+            AICallLog.objects.create(**call)
+        except Exception as e:
+            logger.warning(f"Failed to persist AI call telemetry: {e}")
+
+    def recent(self, limit=None):
+        """Return the newest records first."""
+        with self._lock:
+            records = list(self._records)
+        records.reverse()
+        return records[:limit] if limit else records
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self):
+        """Aggregate the buffer per (model, method)."""
+        groups = {}
+        for call in self.recent():
+            groups.setdefault((call['model'], call['method']), []).append(call)
+
+        summaries = []
+        for (model, method), calls in sorted(groups.items()):
+            costs = [c['estimated_cost_usd'] for c in calls if c['estimated_cost_usd'] is not None]
+            finish_reasons = {}
+            for c in calls:
+                reason = c.get('finish_reason') or 'UNKNOWN'
+                finish_reasons[reason] = finish_reasons.get(reason, 0) + 1
+            summaries.append({
+                'model': model,
+                'method': method,
+                'calls': len(calls),
+                'latency_ms': _distribution([c.get('latency_ms') for c in calls]),
+                'ttfb_ms': _distribution([c.get('ttfb_ms') for c in calls]),
+                'prompt_tokens': _distribution([c.get('prompt_tokens') for c in calls]),
+                'output_tokens': _distribution([c.get('output_tokens') for c in calls]),
+                'total_prompt_tokens': sum(c.get('prompt_tokens') or 0 for c in calls),
+                'total_output_tokens': sum(c.get('output_tokens') or 0 for c in calls),
+                'estimated_cost_usd': str(sum(costs, Decimal('0'))),
+                'parse_outcomes': {outcome: sum(1 for c in calls if c['parse_outcome'] == outcome)
+                                   for outcome in PARSE_OUTCOMES},
+                'finish_reasons': finish_reasons,
+            })
+
+        return {
+            'buffer_size': self._records.maxlen,
+            'recorded_calls': len(self._records),
+            'by_method': summaries,
+        }
+
+
+ai_telemetry = AITelemetry()
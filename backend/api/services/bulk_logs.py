@@ -0,0 +1,78 @@
+"""
+Bulk insertion of workout and nutrition logs.
+
+Entries may carry a client-generated ``client_id``; an entry whose
+client_id the user has already uploaded is skipped, so offline-sync
+clients can safely retry a whole upload.
+"""
+import logging
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from api.models import NutritionLog, WorkoutLog
+from api.services import nutrition_rollup
+from api.services.dashboard import invalidate_dashboard
+from api.services.training_analytics import invalidate_training_analytics
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 200
+
+
+def bulk_create_logs(model, user, entries):
+    """
+    Insert validated entries for user in one transaction with bulk_create.
+    Returns (created_objects, duplicate_client_ids).
+    """
+    created, duplicates = insert_logs(model, user, entries)
+    if created:
+        days = {timezone.localdate(log.date_eaten) for log in created} if model is NutritionLog else ()
+        refresh_derived(model, user, days)
+    return created, duplicates
+
+
+def insert_logs(model, user, entries):
+    """Insert one batch, skipping already-uploaded client_ids; derived data is not refreshed."""
+    try:
+        return _insert(model, user, entries)
+    except IntegrityError:
+        # A concurrent retry inserted some of the same client_ids first;
+        # run again so they are reported as duplicates
+        logger.info(f"Retrying bulk {model.__name__} insert for user {user.id} after client_id conflict")
+        return _insert(model, user, entries)
+
+
+def refresh_derived(model, user, nutrition_days=()):
+    """
+    Bring caches and rollups up to date after logs were inserted with
+    bulk_create (which sends no signals); nutrition_days are the local
+    dates of the inserted nutrition logs.
+    """
+    invalidate_dashboard(user.id)
+    if model is NutritionLog:
+        nutrition_rollup.refresh_days(user.id, nutrition_days)
+    elif model is WorkoutLog:
+        invalidate_training_analytics(user.id)
+
+
+def _insert(model, user, entries):
+    client_ids = {entry['client_id'] for entry in entries if entry.get('client_id')}
+    with transaction.atomic():
+        seen = set()
+        if client_ids:
+            seen = set(model.objects.filter(user=user, client_id__in=client_ids).values_list('client_id', flat=True))
+
+        objects = []
+        duplicates = []
+        for entry in entries:
+            client_id = entry.get('client_id')
+            if client_id:
+                if client_id in seen:
+                    duplicates.append(client_id)
+                    continue
+                seen.add(client_id)
+            objects.append(model(user=user, **entry))
+
+        model.objects.bulk_create(objects, batch_size=BULK_BATCH_SIZE)
+    return objects, duplicates
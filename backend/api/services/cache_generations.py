@@ -0,0 +1,31 @@
+"""
+Per-user cache generations.
+
+A derived result that has many cached variants per user (different query
+parameters, different goals) includes the user's generation number for
+its namespace in every cache key. Bumping the generation orphans all of
+them at once without having to enumerate keys; orphaned entries simply
+expire.
+"""
+from django.core.cache import cache
+
+
+def generation_key(namespace, user_id):
+    return f"{namespace}:gen:{user_id}"
+
+
+def get_generation(namespace, user_id):
+    key = generation_key(namespace, user_id)
+    generation = cache.get(key)
+    if generation is None:
+        generation = 0
+        cache.set(key, generation, None)
+    return generation
+
+
+def bump_generation(namespace, user_id):
+    key = generation_key(namespace, user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
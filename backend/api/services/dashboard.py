@@ -0,0 +1,107 @@
+"""
+Dashboard read model.
+
+Builds the per-user dashboard from summary columns only (the plan JSON
+blobs are deferred and never loaded) and caches the serialized result per user for
+DASHBOARD_CACHE_TTL seconds, together with an ETag hashed from the
+rendered payload, so conditional requests for an unchanged dashboard are
+answered without building or rendering it. Saving or deleting any model
+shown on the dashboard drops the cached copy (receivers connected in
+ApiConfig.ready).
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from api.conditional import content_etag
+from api.models import Goal, MealPlan, NutritionLog, User, UserMetrics, WorkoutLog, WorkoutPlan
+from api.serializers import (
+    GoalSerializer,
+    MealPlanSummarySerializer,
+    UserMetricsSerializer,
+    UserSerializer,
+    WorkoutLogSerializer,
+    WorkoutPlanSummarySerializer,
+)
+from api.renderers import ORJSONRenderer
+
+RECENT_WORKOUTS_LIMIT = 10
+
+# Models whose changes invalidate the owner's dashboard
+DASHBOARD_MODELS = [WorkoutPlan, MealPlan, Goal, WorkoutLog, NutritionLog, UserMetrics]
+
+
+def dashboard_cache_key(user_id):
+    return f"dashboard:{user_id}"
+
+
+def build_dashboard(user):
+    """Assemble the dashboard payload for user (one query per section)."""
+    data = UserSerializer(user).data
+
+    workout_plans = (
+        WorkoutPlan.objects.filter(user=user)
+        .defer('workout_plan_data')
+        .order_by('-created_at')
+    )
+    data['workout_plans'] = WorkoutPlanSummarySerializer(workout_plans, many=True).data
+
+    meal_plans = (
+        MealPlan.objects.filter(user=user)
+        .defer('meal_plan_data')
+        .order_by('-created_at')
+    )
+    data['meal_plans'] = MealPlanSummarySerializer(meal_plans, many=True).data
+
+    goals = Goal.objects.filter(user=user, is_active=True)
+    data['active_goals'] = GoalSerializer(goals, many=True).data
+
+    recent_workouts = WorkoutLog.objects.filter(user=user).order_by('-date_performed')[:RECENT_WORKOUTS_LIMIT]
+    data['recent_workouts'] = WorkoutLogSerializer(recent_workouts, many=True).data
+
+    latest_metrics = UserMetrics.objects.filter(user=user).order_by('-date_recorded').first()
+    if latest_metrics:
+        data['latest_metrics'] = UserMetricsSerializer(latest_metrics).data
+
+    data['counts'] = {
+        'workout_plans': len(data['workout_plans']),
+        'meal_plans': len(data['meal_plans']),
+        'active_goals': len(data['active_goals']),
+    }
+    return data
+
+
+def dashboard_etag(data):
+    """Content-based, so a rebuilt but unchanged dashboard keeps its ETag."""
+    return content_etag(ORJSONRenderer().render(data))
+
+
+def get_dashboard_entry(user):
+    """Return (dashboard, etag) for user from the cache, building both on a miss."""
+    ttl = getattr(settings, 'DASHBOARD_CACHE_TTL', 300)
+    if ttl <= 0:
+        data = build_dashboard(user)
+        return data, dashboard_etag(data)
+
+    key = dashboard_cache_key(user.id)
+    entry = cache.get(key)
+    if not isinstance(entry, tuple):
+        data = build_dashboard(user)
+        entry = (data, dashboard_etag(data))
+        cache.set(key, entry, ttl)
+    return entry
+
+
+def get_dashboard(user):
+    """Return the cached dashboard for user, building it on a miss."""
+    return get_dashboard_entry(user)[0]
+
+
+def invalidate_dashboard(user_id):
+    cache.delete(dashboard_cache_key(user_id))
+
+
+def invalidate_dashboard_for_instance(sender, instance, **kwargs):
+    """post_save / post_delete receiver for the models shown on the dashboard."""
+    user_id = instance.pk if isinstance(instance, User) else getattr(instance, 'user_id', None)
+    if user_id:
+        invalidate_dashboard(user_id)
@@ -0,0 +1,139 @@
+"""
+Streaming export of a user's history.
+
+Rows are read with .values().iterator(chunk_size=EXPORT_CHUNK_SIZE) -
+a server-side cursor on PostgreSQL unless DISABLE_SERVER_SIDE_CURSORS is
+set - and encoded line by line into buffers of about EXPORT_BUFFER_SIZE
+bytes, optionally through a streaming gzip compressor. Memory use stays
+flat however long the history is.
+
+NDJSON exports may mix every record type (each line carries a "type");
+CSV exports hold one record type per file.
+"""
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from api.models import (
+    ExerciseCompletion,
+    Goal,
+    MealPlan,
+    NutritionLog,
+    UserMetrics,
+    WorkoutLog,
+    WorkoutPlan,
+)
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# type -> (model, lookup from the model to its owner, ordering)
+EXPORT_SOURCES = {
+    'user_metrics': (UserMetrics, 'user', 'date_recorded'),
+    'goals': (Goal, 'user', 'created_at'),
+    'workout_logs': (WorkoutLog, 'user', 'date_performed'),
+    'nutrition_logs': (NutritionLog, 'user', 'date_eaten'),
+    'workout_plans': (WorkoutPlan, 'user', 'created_at'),
+    'exercise_completions': (ExerciseCompletion, 'workout_plan__user', 'updated_at'),
+    'meal_plans': (MealPlan, 'user', 'created_at'),
+}
+
+
+def export_fields(model):
+    """Exported columns: every concrete field except the owner."""
+    return [field.attname for field in model._meta.concrete_fields if field.name != 'user']
+
+
+def iter_rows(user, record_type):
+    model, owner, ordering = EXPORT_SOURCES[record_type]
+    return (
+        model.objects.filter(**{owner: user})
+        .order_by(ordering, 'pk')
+        .values(*export_fields(model))
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def ndjson_lines(user, record_types):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for record_type in record_types:
+        for row in iter_rows(user, record_type):
+            yield encoder.encode({'type': record_type, **row}) + '\n'
+
+
+class _Echo:
+    """File-like object whose write() hands back the line csv.writer produced."""
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def csv_lines(user, record_type):
+    model = EXPORT_SOURCES[record_type][0]
+    fields = export_fields(model)
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in iter_rows(user, record_type):
+        yield writer.writerow([_csv_value(row[field]) for field in fields])
+
+
+def _buffered(lines, size=EXPORT_BUFFER_SIZE):
+    """Join text lines into encoded chunks of roughly size bytes."""
+    buffer = []
+    buffered = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buffer.append(data)
+        buffered += len(data)
+        if buffered >= size:
+            yield b''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(user, export_format='ndjson', record_types=None, gzip=False):
+    """
+    Iterator of byte chunks for the export.
+    record_types defaults to every type; CSV takes exactly one.
+    """
+    record_types = record_types or list(EXPORT_SOURCES)
+    if export_format == 'csv':
+        if len(record_types) != 1:
+            raise ValueError('CSV exports take exactly one record type')
+        lines = csv_lines(user, record_types[0])
+    else:
+        lines = ndjson_lines(user, record_types)
+    chunks = _buffered(lines)
+    return _gzipped(chunks) if gzip else chunks
+
+
+def export_filename(user, export_format, record_types=None, gzip=False):
+    name = f"easyfitness-{user.username or user.id}"
+    if record_types and len(record_types) == 1:
+        name += f"-{record_types[0]}"
+    return f"{name}.{export_format}" + ('.gz' if gzip else '')
@@ -0,0 +1,119 @@
+"""
+Goal progress engine.
+
+Reads the user's weight series from UserMetrics in one query (the
+(user, date_recorded) index) and derives, for a weight goal:
+
+- percent of the way from the starting weight to target_weight_kg
+- the least-squares weight trend (kg per week)
+- the projected date the target is reached at that trend, and whether
+  that is on or before target_date
+
+Results are cached per goal under the user's UserMetrics cache generation
+(bumped on any metric save/delete) and the goal's updated_at, so editing
+either the goal or any weight entry recomputes it.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.models import UserMetrics
+from api.services.cache_generations import bump_generation, get_generation
+from api.services.timeseries import linear_fit
+
+CACHE_NAMESPACE = 'goal_progress'
+
+# Projections further out than this are reported as None
+MAX_PROJECTION_DAYS = 5 * 365
+
+
+def invalidate_goal_progress(user_id):
+    bump_generation(CACHE_NAMESPACE, user_id)
+
+
+def invalidate_goal_progress_for_instance(sender, instance, **kwargs):
+    """post_save / post_delete receiver for UserMetrics."""
+    invalidate_goal_progress(instance.user_id)
+
+
+def weight_series(goal):
+    """(date, kg) pairs from the goal's start date onwards, oldest first."""
+    start = goal.start_date or goal.created_at.date()
+    return [
+        (day, float(weight))
+        for day, weight in UserMetrics.objects.filter(
+            user_id=goal.user_id, date_recorded__gte=start, weight_kg__isnull=False
+        ).order_by('date_recorded').values_list('date_recorded', 'weight_kg')
+    ]
+
+
+def compute_goal_progress(goal):
+    series = weight_series(goal)
+    target = float(goal.target_weight_kg) if goal.target_weight_kg is not None else None
+    progress = {
+        'goal_id': str(goal.id),
+        'target_weight_kg': target,
+        'target_date': goal.target_date,
+        'data_points': len(series),
+        'start_weight_kg': None,
+        'current_weight_kg': None,
+        'last_recorded': None,
+        'percent_complete': None,
+        'weekly_change_kg': None,
+        'projected_completion_date': None,
+        'on_track': None,
+    }
+    if not series:
+        return progress
+
+    start_weight = series[0][1]
+    last_day, current = series[-1]
+    progress.update({
+        'start_weight_kg': start_weight,
+        'current_weight_kg': current,
+        'last_recorded': last_day,
+    })
+
+    first_day = series[0][0]
+    slope, _ = linear_fit([(day - first_day).days for day, _ in series], [kg for _, kg in series])
+    if len(series) > 1:
+        progress['weekly_change_kg'] = round(slope * 7, 3)
+
+    if target is None:
+        return progress
+
+    remaining = target - current
+    if start_weight == target:
+        percent = 100.0 if remaining == 0 else 0.0
+    else:
+        percent = (start_weight - current) / (start_weight - target) * 100
+    progress['percent_complete'] = round(min(max(percent, 0.0), 100.0), 1)
+
+    if remaining == 0 or (start_weight - target) * (current - target) < 0:
+        # At or past the target
+        progress['projected_completion_date'] = last_day
+    elif slope and (remaining > 0) == (slope > 0):
+        days = remaining / slope
+        if days <= MAX_PROJECTION_DAYS:
+            progress['projected_completion_date'] = last_day + timedelta(days=round(days))
+
+    projected = progress['projected_completion_date']
+    if goal.target_date and len(series) > 1:
+        progress['on_track'] = projected is not None and projected <= goal.target_date
+    return progress
+
+
+def get_goal_progress(goal):
+    """Return cached progress for goal, computing it on a miss."""
+    ttl = getattr(settings, 'GOAL_PROGRESS_CACHE_TTL', 3600)
+    if ttl <= 0:
+        return compute_goal_progress(goal)
+
+    generation = get_generation(CACHE_NAMESPACE, goal.user_id)
+    key = f"{CACHE_NAMESPACE}:{goal.id}:{generation}:{goal.updated_at.timestamp()}"
+    progress = cache.get(key)
+    if progress is None:
+        progress = compute_goal_progress(goal)
+        cache.set(key, progress, ttl)
+    return progress
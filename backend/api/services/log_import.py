@@ -0,0 +1,197 @@
+"""
+Streaming import of historical workout and nutrition logs.
+
+Files are read as a stream (NDJSON or CSV, optionally gzipped - detected
+from the magic bytes), each row is validated with the bulk-upload item
+serializer, and valid rows are inserted IMPORT_CHUNK_SIZE at a time with
+bulk_create, one transaction per chunk. An invalid row is reported with
+its line number and skipped; it never aborts the import. Derived data
+(dashboard cache, daily nutrition rollups, training analytics) is
+refreshed once at the end instead of per chunk.
+
+NDJSON records may carry a "type" (as written by the export), so a full
+export can be imported as-is; records of types that cannot be imported
+are skipped. Rows re-using a client_id the user already has are counted
+as duplicates, which makes re-running an import safe.
+"""
+import csv
+import gzip
+import io
+import json
+import logging
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from api.models import NutritionLog, WorkoutLog
+from api.serializers import NutritionLogBulkItemSerializer, WorkoutLogBulkItemSerializer
+from api.services.bulk_logs import insert_logs, refresh_derived
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_READ_BUFFER_SIZE = 64 * 1024
+
+# Only the first few invalid rows are returned in detail
+MAX_REPORTED_ERRORS = 100
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+FORMATS = ('ndjson', 'csv')
+
+# type -> (model, item serializer)
+IMPORT_TYPES = {
+    'workout_logs': (WorkoutLog, WorkoutLogBulkItemSerializer),
+    'nutrition_logs': (NutritionLog, NutritionLogBulkItemSerializer),
+}
+
+
+class _Prefixed(io.RawIOBase):
+    """Raw stream that replays bytes already read from the head of stream."""
+
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.prefix:
+            data, self.prefix = self.prefix[:len(buffer)], self.prefix[len(buffer):]
+        else:
+            data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_text(stream):
+    """Wrap a binary file-like object as UTF-8 text, gunzipping it if needed."""
+    head = stream.read(2)
+    raw = io.BufferedReader(_Prefixed(head, stream), buffer_size=IMPORT_READ_BUFFER_SIZE)
+    if head == GZIP_MAGIC:
+        raw = gzip.GzipFile(fileobj=raw)
+    return io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+
+
+def ndjson_records(text):
+    """Yield (line_number, record or error message) for each non-blank line."""
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, 'Invalid JSON'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, 'Expected a JSON object'
+            continue
+        yield line_number, record
+
+
+def csv_records(text):
+    """Yield (line_number, record); empty cells are dropped so model defaults apply."""
+    reader = csv.DictReader(text)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ('', None)}
+
+
+class _Batch:
+    """Validated rows of one type waiting to be inserted."""
+
+    def __init__(self, record_type):
+        self.model, serializer_class = IMPORT_TYPES[record_type]
+        self.serializer = serializer_class()
+        self.entries = []
+        self.created = 0
+        self.nutrition_days = set()
+
+
+def import_logs(user, stream, import_format='ndjson', record_type=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import logs for user from a binary file-like object.
+
+    record_type is required for CSV; for NDJSON it is the default for
+    records without a "type" and filters out records of any other type.
+    Returns a summary dict with row counts and the first
+    MAX_REPORTED_ERRORS row errors.
+    """
+    if import_format not in FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(FORMATS)}")
+    if record_type is not None and record_type not in IMPORT_TYPES:
+        raise ValueError(f"Type must be one of: {', '.join(IMPORT_TYPES)}")
+    if import_format == 'csv' and record_type is None:
+        raise ValueError('CSV imports need a record type')
+
+    text = open_text(stream)
+    records = csv_records(text) if import_format == 'csv' else ndjson_records(text)
+    batches = {}
+    summary = {
+        'processed': 0,
+        'created': 0,
+        'duplicates': 0,
+        'skipped': 0,
+        'invalid': 0,
+        'errors': [],
+        'errors_truncated': False,
+    }
+
+    def reject(line_number, errors):
+        summary['invalid'] += 1
+        if len(summary['errors']) < MAX_REPORTED_ERRORS:
+            summary['errors'].append({'line': line_number, 'errors': errors})
+        else:
+            summary['errors_truncated'] = True
+
+    def flush(batch):
+        created, duplicates = insert_logs(batch.model, user, batch.entries)
+        batch.created += len(created)
+        summary['created'] += len(created)
+        summary['duplicates'] += len(duplicates)
+        if batch.model is NutritionLog:
+            batch.nutrition_days.update(timezone.localdate(log.date_eaten) for log in created)
+        batch.entries = []
+
+    try:
+        for line_number, record in records:
+            summary['processed'] += 1
+            if isinstance(record, str):
+                reject(line_number, {'non_field_errors': [record]})
+                continue
+
+            row_type = record.pop('type', None) or record_type
+            if row_type is None:
+                reject(line_number, {'type': ['This field is required.']})
+                continue
+            if (record_type is not None and row_type != record_type) or str(row_type) not in IMPORT_TYPES:
+                summary['skipped'] += 1
+                continue
+
+            batch = batches.get(row_type)
+            if batch is None:
+                batch = batches[row_type] = _Batch(row_type)
+            try:
+                batch.entries.append(batch.serializer.run_validation(record))
+            except serializers.ValidationError as e:
+                reject(line_number, e.detail)
+                continue
+            if len(batch.entries) >= chunk_size:
+                flush(batch)
+        for batch in batches.values():
+            if batch.entries:
+                flush(batch)
+    except (UnicodeDecodeError, OSError, EOFError, csv.Error) as e:
+        # Unreadable input (bad encoding, corrupt gzip): keep what was already imported
+        logger.warning(f"Import for user {user.id} stopped early: {e}")
+        reject(summary['processed'], {'non_field_errors': [f'Could not read file: {e}']})
+    finally:
+        for batch in batches.values():
+            if batch.created:
+                refresh_derived(batch.model, user, batch.nutrition_days)
+
+    logger.info(
+        f"Imported {summary['created']} logs for user {user.id} "
+        f"({summary['duplicates']} duplicates, {summary['invalid']} invalid, {summary['skipped']} skipped)"
+    )
+    return summary
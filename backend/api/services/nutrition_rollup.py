@@ -0,0 +1,124 @@
+"""
+Daily nutrition rollup.
+
+DailyNutritionSummary holds one row per user per day with the summed
+calories/protein/carbs/sugar (each multiplied by quantity) and entry counts
+by meal type. Saving or deleting a NutritionLog recomputes only the day(s)
+it touches - an indexed range scan over that user's logs for one day - so
+the table never drifts and reads never re-sum raw logs. Days follow
+settings.TIME_ZONE.
+"""
+import logging
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from api.models import DailyNutritionSummary, NutritionLog
+
+logger = logging.getLogger(__name__)
+
+NUTRIENT_FIELDS = ['calories', 'protein', 'carbs', 'sugar']
+
+REBUILD_BATCH_SIZE = 500
+
+# Above this many touched days one grouped rebuild beats per-day refreshes
+REFRESH_DAYS_REBUILD_THRESHOLD = 60
+
+
+def _aggregates():
+    total = DecimalField(max_digits=12, decimal_places=4)
+    aggregates = {
+        field: Coalesce(Sum(F(field) * F('quantity'), output_field=total), Value(Decimal('0')), output_field=total)
+        for field in NUTRIENT_FIELDS
+    }
+    aggregates['entry_count'] = Count('id')
+    for meal_type, _ in NutritionLog.MEAL_TYPE_CHOICES:
+        aggregates[f'{meal_type}_count'] = Count('id', filter=Q(meal_type=meal_type))
+    return aggregates
+
+
+def day_bounds(day):
+    """Aware [start, end) datetimes covering day in the current time zone."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def refresh_day(user_id, day):
+    """Recompute one user's summary row for day (deleted when no logs remain)."""
+    start, end = day_bounds(day)
+    totals = NutritionLog.objects.filter(
+        user_id=user_id, date_eaten__gte=start, date_eaten__lt=end
+    ).aggregate(**_aggregates())
+
+    if not totals['entry_count']:
+        DailyNutritionSummary.objects.filter(user_id=user_id, date=day).delete()
+        return
+    DailyNutritionSummary.objects.update_or_create(user_id=user_id, date=day, defaults=totals)
+
+
+def refresh_days(user_id, days):
+    """Recompute the given days for one user, or rebuild all of the user's rows when there are many."""
+    if len(days) > REFRESH_DAYS_REBUILD_THRESHOLD:
+        rebuild(user_id=user_id)
+        return
+    for day in days:
+        refresh_day(user_id, day)
+
+
+def rebuild(user_id=None):
+    """
+    Drop and rebuild summaries from NutritionLog, for one user or everyone.
+    Returns the number of summary rows written.
+    """
+    logs = NutritionLog.objects.all()
+    summaries = DailyNutritionSummary.objects.all()
+    if user_id:
+        logs = logs.filter(user_id=user_id)
+        summaries = summaries.filter(user_id=user_id)
+
+    rows = (
+        logs.annotate(day=TruncDate('date_eaten'))
+        .values('user_id', 'day')
+        .annotate(**_aggregates())
+        .order_by()
+    )
+    with transaction.atomic():
+        summaries.delete()
+        created = DailyNutritionSummary.objects.bulk_create(
+            [DailyNutritionSummary(user_id=row.pop('user_id'), date=row.pop('day'), **row) for row in rows.iterator()],
+            batch_size=REBUILD_BATCH_SIZE,
+        )
+    logger.info(f"Rebuilt {len(created)} daily nutrition summaries" + (f" for user {user_id}" if user_id else ""))
+    return len(created)
+
+
+# -------------------------------
+# Signal receivers (connected in ApiConfig.ready)
+# -------------------------------
+def remember_previous_day(sender, instance, raw=False, **kwargs):
+    """pre_save: note the day an updated log used to belong to."""
+    instance._rollup_previous = None
+    if raw or instance._state.adding:
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('user_id', 'date_eaten').first()
+    if previous:
+        instance._rollup_previous = (previous[0], timezone.localdate(previous[1]))
+
+
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    days = {(instance.user_id, timezone.localdate(instance.date_eaten))}
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous:
+        days.add(previous)
+    for user_id, day in days:
+        refresh_day(user_id, day)
+
+
+def update_rollup_on_delete(sender, instance, **kwargs):
+    refresh_day(instance.user_id, timezone.localdate(instance.date_eaten))
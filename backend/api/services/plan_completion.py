@@ -0,0 +1,307 @@
+"""
+Exercise completion tracking for workout plans.
+
+Each ticked exercise is one ExerciseCompletion row keyed by (plan,
+day_number, exercise_index), so a tick is a single-row upsert plus an
+integer update of WorkoutPlan.completed_exercise_count - the plan JSON
+is never loaded or rewritten. The plan row is locked for the duration of
+the transaction, so concurrent ticks from several devices apply one
+after another and the counter always matches the rows. A whole workout
+day can be applied at once with set_exercise_completions, which writes
+every row in one upsert. Ticks must point at an exercise in the plan
+(WorkoutPlan.day_exercise_counts, read under the lock); anything else
+raises CompletionOutOfRange and writes nothing.
+
+The same transaction keeps the denormalized progress counters current:
+completed count, completion percent and day streaks on the plan, and the
+completed total and workout streaks on the user (locked after the plan,
+always in that order). A streak day is a local calendar day on which at
+least one exercise was ticked complete; unticking never shortens a
+streak. A streak that was not extended yesterday or today is stale until
+`manage.py refresh_progress_counters` (run daily) resets it.
+"""
+import json
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Least
+from django.utils import timezone
+
+from api.authentication import invalidate_cached_user
+from api.models import ExerciseCompletion, User, WorkoutLog, WorkoutPlan
+from api.services.dashboard import invalidate_dashboard
+from api.services.training_analytics import invalidate_training_analytics
+
+COMPLETION_KEY_FIELDS = ['workout_plan', 'day_number', 'exercise_index']
+# Plans per counter UPDATE in rebuild_counters
+REBUILD_BATCH_SIZE = 500
+
+
+class CompletionOutOfRange(ValueError):
+    """Raised when a completion names a day or exercise the plan does not have."""
+
+    def __init__(self, positions):
+        self.positions = positions
+        super().__init__(
+            'No such exercise in the plan: '
+            + ', '.join(f'day {day_number} exercise {exercise_index}' for day_number, exercise_index in positions)
+        )
+
+
+def completion_percent(completed, total):
+    if not total:
+        return 0.0
+    return min(completed, total) * 100 / total
+
+
+def advance_streak(current, longest, last_day, today):
+    """Streak counters after activity on today: (current, longest, last_day)."""
+    if last_day == today:
+        return current, longest, last_day
+    current = current + 1 if last_day == today - timedelta(days=1) else 1
+    return current, max(longest, current), today
+
+
+def completion_state(workout_plan):
+    """Plan-level counters for completion responses."""
+    return {
+        'completed_exercise_count': workout_plan.completed_exercise_count,
+        'exercise_count': workout_plan.exercise_count,
+        'completion_percent': round(workout_plan.completion_percent, 1),
+        'current_streak': workout_plan.current_streak,
+        'longest_streak': workout_plan.longest_streak,
+    }
+
+
+def set_exercise_completion(workout_plan, day_number, exercise_index, completed=True):
+    """
+    Record one exercise as complete or incomplete.
+    Returns the ExerciseCompletion row; workout_plan's counters are refreshed.
+    Raises CompletionOutOfRange if the plan has no such exercise.
+    """
+    with transaction.atomic():
+        _lock(workout_plan)
+        _check_positions(workout_plan, [(day_number, exercise_index)])
+        completion, _ = ExerciseCompletion.objects.update_or_create(
+            workout_plan=workout_plan,
+            day_number=day_number,
+            exercise_index=exercise_index,
+            defaults={'completed': completed, 'completed_at': timezone.now() if completed else None},
+        )
+        refresh_counters(workout_plan, completed_on=timezone.localdate() if completed else None)
+    invalidate_dashboard(workout_plan.user_id)
+    return completion
+
+
+def set_exercise_completions(workout_plan, items, log_workouts=False):
+    """
+    Apply many completion changes in one transaction with a single upsert.
+    items are dicts with day_number, exercise_index, completed and optional
+    WorkoutLog overrides (sets_performed, reps_performed, duration_minutes,
+    perceived_effort); a repeated (day_number, exercise_index) keeps the last.
+    With log_workouts, a WorkoutLog is bulk-created for each completed
+    exercise found in the plan.
+    Returns (completion rows, workout logs created). Raises
+    CompletionOutOfRange, and applies nothing, if any item names an
+    exercise the plan does not have.
+    """
+    now = timezone.now()
+    latest = {(item['day_number'], item['exercise_index']): item for item in items}
+    completions = [
+        ExerciseCompletion(
+            workout_plan=workout_plan,
+            day_number=day_number,
+            exercise_index=exercise_index,
+            completed=item['completed'],
+            completed_at=now if item['completed'] else None,
+        )
+        for (day_number, exercise_index), item in latest.items()
+    ]
+
+    logs = []
+    with transaction.atomic():
+        _lock(workout_plan)
+        _check_positions(workout_plan, latest)
+        ExerciseCompletion.objects.bulk_create(
+            completions,
+            update_conflicts=True,
+            unique_fields=COMPLETION_KEY_FIELDS,
+            update_fields=['completed', 'completed_at', 'updated_at'],
+        )
+        any_completed = any(completion.completed for completion in completions)
+        refresh_counters(workout_plan, completed_on=timezone.localdate(now) if any_completed else None)
+
+        if log_workouts:
+            logs = _workout_logs(workout_plan, [item for item in latest.values() if item['completed']], now)
+            WorkoutLog.objects.bulk_create(logs)
+
+    invalidate_dashboard(workout_plan.user_id)
+    if logs:
+        invalidate_training_analytics(workout_plan.user_id)
+    return completions, logs
+
+
+def plan_exercise(plan_data, day_number, exercise_index):
+    """The exercise dict at (day_number, exercise_index) in plan JSON, or None."""
+    plan = plan_data.get('data') if isinstance(plan_data.get('data'), dict) else plan_data
+    days = [day for day in plan.get('days') or [] if isinstance(day, dict)]
+    # Days are numbered by day_number, falling back to 1-based position
+    day = next(
+        (day for position, day in enumerate(days, start=1) if (day.get('day_number') or position) == day_number),
+        None,
+    )
+    exercises = (day or {}).get('exercises') or []
+    if 0 <= exercise_index < len(exercises) and isinstance(exercises[exercise_index], dict):
+        return exercises[exercise_index]
+    return None
+
+
+def _leading_int(value, default=1):
+    match = re.match(r'\s*(\d+)', str(value)) if value is not None else None
+    return int(match.group(1)) if match else default
+
+
+def _workout_logs(workout_plan, items, performed_at):
+    if not items:
+        return []
+    plan_data = WorkoutPlan.objects.values_list('workout_plan_data', flat=True).get(pk=workout_plan.pk) or {}
+    logs = []
+    for item in items:
+        exercise = plan_exercise(plan_data, item['day_number'], item['exercise_index'])
+        if not exercise or not exercise.get('exercise_name'):
+            continue
+        logs.append(WorkoutLog(
+            user_id=workout_plan.user_id,
+            exercise_name=exercise['exercise_name'],
+            date_performed=performed_at,
+            sets_performed=item.get('sets_performed') or _leading_int(exercise.get('sets')),
+            reps_performed=item.get('reps_performed') or _leading_int(exercise.get('reps')),
+            duration_minutes=item.get('duration_minutes'),
+            perceived_effort=item.get('perceived_effort'),
+        ))
+    return logs
+
+
+def _lock(workout_plan):
+    """Lock the plan row and pick up its current counters."""
+    fields = ['exercise_count', 'day_exercise_counts', 'current_streak', 'longest_streak', 'last_completed_on']
+    current = WorkoutPlan.objects.select_for_update().values(*fields).get(pk=workout_plan.pk)
+    for field in fields:
+        setattr(workout_plan, field, current[field])
+
+
+def _check_positions(workout_plan, positions):
+    """Raise CompletionOutOfRange for (day_number, exercise_index) pairs outside the locked plan."""
+    invalid = [position for position in positions if not workout_plan.has_exercise(*position)]
+    if invalid:
+        raise CompletionOutOfRange(invalid)
+
+
+def refresh_counters(workout_plan, completed_on=None):
+    """
+    Recount the plan's completed rows into its counters and roll them up
+    to the user; completed_on extends the streaks. Rows for positions the
+    plan no longer has are not counted. Call with the plan row locked (see
+    _lock).
+    """
+    completed = ExerciseCompletion.objects.filter(
+        WorkoutPlan.exercise_slots(workout_plan.day_exercise_counts), workout_plan=workout_plan, completed=True
+    ).count()
+    workout_plan.completed_exercise_count = min(completed, workout_plan.exercise_count)
+    workout_plan.completion_percent = completion_percent(completed, workout_plan.exercise_count)
+    fields = {
+        'completed_exercise_count': workout_plan.completed_exercise_count,
+        'completion_percent': workout_plan.completion_percent,
+        # Completions are merged into the plan payload; moves its ETag on
+        'updated_at': timezone.now(),
+    }
+    if completed_on:
+        workout_plan.current_streak, workout_plan.longest_streak, workout_plan.last_completed_on = advance_streak(
+            workout_plan.current_streak, workout_plan.longest_streak, workout_plan.last_completed_on, completed_on
+        )
+        fields.update(
+            current_streak=workout_plan.current_streak,
+            longest_streak=workout_plan.longest_streak,
+            last_completed_on=workout_plan.last_completed_on,
+        )
+    WorkoutPlan.objects.filter(pk=workout_plan.pk).update(**fields)
+    refresh_user_counters(workout_plan.user_id, completed_on)
+
+
+def refresh_user_counters(user_id, completed_on=None):
+    """Total the user's plan counters and, with completed_on, extend the user's workout streak."""
+    with transaction.atomic():
+        streaks = (
+            User.objects.select_for_update()
+            .filter(pk=user_id)
+            .values('workout_streak', 'longest_workout_streak', 'last_workout_date')
+            .first()
+        )
+        if streaks is None:
+            return
+        fields = {
+            'completed_exercise_count': WorkoutPlan.objects.filter(user_id=user_id).aggregate(
+                total=Coalesce(Sum('completed_exercise_count'), 0)
+            )['total'],
+        }
+        if completed_on:
+            current, longest, last_day = advance_streak(
+                streaks['workout_streak'], streaks['longest_workout_streak'], streaks['last_workout_date'], completed_on
+            )
+            fields.update(workout_streak=current, longest_workout_streak=longest, last_workout_date=last_day)
+        User.objects.filter(pk=user_id).update(**fields)
+    # update() skips the post_save receivers that drop the cached session user
+    invalidate_cached_user(user_id)
+
+
+def refresh_user_counters_on_plan_delete(sender, instance, **kwargs):
+    """post_delete receiver for WorkoutPlan: drop the plan from the user's totals."""
+    refresh_user_counters(instance.user_id)
+
+
+def reset_stale_streaks(today=None):
+    """Zero current streaks not extended yesterday or today. Returns (plans, users) reset."""
+    cutoff = (today or timezone.localdate()) - timedelta(days=1)
+    plans = WorkoutPlan.objects.filter(current_streak__gt=0, last_completed_on__lt=cutoff).update(
+        current_streak=0, updated_at=timezone.now()
+    )
+    stale_users = User.objects.filter(workout_streak__gt=0, last_workout_date__lt=cutoff)
+    user_ids = list(stale_users.values_list('id', flat=True))
+    users = stale_users.update(workout_streak=0)
+    for user_id in user_ids:
+        invalidate_cached_user(user_id)
+        invalidate_dashboard(user_id)
+    return plans, users
+
+
+def rebuild_counters(user_id=None):
+    """
+    Recompute completed counts and percentages for every plan (or one
+    user's) from the completion rows, counting only rows that point at an
+    exercise in the plan. Plans sharing a day layout are updated together.
+    """
+    plans = WorkoutPlan.objects.all()
+    if user_id:
+        plans = plans.filter(user_id=user_id)
+    with transaction.atomic():
+        layouts = defaultdict(list)
+        for pk, day_exercise_counts in plans.values_list('pk', 'day_exercise_counts').iterator():
+            layouts[json.dumps(day_exercise_counts, sort_keys=True)].append(pk)
+        for layout, pks in layouts.items():
+            completed = ExerciseCompletion.objects.filter(
+                WorkoutPlan.exercise_slots(json.loads(layout)), workout_plan=OuterRef('pk'), completed=True
+            ).values('workout_plan').annotate(total=Count('id')).values('total')
+            for start in range(0, len(pks), REBUILD_BATCH_SIZE):
+                WorkoutPlan.objects.filter(pk__in=pks[start:start + REBUILD_BATCH_SIZE]).update(
+                    completed_exercise_count=Least(Coalesce(Subquery(completed), 0), F('exercise_count'))
+                )
+        plans.update(completion_percent=WorkoutPlan.completion_percent_expression(), updated_at=timezone.now())
+        user_ids = list(plans.values_list('user_id', flat=True).distinct())
+        for plan_user_id in user_ids:
+            refresh_user_counters(plan_user_id)
+    for plan_user_id in user_ids:
+        invalidate_dashboard(plan_user_id)
+    return len(user_ids)
@@ -0,0 +1,242 @@
+"""
+Plan template library.
+
+Most generation requests fall into a small grid of goal x experience x
+days-per-week (workout) or goal x calorie target x diet (meal) combinations.
+The ``build_plan_templates`` management command pre-generates and pre-enriches
+a plan for every cell of that grid; the generate views then serve a matching
+template instantly and only call Gemini for uncommon requests.
+
+Serving a template does not write to the database: hits are counted in the
+cache and ``manage.py flush_template_stats`` (run periodically) adds them to
+PlanTemplate.times_served.
+"""
+import copy
+import logging
+import re
+from fractions import Fraction
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from api.models import PlanTemplate
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Parameter grid
+# -------------------------------
+WORKOUT_GOALS = ['build muscle', 'lose weight', 'improve endurance', 'general fitness']
+EXPERIENCE_LEVELS = ['beginner', 'intermediate', 'advanced']
+DAYS_PER_WEEK = [3, 4, 5]
+
+MEAL_GOALS = ['lose weight', 'maintain weight', 'build muscle']
+CALORIE_TARGETS = [1500, 1800, 2000, 2200, 2500, 2800]
+DIETARY_PREFERENCE_SETS = [[], ['vegetarian']]
+
+NUTRITION_KEYS = ['calories', 'protein', 'carbs', 'fat', 'trans_fat', 'fiber', 'sugar']
+
+# Leading quantity of an ingredient measure: "150 g", "1.5 cups", "1/2 cup",
+# "1 1/2 cups", "2-3 cloves"
+_NUMBER = r'\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?'
+MEASURE_QUANTITY = re.compile(rf'^\s*({_NUMBER})(?:\s*-\s*({_NUMBER}))?')
+# Largest portion change served when a measure has no number to scale ("a
+# pinch"); PLAN_TEMPLATE_CALORIE_TOLERANCE alone allows up to 10%
+UNSCALED_MEASURE_TOLERANCE = 0.05
+
+
+def normalize_text(value):
+    """Lowercase and collapse separators so 'Build_Muscle' matches 'build muscle'."""
+    return ' '.join(str(value or '').lower().replace('_', ' ').replace('-', ' ').split())
+
+
+def normalize_preferences(dietary_preferences):
+    return sorted({normalize_text(p) for p in (dietary_preferences or []) if normalize_text(p)})
+
+
+def workout_template_key(user_goal, experience_level, days_per_week):
+    try:
+        days = int(days_per_week)
+    except (TypeError, ValueError):
+        return None
+    return f"workout:{normalize_text(user_goal)}:{normalize_text(experience_level)}:{days}"
+
+
+def meal_template_key(goal, daily_calorie_target, dietary_preferences):
+    return f"meal:{normalize_text(goal)}:{int(daily_calorie_target)}:{'+'.join(normalize_preferences(dietary_preferences))}"
+
+
+def nearest_calorie_target(daily_calorie_target):
+    """
+    Closest grid calorie target, or None if the request is further away than
+    settings.PLAN_TEMPLATE_CALORIE_TOLERANCE.
+    """
+    try:
+        target = float(daily_calorie_target)
+    except (TypeError, ValueError):
+        return None
+    nearest = min(CALORIE_TARGETS, key=lambda bucket: abs(bucket - target))
+    tolerance = getattr(settings, 'PLAN_TEMPLATE_CALORIE_TOLERANCE', 150)
+    return nearest if abs(nearest - target) <= tolerance else None
+
+
+def workout_grid():
+    """Yield (goal, experience_level, days_per_week) for every workout template."""
+    for goal in WORKOUT_GOALS:
+        for level in EXPERIENCE_LEVELS:
+            for days in DAYS_PER_WEEK:
+                yield goal, level, days
+
+
+def meal_grid():
+    """Yield (goal, daily_calorie_target, dietary_preferences) for every meal template."""
+    for goal in MEAL_GOALS:
+        for calories in CALORIE_TARGETS:
+            for preferences in DIETARY_PREFERENCE_SETS:
+                yield goal, calories, preferences
+
+
+# -------------------------------
+# Lookup
+# -------------------------------
+def served_count_key(template_id):
+    return f"plan_template:served:{template_id}"
+
+
+def record_served(template):
+    """Count a template hit in the cache; flush_served_counts moves it to the database."""
+    key = served_count_key(template.id)
+    if not cache.add(key, 1, None):
+        cache.incr(key)
+
+
+def flush_served_counts():
+    """Add the cached hit counts to PlanTemplate.times_served. Returns the hits flushed."""
+    keys = {served_count_key(template_id): template_id
+            for template_id in PlanTemplate.objects.values_list('id', flat=True)}
+    flushed = 0
+    for key, count in cache.get_many(keys).items():
+        if not count:
+            continue
+        PlanTemplate.objects.filter(id=keys[key]).update(times_served=F('times_served') + count)
+        # Hits recorded since the read stay in the cache for the next flush
+        cache.decr(key, count)
+        flushed += count
+    return flushed
+
+
+def _fetch(template_key):
+    template = PlanTemplate.objects.filter(template_key=template_key).first()
+    if template:
+        record_served(template)
+    return template
+
+
+def find_workout_template(user_goal, experience_level, days_per_week):
+    """Return the PlanTemplate for these parameters, or None."""
+    key = workout_template_key(user_goal, experience_level, days_per_week)
+    return _fetch(key) if key else None
+
+
+def find_meal_template(goal, daily_calorie_target, dietary_preferences):
+    """
+    Return (template, plan_data) with the plan scaled to the requested calorie
+    target, or (None, None) when no template is close enough or it cannot be
+    scaled that far.
+    """
+    bucket = nearest_calorie_target(daily_calorie_target)
+    if bucket is None:
+        return None, None
+    template = PlanTemplate.objects.filter(template_key=meal_template_key(goal, bucket, dietary_preferences)).first()
+    if template is None:
+        return None, None
+    plan_data = scale_meal_plan(template.plan_data, float(daily_calorie_target) / bucket)
+    if plan_data is None:
+        return None, None
+    record_served(template)
+    return template, plan_data
+
+
+def _format_quantity(value):
+    if value >= 10:
+        return str(round(value))
+    return f"{value:.2f}".rstrip('0').rstrip('.')
+
+
+def scale_measure(measure, factor):
+    """
+    Scale the leading quantity of an ingredient measure ("150 g" -> "165 g"
+    at 1.1), or return None when it does not start with a number.
+    """
+    match = MEASURE_QUANTITY.match(measure or '')
+    if not match:
+        return None
+    quantities = [
+        _format_quantity(float(sum(Fraction(part) for part in quantity.split())) * factor)
+        for quantity in match.groups() if quantity
+    ]
+    return '-'.join(quantities) + measure[match.end():]
+
+
+def scale_meal_plan(plan_data, factor):
+    """
+    Scale every nutrition value and ingredient measure in a meal plan by
+    ``factor`` (light personalization). Returns None when a measure has no
+    quantity to scale and factor is beyond UNSCALED_MEASURE_TOLERANCE, since
+    the portions would no longer match the nutrition values.
+    """
+    plan_data = copy.deepcopy(plan_data)
+    if abs(factor - 1) < 0.005:
+        return plan_data
+
+    def scale(values):
+        for key in NUTRITION_KEYS:
+            if isinstance(values.get(key), (int, float)):
+                values[key] = round(values[key] * factor, 1)
+
+    for day in plan_data.get('days', []):
+        for meal in (day.get('meals') or {}).values():
+            for ingredient in meal.get('ingredients', []):
+                scale(ingredient)
+                measure = scale_measure(ingredient.get('measure'), factor)
+                if measure is not None:
+                    ingredient['measure'] = measure
+                elif abs(factor - 1) > UNSCALED_MEASURE_TOLERANCE:
+                    return None
+            scale(meal.get('meal_totals') or {})
+        scale(day.get('daily_totals') or {})
+    plan_data['portion_scale'] = round(factor, 3)
+    return plan_data
+
+
+# -------------------------------
+# Storage
+# -------------------------------
+def store_workout_template(user_goal, experience_level, days_per_week, plan_data, enrichment_stats=None):
+    template, _created = PlanTemplate.objects.update_or_create(
+        template_key=workout_template_key(user_goal, experience_level, days_per_week),
+        defaults={
+            'plan_type': 'workout',
+            'goal': normalize_text(user_goal),
+            'experience_level': normalize_text(experience_level),
+            'days_per_week': int(days_per_week),
+            'plan_data': plan_data,
+            'enrichment_stats': enrichment_stats or {},
+        }
+    )
+    return template
+
+
+def store_meal_template(goal, daily_calorie_target, dietary_preferences, plan_data):
+    template, _created = PlanTemplate.objects.update_or_create(
+        template_key=meal_template_key(goal, daily_calorie_target, dietary_preferences),
+        defaults={
+            'plan_type': 'meal',
+            'goal': normalize_text(goal),
+            'daily_calorie_target': int(daily_calorie_target),
+            'dietary_preferences': normalize_preferences(dietary_preferences),
+            'plan_data': plan_data,
+        }
+    )
+    return template
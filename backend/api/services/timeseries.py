@@ -0,0 +1,61 @@
+"""
+Small numeric helpers for the analytics services.
+
+NumPy is optional: when it is installed, series of at least
+VECTORIZE_MIN_POINTS values are handled with vectorized operations;
+otherwise (and for short series) plain Python is used.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+VECTORIZE_MIN_POINTS = 32
+
+
+def _use_numpy(values):
+    return np is not None and len(values) >= VECTORIZE_MIN_POINTS
+
+
+def linear_fit(xs, ys):
+    """Least-squares (slope, intercept) of ys against xs; slope 0 for fewer than two distinct xs."""
+    count = len(xs)
+    if count < 2:
+        return 0.0, float(ys[0]) if ys else 0.0
+
+    if _use_numpy(xs):
+        x = np.asarray(xs, dtype=float)
+        y = np.asarray(ys, dtype=float)
+        x_centered = x - x.mean()
+        denominator = float(x_centered @ x_centered)
+        if denominator == 0:
+            return 0.0, float(y.mean())
+        slope = float(x_centered @ (y - y.mean())) / denominator
+        return slope, float(y.mean() - slope * x.mean())
+
+    mean_x = sum(xs) / count
+    mean_y = sum(ys) / count
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    if denominator == 0:
+        return 0.0, mean_y
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+    return slope, mean_y - slope * mean_x
+
+
+def rolling_mean(values, window):
+    """Trailing mean over `window` values; None until the window fills."""
+    result = [None] * len(values)
+    if len(values) < window:
+        return result
+
+    if _use_numpy(values):
+        means = np.convolve(np.asarray(values, dtype=float), np.ones(window) / window, mode='valid')
+        result[window - 1:] = [float(value) for value in means]
+        return result
+
+    total = sum(values[:window])
+    result[window - 1] = total / window
+    for index in range(window, len(values)):
+        total += values[index] - values[index - window]
+        result[index] = total / window
+    return result
@@ -0,0 +1,149 @@
+"""
+Training volume analytics over WorkoutLog.
+
+Volume (sets x reps), duration, calories and average RPE are aggregated
+in SQL, bucketed by week or month, over a bounded window of recent
+periods - a range scan on the (user, date_performed) index - so the cost
+depends on the window, not on how many years of logs the user has.
+
+Results are cached per user under a cache generation (see
+cache_generations) that is bumped whenever one of their logs changes,
+which orphans every cached variant (period, window, trend) at once.
+Rolling averages and the trend line come from api.services.timeseries.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, DateField, F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from api.models import WorkoutLog
+from api.services.cache_generations import bump_generation, get_generation
+from api.services.timeseries import linear_fit, rolling_mean
+
+PERIODS = {
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+ROLLING_WINDOW = 4
+
+CACHE_NAMESPACE = 'training_analytics'
+
+
+def invalidate_training_analytics(user_id):
+    bump_generation(CACHE_NAMESPACE, user_id)
+
+
+def invalidate_training_analytics_for_instance(sender, instance, **kwargs):
+    """post_save / post_delete receiver for WorkoutLog."""
+    invalidate_training_analytics(instance.user_id)
+
+
+# -------------------------------
+# Period arithmetic
+# -------------------------------
+def period_start(day, period):
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def previous_period_start(day, period):
+    if period == 'week':
+        return day - timedelta(weeks=1)
+    return (day - timedelta(days=1)).replace(day=1)
+
+
+def period_starts(period, count, today):
+    """The last `count` period start dates, oldest first, ending with today's period."""
+    starts = [period_start(today, period)]
+    while len(starts) < count:
+        starts.append(previous_period_start(starts[-1], period))
+    return starts[::-1]
+
+
+# -------------------------------
+# Aggregation
+# -------------------------------
+def _metrics():
+    return {
+        'volume': Sum(F('sets_performed') * F('reps_performed')),
+        'sets': Sum('sets_performed'),
+        'duration_minutes': Sum('duration_minutes'),
+        'calories_burned': Sum('calories_burned'),
+        'avg_rpe': Avg('perceived_effort'),
+        'log_count': Count('id'),
+    }
+
+
+def _clean(row):
+    for field in ('volume', 'sets', 'duration_minutes', 'calories_burned'):
+        row[field] = row[field] or 0
+    if row['avg_rpe'] is not None:
+        row['avg_rpe'] = round(row['avg_rpe'], 2)
+    return row
+
+
+def build_training_volume(user, period='week', periods=12, trend=False):
+    """Aggregate the user's last `periods` weeks/months of WorkoutLog (two queries)."""
+    starts = period_starts(period, periods, timezone.localdate())
+    window_start = timezone.make_aware(datetime.combine(starts[0], time.min))
+    logs = WorkoutLog.objects.filter(user=user, date_performed__gte=window_start)
+
+    rows = (
+        logs.annotate(bucket=PERIODS[period]('date_performed', output_field=DateField()))
+        .values('bucket')
+        .annotate(**_metrics())
+        .order_by('bucket')
+    )
+    by_bucket = {row.pop('bucket'): _clean(row) for row in rows}
+    empty = {'volume': 0, 'sets': 0, 'duration_minutes': 0, 'calories_burned': 0, 'avg_rpe': None, 'log_count': 0}
+    buckets = [{'period_start': start, **by_bucket.get(start, empty)} for start in starts]
+
+    exercises = [
+        _clean(row) for row in
+        logs.exclude(exercise_name='')
+        .values('exercise_name')
+        .annotate(**_metrics())
+        .order_by('-volume', 'exercise_name')
+    ]
+
+    data = {
+        'period': period,
+        'start': starts[0],
+        'buckets': buckets,
+        'exercises': exercises,
+    }
+    if trend:
+        data['trend'] = volume_trend([bucket['volume'] for bucket in buckets])
+    return data
+
+
+def get_training_volume(user, period='week', periods=12, trend=False):
+    """Return cached analytics for user, building them on a miss."""
+    ttl = getattr(settings, 'TRAINING_ANALYTICS_CACHE_TTL', 900)
+    if ttl <= 0:
+        return build_training_volume(user, period, periods, trend)
+
+    key = f"{CACHE_NAMESPACE}:{user.id}:{get_generation(CACHE_NAMESPACE, user.id)}:{period}:{periods}:{int(trend)}"
+    data = cache.get(key)
+    if data is None:
+        data = build_training_volume(user, period, periods, trend)
+        cache.set(key, data, ttl)
+    return data
+
+
+# -------------------------------
+# Trend
+# -------------------------------
+def volume_trend(volumes, window=ROLLING_WINDOW):
+    """
+    Rolling mean over `window` periods (None until the window fills) and the
+    least-squares slope of volume per period.
+    """
+    rolling = [None if value is None else round(value, 2) for value in rolling_mean(volumes, window)]
+    slope, _ = linear_fit(list(range(len(volumes))), volumes)
+    return {'rolling_average': rolling, 'slope': round(slope, 2)}
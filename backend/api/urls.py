@@ -12,7 +12,11 @@ from .views import (
     api_info,
     generate_enriched_workout_plan,
     generate_enriched_meal_plan,
-    test_ai_services
+    test_ai_services,
+    ai_metrics,
+    admission_metrics,
+    export_data,
+    import_data,
 )
 
 router = DefaultRouter()
@@ -30,5 +34,9 @@ urlpatterns = [
     path('generate-workout-plan/', generate_enriched_workout_plan, name='generate_enriched_workout_plan'),
     path('generate-meal-plan/', generate_enriched_meal_plan, name='generate_enriched_meal_plan'),
     path('test-ai-services/', test_ai_services, name='test_ai_services'),
+    path('metrics/ai/', ai_metrics, name='ai_metrics'),
+    path('metrics/admission/', admission_metrics, name='admission_metrics'),
+    path('export/', export_data, name='export_data'),
+    path('import/', import_data, name='import_data'),
     path('', include(router.urls)),
 ]
@@ -1,8 +1,13 @@
 from rest_framework import viewsets, status
 from rest_framework.permissions import AllowAny
-from rest_framework.decorators import api_view, action, permission_classes
+from rest_framework.decorators import api_view, action, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from .permissions import IsAuthenticatedWithSession, IsOwnerOrReadOnly
+from .conditional import conditional_response, make_etag
+from .parsers import NDJSONParser, ORJSONParser
+from .permissions import IsAuthenticatedWithSession, IsOwnerOrReadOnly, HasMetricsToken
+from .pagination import KeysetCursorPagination
+from .services.admission import ai_admission, admission_controlled
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +19,7 @@ from .models import (
     WorkoutPlanCompletionLog,
     WorkoutLog,
     NutritionLog,
+    DailyNutritionSummary,
     MealPlan,
 )
 from .serializers import (
@@ -30,10 +36,18 @@ from .serializers import (
     GoalSerializer,
     GoalCreateSerializer,
     WorkoutPlanSerializer,
+    WorkoutPlanSummarySerializer,
     WorkoutPlanDetailSerializer,
+    ExerciseCompletionSerializer,
+    ExerciseCompletionInputSerializer,
+    ExerciseCompletionBatchSerializer,
     WorkoutLogSerializer,
+    WorkoutLogBulkItemSerializer,
     NutritionLogSerializer,
+    NutritionLogBulkItemSerializer,
+    DailyNutritionSummarySerializer,
     MealPlanSerializer,
+    MealPlanSummarySerializer,
     MealPlanDetailSerializer,
 )
 
@@ -93,9 +107,16 @@ class UserViewSet(viewsets.ModelViewSet):
         
         try:
             user = User.objects.get(username=username)
-            # Import the verification function
-            from .serializers import verify_password
-            if verify_password(password, user.password_hash):
+            # Verifies off the request thread and upgrades legacy/outdated hashes
+            from .passwords import verify_and_upgrade, PasswordVerificationTimeout
+            try:
+                valid = verify_and_upgrade(user, password)
+            except PasswordVerificationTimeout:
+                return Response(
+                    {'error': 'Login is busy, please try again'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            if valid:
                 # Create session
                 request.session['user_id'] = str(user.id)
                 request.session['username'] = user.username
@@ -152,32 +173,25 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        try:
-            user = User.objects.get(id=user_id)
-            user_data = UserProfileSerializer(user).data
-            return Response({
-                'authenticated': True,
-                'user': user_data
-            })
-        except User.DoesNotExist:
-            # Session has invalid user, clear it
-            request.session.flush()
+        # Authentication already cleared the session if its user no longer exists
+        if not isinstance(request.user, User):
             return Response(
                 {'error': 'Invalid session'}, 
                 status=status.HTTP_401_UNAUTHORIZED
             )
+        
+        user_data = UserProfileSerializer(request.user).data
+        return Response({
+            'authenticated': True,
+            'user': user_data
+        })
     
     @action(detail=False, methods=['get'])
     def validate_session(self, request):
         """Quick session validation without returning user data"""
         user_id = request.session.get('user_id')
-        if user_id:
-            try:
-                User.objects.get(id=user_id)
-                return Response({'valid': True, 'user_id': user_id})
-            except User.DoesNotExist:
-                request.session.flush()
-                return Response({'valid': False}, status=status.HTTP_401_UNAUTHORIZED)
+        if user_id and isinstance(request.user, User):
+            return Response({'valid': True, 'user_id': user_id})
         return Response({'valid': False}, status=status.HTTP_401_UNAUTHORIZED)
     
     @action(detail=True, methods=['post'])
@@ -294,41 +308,20 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def dashboard(self, request, pk=None):
         """Get user dashboard with workout plans, meal plans, and recent activity.
-        Users can only access their own dashboard."""
-        user = self.get_object()
-        
-        # Verify user can only access their own dashboard
+        Users can only access their own dashboard. Plans are returned as
+        summaries; use the plan endpoints for full plan data."""
         session_user_id = request.session.get('user_id')
-        if str(user.id) != session_user_id:
+        if pk != session_user_id:
+            # Keep the 404 for unknown users before refusing access
+            self.get_object()
             return Response(
                 {"error": "You can only access your own dashboard"}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        user_data = UserSerializer(user).data
-        
-        # Get user's workout plans
-        workout_plans = WorkoutPlan.objects.filter(user=user)
-        user_data['workout_plans'] = WorkoutPlanSerializer(workout_plans, many=True).data
-        
-        # Get user's meal plans
-        meal_plans = MealPlan.objects.filter(user=user)
-        user_data['meal_plans'] = MealPlanSerializer(meal_plans, many=True).data
-        
-        # Get user's goals
-        goals = Goal.objects.filter(user=user, is_active=True)
-        user_data['active_goals'] = GoalSerializer(goals, many=True).data
-        
-        # Get recent workout logs (last 10)
-        recent_workouts = WorkoutLog.objects.filter(user=user).order_by('-date_performed')[:10]
-        user_data['recent_workouts'] = WorkoutLogSerializer(recent_workouts, many=True).data
-        
-        # Get latest metrics
-        latest_metrics = UserMetrics.objects.filter(user=user).order_by('-date_recorded').first()
-        if latest_metrics:
-            user_data['latest_metrics'] = UserMetricsSerializer(latest_metrics).data
-        
-        return Response(user_data)
+        from .services.dashboard import get_dashboard_entry
+        data, etag = get_dashboard_entry(request.user)
+        return conditional_response(request, etag, lambda: data)
 
 class UserMetricViewSet(viewsets.ModelViewSet):
     queryset = UserMetrics.objects.all()
@@ -363,9 +356,7 @@ class UserMetricViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Auto-assign the authenticated user to the metrics"""
-        user_id = self.request.session.get('user_id')
-        user = User.objects.get(id=user_id)
-        serializer.save(user=user)
+        serializer.save(user=self.request.user)
 
 class GoalViewSet(viewsets.ModelViewSet):
     queryset = Goal.objects.all()
@@ -387,9 +378,7 @@ class GoalViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Auto-assign the authenticated user to the goal"""
-        user_id = self.request.session.get('user_id')
-        user = User.objects.get(id=user_id)
-        serializer.save(user=user)
+        serializer.save(user=self.request.user)
     
     def create(self, request, *args, **kwargs):
         """Override create to return full goal data after creation"""
@@ -402,13 +391,95 @@ class GoalViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(output_serializer.data)
         return Response(output_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    @action(detail=True, methods=['get'])
+    def progress(self, request, pk=None):
+        """
+        Progress towards the goal's target weight from the user's metrics:
+        percent complete, weekly weight trend and projected completion date.
+        """
+        from .services.goal_progress import get_goal_progress
+
+        return Response(get_goal_progress(self.get_object()))
+
+# -------------------------------
+# Bulk Log Upload
+# -------------------------------
+class BulkCreateMixin:
+    """
+    Adds POST <list>/bulk/ taking a JSON array (or {"entries": [...]}) or
+    NDJSON body. Entries are validated with bulk_serializer_class and
+    inserted in one transaction; entries with an already-uploaded client_id
+    are skipped so retries don't duplicate rows.
+    """
+    bulk_serializer_class = None
+
+    @action(detail=False, methods=['post'], parser_classes=[ORJSONParser, NDJSONParser])
+    def bulk(self, request):
+        from django.conf import settings
+        from .services.bulk_logs import bulk_create_logs
+
+        entries = request.data.get('entries') if isinstance(request.data, dict) else request.data
+        if not isinstance(entries, list) or not entries:
+            return Response(
+                {'error': 'Expected a non-empty list of entries'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_entries = getattr(settings, 'BULK_LOG_MAX_ENTRIES', 500)
+        if len(entries) > max_entries:
+            return Response(
+                {'error': f'At most {max_entries} entries can be uploaded at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.bulk_serializer_class(data=entries, many=True)
+        if not serializer.is_valid():
+            return Response({'errors': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        created, duplicates = bulk_create_logs(self.queryset.model, request.user, serializer.validated_data)
+        logger.info(f"Bulk created {len(created)} {self.queryset.model.__name__} rows for user {request.user.id} ({len(duplicates)} duplicates)")
+        return Response({
+            'success': True,
+            'created': len(created),
+            'duplicates': [str(client_id) for client_id in duplicates],
+            'results': self.get_serializer(created, many=True).data,
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+# -------------------------------
+# Conditional Plan Detail
+# -------------------------------
+class ConditionalPlanMixin:
+    """
+    ETag / If-None-Match for retrieve and with_details. The ETag comes from
+    the plan's id and updated_at, so a client whose copy is current gets a
+    304 without the plan being serialized - or its JSON (plan_data_field,
+    deferred for conditional requests) even being loaded.
+    """
+    CONDITIONAL_ACTIONS = ['retrieve', 'with_details']
+    plan_data_field = None
+
+    def defer_for_conditional(self, queryset):
+        if self.action in self.CONDITIONAL_ACTIONS and 'If-None-Match' in self.request.headers:
+            return queryset.defer(self.plan_data_field)
+        return queryset
+
+    def plan_response(self, instance, serializer_class):
+        etag = make_etag(instance.pk, instance.updated_at.isoformat(), self.action)
+        return conditional_response(self.request, etag, lambda: serializer_class(instance).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.plan_response(self.get_object(), self.get_serializer)
+
 # -------------------------------
 # Nutrition Views
 # -------------------------------
-class NutritionLogViewSet(viewsets.ModelViewSet):
+class NutritionLogViewSet(BulkCreateMixin, viewsets.ModelViewSet):
     queryset = NutritionLog.objects.all()
     serializer_class = NutritionLogSerializer
     permission_classes = [IsAuthenticatedWithSession]
+    pagination_class = KeysetCursorPagination
+    cursor_ordering_field = 'date_eaten'
+    bulk_serializer_class = NutritionLogBulkItemSerializer
+    MAX_DAILY_RANGE_DAYS = 366
     
     def get_queryset(self):
         """Filter nutrition logs to only show user's own data"""
@@ -417,21 +488,106 @@ class NutritionLogViewSet(viewsets.ModelViewSet):
             return NutritionLog.objects.filter(user__id=user_id)
         return NutritionLog.objects.none()
 
+    @action(detail=False, methods=['get'])
+    def daily(self, request):
+        """
+        Daily nutrition totals from the rollup table, one entry per day
+        (days without logs are zero-filled).
+
+        Query params:
+        - start: First day, YYYY-MM-DD (default: 6 days before end)
+        - end: Last day, YYYY-MM-DD (default: today)
+        """
+        from datetime import timedelta
+        from django.utils import timezone
+        from django.utils.dateparse import parse_date
+
+        try:
+            end = parse_date(request.query_params['end']) if 'end' in request.query_params else timezone.localdate()
+            if end is None:
+                raise ValueError('invalid end')
+            start = parse_date(request.query_params['start']) if 'start' in request.query_params else end - timedelta(days=6)
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            return Response(
+                {'error': 'start and end must be dates in YYYY-MM-DD format'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start > end or (end - start).days >= self.MAX_DAILY_RANGE_DAYS:
+            return Response(
+                {'error': f'Date range must be between 1 and {self.MAX_DAILY_RANGE_DAYS} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        summaries = {
+            summary.date: summary
+            for summary in DailyNutritionSummary.objects.filter(user=request.user, date__gte=start, date__lte=end)
+        }
+        days = [
+            summaries.get(start + timedelta(days=offset)) or DailyNutritionSummary(date=start + timedelta(days=offset))
+            for offset in range((end - start).days + 1)
+        ]
+        return Response({
+            'start': start,
+            'end': end,
+            'days': DailyNutritionSummarySerializer(days, many=True).data,
+        })
+
 # -------------------------------
 # Exercise & Workout Views
 # -------------------------------
 
-class WorkoutPlanViewSet(viewsets.ModelViewSet):
+class WorkoutPlanViewSet(ConditionalPlanMixin, viewsets.ModelViewSet):
     queryset = WorkoutPlan.objects.all()
     serializer_class = WorkoutPlanSerializer
     permission_classes = [IsAuthenticatedWithSession]
+    plan_data_field = 'workout_plan_data'
     
+    # List-style actions return summaries and never load the plan JSON
+    SUMMARY_ACTIONS = ['list', 'user_workout_plans']
+    # Actions that only touch completion rows and counters
+    COMPLETION_ACTIONS = ['mark_exercise_complete', 'mark_exercises_complete']
+    # ?ordering= values accepted by the summary actions (prefix - for descending)
+    ORDERING_FIELDS = ['created_at', 'name', 'completion_percent', 'current_streak', 'longest_streak', 'last_completed_on']
+
+    def get_serializer_class(self):
+        if self.action in self.SUMMARY_ACTIONS:
+            return WorkoutPlanSummarySerializer
+        return WorkoutPlanSerializer
+
     def get_queryset(self):
         """Filter workout plans to only show user's own data"""
         user_id = self.request.session.get('user_id')
-        if user_id:
-            return WorkoutPlan.objects.filter(user__id=user_id)
-        return WorkoutPlan.objects.none()
+        if not user_id:
+            return WorkoutPlan.objects.none()
+        queryset = WorkoutPlan.objects.filter(user__id=user_id)
+        if self.action in self.SUMMARY_ACTIONS:
+            queryset = self.filter_by_progress(queryset)
+        if self.action in self.SUMMARY_ACTIONS + self.COMPLETION_ACTIONS:
+            queryset = queryset.defer('workout_plan_data')
+        return self.defer_for_conditional(queryset)
+
+    def filter_by_progress(self, queryset):
+        """
+        Apply the list query params:
+        - ordering: One of ORDERING_FIELDS, optionally prefixed with - (default: -created_at)
+        - min_completion / max_completion: Bounds on completion_percent (0-100)
+        """
+        from rest_framework.exceptions import ValidationError
+
+        params = self.request.query_params
+        ordering = params.get('ordering', '-created_at')
+        if ordering.lstrip('-') not in self.ORDERING_FIELDS:
+            raise ValidationError({'ordering': f"Must be one of: {', '.join(self.ORDERING_FIELDS)} (prefix - for descending)"})
+
+        for param, lookup in [('min_completion', 'completion_percent__gte'), ('max_completion', 'completion_percent__lte')]:
+            if param in params:
+                try:
+                    queryset = queryset.filter(**{lookup: float(params[param])})
+                except ValueError:
+                    raise ValidationError({param: 'Must be a number'})
+        return queryset.order_by(ordering, '-id')
     
     @action(detail=False, methods=['get'], url_path='user/(?P<user_id>[^/.]+)')
     def user_workout_plans(self, request, user_id=None):
@@ -445,24 +601,14 @@ class WorkoutPlanViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        try:
-            user = User.objects.get(id=user_id)
-            workout_plans = WorkoutPlan.objects.filter(user=user)
-            serializer = self.get_serializer(workout_plans, many=True)
-            return Response(serializer.data)
-        except User.DoesNotExist:
-            return Response(
-                {"error": "User not found"}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def with_details(self, request, pk=None):
         """Get workout plan with all its workout data from JSON field."""
         try:
-            workout_plan = self.get_object()
-            serializer = WorkoutPlanDetailSerializer(workout_plan)
-            return Response(serializer.data)
+            return self.plan_response(self.get_object(), WorkoutPlanDetailSerializer)
         except WorkoutPlan.DoesNotExist:
             return Response(
                 {"error": "Workout plan not found"}, 
@@ -475,7 +621,7 @@ class WorkoutPlanViewSet(viewsets.ModelViewSet):
         try:
             workout_plan = self.get_object()
             user_id = request.session.get('user_id')
-            user = User.objects.get(id=user_id)
+            user = request.user
             from django.utils import timezone
             
             # Update plan status
@@ -520,7 +666,7 @@ class WorkoutPlanViewSet(viewsets.ModelViewSet):
         try:
             workout_plan = self.get_object()
             user_id = request.session.get('user_id')
-            user = User.objects.get(id=user_id)
+            user = request.user
             
             # Update plan status
             workout_plan.is_completed = False
@@ -599,10 +745,11 @@ class WorkoutPlanViewSet(viewsets.ModelViewSet):
         try:
             workout_plan = self.get_object()
             user_id = request.session.get('user_id')
-            user = User.objects.get(id=user_id)
+            user = request.user
+            from django.utils import timezone
             
             # Deactivate all other plans for this user
-            WorkoutPlan.objects.filter(user=user, is_active=True).update(is_active=False)
+            WorkoutPlan.objects.filter(user=user, is_active=True).update(is_active=False, updated_at=timezone.now())
             
             # Activate this plan
             workout_plan.is_active = True
@@ -630,48 +777,38 @@ class WorkoutPlanViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'])
     def mark_exercise_complete(self, request, pk=None):
-        """Mark a specific exercise in a workout plan as complete."""
+        """
+        Mark a specific exercise in a workout plan as complete or incomplete.
+        Returns only the changed completion and the plan's completion counters.
+        """
+        from .services.plan_completion import CompletionOutOfRange, completion_state, set_exercise_completion
+
         try:
             workout_plan = self.get_object()
-            day_number = request.data.get('day_number')
-            exercise_index = request.data.get('exercise_index')
-            completed = request.data.get('completed', True)
-            
-            if day_number is None or exercise_index is None:
+            input_serializer = ExerciseCompletionInputSerializer(data=request.data)
+            if not input_serializer.is_valid():
                 return Response(
-                    {"error": "day_number and exercise_index are required"}, 
+                    {"error": "day_number and exercise_index are required", "details": input_serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
-            from django.utils import timezone
-            
-            # Initialize completion tracking if it doesn't exist
-            if 'exercise_completions' not in workout_plan.workout_plan_data:
-                workout_plan.workout_plan_data['exercise_completions'] = {}
-            
-            day_key = f"day_{day_number}"
-            if day_key not in workout_plan.workout_plan_data['exercise_completions']:
-                workout_plan.workout_plan_data['exercise_completions'][day_key] = {}
-            
-            exercise_key = f"exercise_{exercise_index}"
-            workout_plan.workout_plan_data['exercise_completions'][day_key][exercise_key] = {
-                'completed': completed,
-                'completed_at': timezone.now().isoformat() if completed else None
-            }
-            
-            workout_plan.save()
-            
-            serializer = self.get_serializer(workout_plan)
+            completed = input_serializer.validated_data['completed']
+
+            completion = set_exercise_completion(workout_plan, **input_serializer.validated_data)
+
             return Response({
                 'success': True,
                 'message': f'Exercise marked as {"complete" if completed else "incomplete"}',
-                'workout_plan': serializer.data
+                'workout_plan_id': str(workout_plan.id),
+                'completion': ExerciseCompletionSerializer(completion).data,
+                **completion_state(workout_plan),
             }, status=status.HTTP_200_OK)
         except WorkoutPlan.DoesNotExist:
             return Response(
                 {"error": "Workout plan not found"}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+        except CompletionOutOfRange as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Error marking exercise as complete: {e}")
             return Response(
@@ -679,11 +816,56 @@ class WorkoutPlanViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=['post'])
+    def mark_exercises_complete(self, request, pk=None):
+        """
+        Apply many exercise completions (e.g. a whole workout day) in one
+        transaction. With log_workouts, a WorkoutLog is also created for every
+        completed exercise. Returns only the updated completion state.
+
+        Body: {"completions": [{"day_number", "exercise_index", "completed"}, ...],
+               "log_workouts": false}
+        """
+        from .services.plan_completion import CompletionOutOfRange, completion_state, set_exercise_completions
+
+        workout_plan = self.get_object()
+        input_serializer = ExerciseCompletionBatchSerializer(data=request.data)
+        if not input_serializer.is_valid():
+            return Response(
+                {"error": "Invalid completions", "details": input_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            completions, logs = set_exercise_completions(
+                workout_plan,
+                input_serializer.validated_data['completions'],
+                log_workouts=input_serializer.validated_data['log_workouts'],
+            )
+        except CompletionOutOfRange as e:
+            return Response(
+                {"error": "Invalid completions", "details": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        logger.info(f"Applied {len(completions)} exercise completions to workout plan {workout_plan.id} ({len(logs)} workout logs)")
+
+        return Response({
+            'success': True,
+            'workout_plan_id': str(workout_plan.id),
+            'completions': ExerciseCompletionSerializer(completions, many=True).data,
+            'workout_logs_created': len(logs),
+            **completion_state(workout_plan),
+        }, status=status.HTTP_200_OK)
+
 
-class WorkoutLogViewSet(viewsets.ModelViewSet):
+class WorkoutLogViewSet(BulkCreateMixin, viewsets.ModelViewSet):
     queryset = WorkoutLog.objects.all()
     serializer_class = WorkoutLogSerializer
     permission_classes = [IsAuthenticatedWithSession]
+    pagination_class = KeysetCursorPagination
+    cursor_ordering_field = 'date_performed'
+    bulk_serializer_class = WorkoutLogBulkItemSerializer
+    MAX_VOLUME_PERIODS = 104
     
     def get_queryset(self):
         """Filter workout logs to only show user's own data"""
@@ -691,6 +873,37 @@ class WorkoutLogViewSet(viewsets.ModelViewSet):
         if user_id:
             return WorkoutLog.objects.filter(user__id=user_id)
         return WorkoutLog.objects.none()
+
+    @action(detail=False, methods=['get'])
+    def volume(self, request):
+        """
+        Training volume analytics bucketed by week or month.
+
+        Query params:
+        - period: week or month (default: week)
+        - periods: Number of recent periods to include (default: 12, max: 104)
+        - trend: true to add rolling averages and a volume trend slope
+        """
+        from .services.training_analytics import PERIODS, get_training_volume
+
+        period = request.query_params.get('period', 'week')
+        if period not in PERIODS:
+            return Response(
+                {'error': f"period must be one of: {', '.join(PERIODS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            periods = int(request.query_params.get('periods', 12))
+        except ValueError:
+            periods = 0
+        if not 1 <= periods <= self.MAX_VOLUME_PERIODS:
+            return Response(
+                {'error': f'periods must be between 1 and {self.MAX_VOLUME_PERIODS}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        trend = request.query_params.get('trend', '').lower() in ('1', 'true', 'yes')
+
+        return Response(get_training_volume(request.user, period, periods, trend))
     
     @action(detail=False, methods=['get'], url_path='recent-workouts')
     def recent_workouts(self, request):
@@ -710,57 +923,63 @@ class WorkoutLogViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            user = User.objects.get(id=user_id)
+            user = request.user
             
             # Get query parameters
             limit = int(request.query_params.get('limit', 10))
             days_back = int(request.query_params.get('days', 30))
             
             # Calculate date range
-            from datetime import timedelta
+            from datetime import datetime, time, timedelta
             from django.utils import timezone
+            from django.db.models import F, Max, Window
+            from django.db.models.functions import Lower, RowNumber, TruncDate
             cutoff_date = timezone.now() - timedelta(days=days_back)
             
-            # Get workout logs grouped by date
-            workout_logs = WorkoutLog.objects.filter(
+            named_logs = WorkoutLog.objects.filter(
                 user=user,
                 date_performed__gte=cutoff_date
-            ).order_by('-date_performed')
-            
-            # Group by date (date only, not datetime)
-            from collections import defaultdict
-            workouts_by_date = defaultdict(list)
+            ).exclude(exercise_name='')
             
-            for log in workout_logs:
-                date_key = log.date_performed.date()
-                workouts_by_date[date_key].append(log)
+            # Most recent `limit` session dates, grouped in the database
+            sessions = list(
+                named_logs.annotate(day=TruncDate('date_performed'))
+                .values('day')
+                .annotate(latest=Max('date_performed'))
+                .order_by('-day')[:limit]
+            )
             
-            # Convert to list of workout sessions
             recent_workouts = []
-            for date_key in sorted(workouts_by_date.keys(), reverse=True)[:limit]:
-                logs_for_date = workouts_by_date[date_key]
-                
-                # Extract unique exercises from this session
-                exercises = []
-                seen_exercises = set()
+            if sessions:
+                # Fetch only those sessions' rows, keeping the latest log per
+                # (day, exercise name) like the session view shows it
+                first_day_start = timezone.make_aware(datetime.combine(sessions[-1]['day'], time.min))
+                day_key = TruncDate('date_performed')
+                latest_per_exercise = (
+                    named_logs.filter(date_performed__gte=max(cutoff_date, first_day_start))
+                    .annotate(
+                        day=day_key,
+                        rank=Window(
+                            expression=RowNumber(),
+                            partition_by=[day_key, Lower('exercise_name')],
+                            order_by=F('date_performed').desc(),
+                        ),
+                    )
+                    .filter(rank=1, day__in=[session['day'] for session in sessions])
+                    .order_by('-day', '-date_performed')
+                    .values('day', 'exercise_name', 'sets_performed', 'reps_performed',
+                            'duration_minutes', 'calories_burned', 'perceived_effort')
+                )
                 
-                for log in logs_for_date:
-                    exercise_name = log.exercise_name
-                    if exercise_name and exercise_name.lower() not in seen_exercises:
-                        seen_exercises.add(exercise_name.lower())
-                        exercises.append({
-                            'exercise_name': exercise_name,
-                            'sets_performed': log.sets_performed,
-                            'reps_performed': log.reps_performed,
-                            'duration_minutes': log.duration_minutes,
-                            'calories_burned': log.calories_burned,
-                            'perceived_effort': log.perceived_effort,
-                        })
+                exercises_by_day = {session['day']: [] for session in sessions}
+                for row in latest_per_exercise:
+                    exercises_by_day[row.pop('day')].append(row)
                 
-                if exercises:
+                for session in sessions:
+                    exercises = exercises_by_day[session['day']]
                     recent_workouts.append({
-                        'date': date_key.isoformat(),
-                        'timestamp': logs_for_date[0].date_performed.isoformat(),
+                        'date': session['day'].isoformat(),
+                        'timestamp': session['latest'].isoformat(),
                         'exercise_count': len(exercises),
                         'exercises': exercises,
                         'total_exercises': len(exercises),
@@ -772,11 +991,6 @@ class WorkoutLogViewSet(viewsets.ModelViewSet):
                 'count': len(recent_workouts),
             }, status=status.HTTP_200_OK)
             
-        except User.DoesNotExist:
-            return Response(
-                {'error': 'User not found'}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
         except Exception as e:
             logger.error(f"Error fetching recent workouts: {e}")
             return Response(
@@ -787,17 +1001,29 @@ class WorkoutLogViewSet(viewsets.ModelViewSet):
 # -------------------------------
 # Meal Plan & Recipe Views
 # -------------------------------
-class MealPlanViewSet(viewsets.ModelViewSet):
+class MealPlanViewSet(ConditionalPlanMixin, viewsets.ModelViewSet):
     queryset = MealPlan.objects.all()
     serializer_class = MealPlanSerializer
     permission_classes = [IsAuthenticatedWithSession]
+    plan_data_field = 'meal_plan_data'
     
+    # List-style actions return summaries and never load the plan JSON
+    SUMMARY_ACTIONS = ['list', 'user_meal_plans']
+
+    def get_serializer_class(self):
+        if self.action in self.SUMMARY_ACTIONS:
+            return MealPlanSummarySerializer
+        return MealPlanSerializer
+
     def get_queryset(self):
         """Filter meal plans to only show user's own data"""
         user_id = self.request.session.get('user_id')
-        if user_id:
-            return MealPlan.objects.filter(user__id=user_id)
-        return MealPlan.objects.none()
+        if not user_id:
+            return MealPlan.objects.none()
+        queryset = MealPlan.objects.filter(user__id=user_id)
+        if self.action in self.SUMMARY_ACTIONS:
+            queryset = queryset.defer('meal_plan_data')
+        return self.defer_for_conditional(queryset)
     
     @action(detail=False, methods=['get'], url_path='user/(?P<user_id>[^/.]+)')
     def user_meal_plans(self, request, user_id=None):
@@ -811,24 +1037,14 @@ class MealPlanViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        try:
-            user = User.objects.get(id=user_id)
-            meal_plans = MealPlan.objects.filter(user=user)
-            serializer = self.get_serializer(meal_plans, many=True)
-            return Response(serializer.data)
-        except User.DoesNotExist:
-            return Response(
-                {"error": "User not found"}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def with_details(self, request, pk=None):
         """Get meal plan with all its days, entries, recipes, and ingredients."""
         try:
-            meal_plan = self.get_object()
-            serializer = MealPlanDetailSerializer(meal_plan)
-            return Response(serializer.data)
+            return self.plan_response(self.get_object(), MealPlanDetailSerializer)
         except MealPlan.DoesNotExist:
             return Response(
                 {"error": "Meal plan not found"}, 
@@ -870,11 +1086,145 @@ def api_info(request):
             "/meal-plans/",
             "/meal-plans/user/{user_id}/",
             "/generate-meal-plan/",
-            "/generate-workout-plan/"
+            "/generate-workout-plan/",
+            "/export/",
+            "/import/"
         ]
     })
 
 
+# -------------------------------
+# Data Export
+# -------------------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticatedWithSession])
+def export_data(request):
+    """
+    Stream the user's full history as a file download.
+
+    Query params:
+    - output: ndjson or csv (default: ndjson; 'format' is taken by DRF)
+    - type: Comma-separated record types (default: all; csv needs exactly one)
+    - gzip: true to gzip the stream
+    """
+    from django.http import StreamingHttpResponse
+    from .services.export import EXPORT_SOURCES, FORMATS, export_filename, export_stream
+
+    export_format = request.query_params.get('output', 'ndjson')
+    if export_format not in FORMATS:
+        return Response(
+            {'error': f"output must be one of: {', '.join(FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    record_types = [t for t in request.query_params.get('type', '').split(',') if t]
+    unknown = [t for t in record_types if t not in EXPORT_SOURCES]
+    if unknown:
+        return Response(
+            {'error': f"Unknown type: {', '.join(unknown)}", 'types': list(EXPORT_SOURCES)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    gzip = request.query_params.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+    try:
+        stream = export_stream(request.user, export_format, record_types, gzip=gzip)
+    except ValueError as e:
+        return Response({'error': str(e), 'types': list(EXPORT_SOURCES)}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(
+        stream,
+        content_type='application/gzip' if gzip else f'{FORMATS[export_format]}; charset=utf-8'
+    )
+    filename = export_filename(request.user, export_format, record_types, gzip=gzip)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    logger.info(f"Streaming {export_format} export for user {request.user.id} ({','.join(record_types) or 'all'})")
+    return response
+
+
+# -------------------------------
+# Data Import
+# -------------------------------
+@api_view(['POST'])
+@permission_classes([IsAuthenticatedWithSession])
+@parser_classes([MultiPartParser])
+def import_data(request):
+    """
+    Import historical workout/nutrition logs from an NDJSON or CSV file
+    (optionally gzipped), sent as a multipart 'file' or as the raw body.
+
+    Query params:
+    - type: workout_logs or nutrition_logs (required for csv; filters ndjson)
+    - input: ndjson or csv (default: from the file name, else ndjson)
+
+    Invalid rows are reported and skipped; the rest are imported.
+    """
+    from .services.log_import import FORMATS, IMPORT_TYPES, import_logs
+
+    if request.content_type.startswith('multipart/'):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        stream, name = upload, upload.name.lower()
+    else:
+        stream, name = request.stream, ''
+        if stream is None:
+            return Response({'error': 'Request body is empty'}, status=status.HTTP_400_BAD_REQUEST)
+
+    default_format = 'csv' if name.endswith(('.csv', '.csv.gz')) or request.content_type == 'text/csv' else 'ndjson'
+    import_format = request.query_params.get('input', default_format)
+    if import_format not in FORMATS:
+        return Response(
+            {'error': f"input must be one of: {', '.join(FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    record_type = request.query_params.get('type') or None
+    if record_type is not None and record_type not in IMPORT_TYPES:
+        return Response(
+            {'error': f"Unknown type: {record_type}", 'types': list(IMPORT_TYPES)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        summary = import_logs(request.user, stream, import_format, record_type)
+    except ValueError as e:
+        return Response({'error': str(e), 'types': list(IMPORT_TYPES)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(summary, status=status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK)
+
+
+# -------------------------------
+# Operational Metrics Views
+# -------------------------------
+@api_view(['GET'])
+@permission_classes([HasMetricsToken])
+def ai_metrics(request):
+    """
+    Aggregated Gemini call telemetry (latency, TTFB, tokens, cost, parse outcomes).
+
+    Query params:
+    - recent: Number of raw call records to include (default: 0)
+    """
+    from api.services.ai_telemetry import ai_telemetry
+
+    data = ai_telemetry.summary()
+    try:
+        recent = int(request.query_params.get('recent', 0))
+    except ValueError:
+        recent = 0
+    if recent > 0:
+        data['recent_calls'] = [
+            {**call, 'estimated_cost_usd': str(call['estimated_cost_usd']) if call['estimated_cost_usd'] is not None else None}
+            for call in ai_telemetry.recent(recent)
+        ]
+    return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([HasMetricsToken])
+def admission_metrics(request):
+    """Current AI generation load (active, queued, rejections) for autoscaling."""
+    return Response(ai_admission.stats())
+
+
 # ===========================
 # AI-Powered Workout Plan Generation
 # ===========================
@@ -885,6 +1235,8 @@ def generate_enriched_workout_plan(request):
     """
     Generate an AI-powered workout plan enriched with ExerciseDB data.
     Requires authentication. Users can only generate plans for themselves.
+    Common parameter combinations are served from the plan template library;
+    everything else is generated live.
     
     Expected request body:
     {
@@ -892,9 +1244,71 @@ def generate_enriched_workout_plan(request):
         "user_goal": "build muscle",
         "experience_level": "beginner",
         "days_per_week": 4,
-        "save_plan": true  // optional, defaults to false
+        "save_plan": true,  // optional, defaults to false
+        "use_template": true  // optional, set false to force live generation
     }
     """
+    template_response = _serve_workout_plan_template(request)
+    if template_response is not None:
+        return template_response
+    return _generate_live_workout_plan(request)
+
+
+def _serve_workout_plan_template(request):
+    """
+    Fast path: return a pre-generated workout plan when one matches the request.
+    Returns None when the request should go to live generation.
+    """
+    from django.conf import settings
+    from api.services.plan_templates import find_workout_template
+
+    data = request.data
+    if not getattr(settings, 'PLAN_TEMPLATE_FAST_PATH', True) or not data.get('use_template', True):
+        return None
+    user_id = data.get('user_id')
+    if not user_id or user_id != request.session.get('user_id'):
+        return None  # Live path reports the validation error
+
+    user_goal = data.get('user_goal')
+    experience_level = data.get('experience_level')
+    days_per_week = data.get('days_per_week')
+    template = find_workout_template(user_goal, experience_level, days_per_week)
+    if template is None:
+        return None
+
+    plan_data = template.plan_data
+    saved_plan_id = None
+    if data.get('save_plan', False):
+        try:
+            saved_plan_id = save_workout_plan_to_database(request.user, plan_data)
+        except Exception as e:
+            logger.error(f"Failed to save workout plan: {e}")
+
+    response_data = {
+        'success': True,
+        'data': plan_data,
+        'enrichment_stats': template.enrichment_stats,
+        'message': 'Workout plan served from template library',
+        'user_id': user_id,
+        'generation_params': {
+            'user_goal': user_goal,
+            'experience_level': experience_level,
+            'days_per_week': days_per_week
+        },
+        'from_template': True,
+        'template_id': str(template.id),
+    }
+    if saved_plan_id:
+        response_data['saved_plan_id'] = saved_plan_id
+        response_data['message'] += ' and saved to database'
+
+    logger.info(f"Served workout template {template.template_key} to user {user_id}")
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+@admission_controlled(ai_admission)
+def _generate_live_workout_plan(request):
+    """Generate a workout plan with Gemini and enrich it with ExerciseDB data."""
     try:
         # Validate request data
         user_id = request.data.get('user_id')
@@ -918,13 +1332,7 @@ def generate_enriched_workout_plan(request):
                 'error': 'Missing required fields: user_id, user_goal, experience_level, days_per_week'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Validate user exists
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return Response({
-                'error': 'User not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+        user = request.user
         
         # Prepare user profile for AI
         user_profile = {
@@ -934,8 +1342,8 @@ def generate_enriched_workout_plan(request):
         }
         
         # Initialize AI service
-        from api.services.ai_service import GeminiAIService
-        ai_service = GeminiAIService()
+        from api.services import get_ai_service
+        ai_service = get_ai_service()
         
         # Generate AI workout plan
         ai_result = ai_service.generate_exercise_plan(
@@ -952,8 +1360,8 @@ def generate_enriched_workout_plan(request):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
         # Initialize Exercise service for enrichment
-        from api.services.exercise_service import ExerciseDBService
-        exercise_service = ExerciseDBService()
+        from api.services import get_exercise_service
+        exercise_service = get_exercise_service()
         
         # Enrich the AI plan with ExerciseDB data
         enriched_result = exercise_service.enrich_workout_plan(ai_result)
@@ -1039,13 +1447,13 @@ def test_ai_services(request):
     """
     try:
         # Test AI service
-        from api.services.ai_service import GeminiAIService
-        ai_service = GeminiAIService()
+        from api.services import get_ai_service
+        ai_service = get_ai_service()
         ai_test_success, ai_test_message = ai_service.test_connection()
         
         # Test Exercise service
-        from api.services.exercise_service import ExerciseDBService
-        exercise_service = ExerciseDBService()
+        from api.services import get_exercise_service
+        exercise_service = get_exercise_service()
         exercise_test_success, exercise_test_message = exercise_service.test_connection()
         
         return Response({
@@ -1073,7 +1481,76 @@ def generate_enriched_meal_plan(request):
     """
     Generate AI-powered meal plan with nutritional data and save to database.
     Requires authentication. Users can only generate plans for themselves.
+    Requests close to a template in the plan library are served from it,
+    scaled to the requested calorie target; pass "use_template": false to
+    force live generation.
+    """
+    template_response = _serve_meal_plan_template(request)
+    if template_response is not None:
+        return template_response
+    return _generate_live_meal_plan(request)
+
+
+def _serve_meal_plan_template(request):
+    """
+    Fast path: save and return a pre-generated meal plan when one matches.
+    Returns None when the request should go to live generation.
     """
+    from django.conf import settings
+    from api.services.plan_templates import find_meal_template
+
+    data = request.data
+    if not getattr(settings, 'PLAN_TEMPLATE_FAST_PATH', True) or not data.get('use_template', True):
+        return None
+    user_id = data.get('user_id')
+    if not user_id or user_id != request.session.get('user_id'):
+        return None  # Live path reports the validation error
+
+    daily_calorie_target = data.get('daily_calorie_target', 2000)
+    dietary_preferences = data.get('dietary_preferences', [])
+    goal = data.get('goal', 'maintain weight')
+    template, meal_plan_data = find_meal_template(goal, daily_calorie_target, dietary_preferences)
+    if template is None:
+        return None
+
+    try:
+        saved_plan_id = _save_meal_plan_to_database(
+            request.user,
+            meal_plan_data,
+            daily_calorie_target,
+            dietary_preferences,
+            goal
+        )
+    except Exception as db_error:
+        logger.error(f"Database save failed: {db_error}")
+        return Response({
+            'success': False,
+            'error': 'Meal plan template found but failed to save to database',
+            'details': str(db_error)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    days = meal_plan_data.get('days', [])
+    logger.info(f"Served meal template {template.template_key} to user {user_id}")
+    return Response({
+        'success': True,
+        'message': 'Meal plan served from template library and saved successfully',
+        'saved_plan_id': str(saved_plan_id),
+        'plan_name': meal_plan_data.get('plan_name', 'Generated Meal Plan'),
+        'total_days': len(days),
+        'daily_calorie_target': daily_calorie_target,
+        'ai_generation': {
+            'success': True,
+            'days_generated': len(days),
+            'meals_per_day': len(days[0].get('meals', {})) if days else 0
+        },
+        'from_template': True,
+        'template_id': str(template.id),
+    }, status=status.HTTP_201_CREATED)
+
+
+@admission_controlled(ai_admission)
+def _generate_live_meal_plan(request):
+    """Generate a meal plan with Gemini and save it to the database."""
     try:
         # Extract request data
         data = request.data
@@ -1102,18 +1579,11 @@ def generate_enriched_meal_plan(request):
                 'error': 'You can only generate meal plans for yourself'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        # Validate user exists
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return Response({
-                'success': False,
-                'error': 'User not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+        user = request.user
         
         # Initialize AI service
-        from api.services.ai_service import GeminiAIService
-        ai_service = GeminiAIService()
+        from api.services import get_ai_service
+        ai_service = get_ai_service()
         
         # Prepare user profile
         user_profile = {
@@ -38,7 +38,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.JSONCompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.SlidingSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -88,8 +90,35 @@ else:
         }
     }
 
-# Close connections quickly (avoid Supabase connection limits)
-CONN_MAX_AGE = 0
+# ------------------------
+# Database connection pooling
+# ------------------------
+# DB_POOL_MODE:
+#   none       - open a connection per request (CONN_MAX_AGE = 0)
+#   persistent - reuse each worker thread's connection for DB_CONN_MAX_AGE
+#                seconds, checking it is still alive before reuse
+#   pgbouncer  - persistent connections to a transaction-mode pooler such as
+#                Supabase's (port 6543); server-side cursors are disabled
+#                because they don't survive transaction pooling
+# The dev server starts a thread per request, which defeats persistent
+# connections and leaks them, so pooling is off by default under DEBUG.
+DB_POOL_MODE = config('DB_POOL_MODE', default='none' if DEBUG else 'persistent')
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=60, cast=int)
+
+# Connection budget: with persistent connections every worker thread holds
+# one open connection, so workers x threads must stay under the database's
+# cap (checked at startup by api.checks)
+DB_CONNECTION_LIMIT = config('DB_CONNECTION_LIMIT', default=60, cast=int)
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+WEB_THREADS = config('WEB_THREADS', default=1, cast=int)
+
+if DB_POOL_MODE in ('persistent', 'pgbouncer'):
+    DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+if DB_POOL_MODE == 'pgbouncer':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
 
 # ------------------------
 # Password validation
@@ -101,6 +130,25 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# ------------------------
+# Password hashing
+# ------------------------
+# New passwords use Argon2id; PBKDF2 hashes (and legacy salt$hash SHA-256
+# hashes, see api.passwords) are upgraded on the user's next login, as are
+# Argon2 hashes made with different cost parameters.
+PASSWORD_HASHERS = [
+    'api.passwords.EasyFitnessArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19456, cast=int)  # KiB
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+# Login verification pool: concurrent hashes per process (0 = verify inline)
+PASSWORD_VERIFY_WORKERS = config('PASSWORD_VERIFY_WORKERS', default=2, cast=int)
+PASSWORD_VERIFY_TIMEOUT = config('PASSWORD_VERIFY_TIMEOUT', default=10, cast=float)
+
 # ------------------------
 # Internationalization
 # ------------------------
@@ -127,18 +175,74 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'api.authentication.SessionAuthentication',  # Our custom session auth
     ],
-    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    # orjson-backed JSON rendering and parsing
+    'DEFAULT_RENDERER_CLASSES': ['api.renderers.ORJSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
 }
+# Largest array accepted by the workout/nutrition log bulk endpoints
+BULK_LOG_MAX_ENTRIES = config('BULK_LOG_MAX_ENTRIES', default=500, cast=int)
+# JSON responses at least this many bytes are gzip/brotli compressed
+RESPONSE_COMPRESSION_MIN_BYTES = config('RESPONSE_COMPRESSION_MIN_BYTES', default=1024, cast=int)
+
+# ------------------------
+# Cache
+# ------------------------
+# Set REDIS_URL (requires the redis package) to share the cache between
+# worker processes; otherwise each process gets its own in-memory cache.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a user's dashboard payload is cached (0 disables); entries are
+# dropped whenever the user's plans, goals, logs or metrics change
+DASHBOARD_CACHE_TTL = config('DASHBOARD_CACHE_TTL', default=300, cast=int)
+# Seconds per-user training volume analytics are cached (0 disables); a
+# user's entries are dropped whenever their workout logs change
+TRAINING_ANALYTICS_CACHE_TTL = config('TRAINING_ANALYTICS_CACHE_TTL', default=900, cast=int)
+# Seconds goal progress is cached (0 disables); recomputed whenever the goal
+# or the user's metrics change
+GOAL_PROGRESS_CACHE_TTL = config('GOAL_PROGRESS_CACHE_TTL', default=3600, cast=int)
+
+# ------------------------
+# Authentication
+# ------------------------
+# Seconds a session's User row is cached across requests (0 disables)
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=60, cast=int)
 
 # ------------------------
 # Session Configuration
 # ------------------------
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# cached_db reads sessions from the cache and only falls back to the
+# database on a miss; it needs a shared cache, so plain db is the default
+# without Redis. 'django.contrib.sessions.backends.cache' skips the
+# database entirely (sessions are lost if the cache is flushed).
+SESSION_ENGINE = config(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.cached_db' if REDIS_URL else 'django.contrib.sessions.backends.db'
+)
 SESSION_COOKIE_NAME = 'easyfitness_session'
 SESSION_COOKIE_AGE = 86400  # 1 day in seconds
-SESSION_SAVE_EVERY_REQUEST = True
+# Sliding expiry (api.middleware.SlidingSessionMiddleware): sessions are
+# re-saved only once less than this many seconds of their lifetime remain
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_THRESHOLD = config('SESSION_REFRESH_THRESHOLD', default=SESSION_COOKIE_AGE // 2, cast=int)
 SESSION_COOKIE_HTTPONLY = True  # Prevent JavaScript access
 SESSION_COOKIE_SECURE = not DEBUG  # HTTPS only in production
 SESSION_COOKIE_SAMESITE = 'Lax'  # CSRF protection
@@ -178,3 +282,35 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_CREDENTIALS = True  # Essential for cookies
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = False  # More secure even in debug
+
+# ------------------------
+# Operational metrics
+# ------------------------
+# Shared secret for /api/metrics/ endpoints (sent as X-Metrics-Token).
+# When empty, metrics are only served while DEBUG is on.
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# ------------------------
+# AI telemetry
+# ------------------------
+AI_TELEMETRY_BUFFER_SIZE = config('AI_TELEMETRY_BUFFER_SIZE', default=500, cast=int)
+AI_TELEMETRY_PERSIST = config('AI_TELEMETRY_PERSIST', default=False, cast=bool)  # Also write ai_call_logs rows
+# USD per 1M tokens, used for cost estimates
+AI_TOKEN_PRICES_PER_MILLION = {
+    'gemini-2.5-flash': {'input': 0.30, 'output': 2.50},
+}
+
+# ------------------------
+# AI admission control (limits are per worker process)
+# ------------------------
+AI_MAX_CONCURRENT_GENERATIONS = config('AI_MAX_CONCURRENT_GENERATIONS', default=4, cast=int)
+AI_MAX_CONCURRENT_GENERATIONS_PER_USER = config('AI_MAX_CONCURRENT_GENERATIONS_PER_USER', default=1, cast=int)
+AI_ADMISSION_QUEUE_SIZE = config('AI_ADMISSION_QUEUE_SIZE', default=8, cast=int)
+AI_ADMISSION_QUEUE_TIMEOUT = config('AI_ADMISSION_QUEUE_TIMEOUT', default=10, cast=float)  # seconds
+AI_ADMISSION_RETRY_AFTER = config('AI_ADMISSION_RETRY_AFTER', default=30, cast=int)  # seconds
+
+# ------------------------
+# Plan template library
+# ------------------------
+PLAN_TEMPLATE_FAST_PATH = config('PLAN_TEMPLATE_FAST_PATH', default=True, cast=bool)  # Serve matching templates without calling Gemini
+PLAN_TEMPLATE_CALORIE_TOLERANCE = config('PLAN_TEMPLATE_CALORIE_TOLERANCE', default=150, cast=int)  # kcal from a template's target
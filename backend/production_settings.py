@@ -30,7 +30,7 @@ SESSION_COOKIE_HTTPONLY = True  # Already set
 SESSION_COOKIE_SECURE = True  # Requires HTTPS
 SESSION_COOKIE_SAMESITE = 'Lax'  # Already set
 SESSION_COOKIE_AGE = 86400  # 24 hours - Already set
-SESSION_SAVE_EVERY_REQUEST = True  # Already set
+SESSION_SAVE_EVERY_REQUEST = False  # Sliding expiry via api.middleware.SlidingSessionMiddleware
 
 # CSRF Security
 CSRF_COOKIE_HTTPONLY = True
@@ -0,0 +1,114 @@
+"""
+Test cases for AI endpoint admission control
+Covers per-user and global caps, the bounded wait queue and 429 responses
+"""
+
+import os
+import sys
+import django
+import json
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from rest_framework import status
+
+from api.models import User
+from api.services.admission import AdmissionController, AdmissionRejected, ai_admission
+
+
+def make_controller(**overrides):
+    options = {'global_limit': 1, 'per_user_limit': 1, 'max_queue': 1, 'queue_timeout': 0.05, 'retry_after': 7}
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+class AdmissionControllerTestCase(SimpleTestCase):
+    """Test cases for the AdmissionController itself"""
+
+    def test_per_user_limit_rejects_immediately(self):
+        controller = make_controller(global_limit=5)
+        with controller.admit('user-a'):
+            with self.assertRaises(AdmissionRejected) as ctx:
+                with controller.admit('user-a'):
+                    pass
+        self.assertEqual(ctx.exception.retry_after, 7)
+        # Other users are unaffected
+        with controller.admit('user-b'):
+            self.assertEqual(controller.stats()['active'], 1)
+
+    def test_full_queue_rejects(self):
+        controller = make_controller(max_queue=0)
+        with controller.admit('user-a'):
+            with self.assertRaisesMessage(AdmissionRejected, 'queue is full'):
+                with controller.admit('user-b'):
+                    pass
+        self.assertEqual(controller.stats()['rejected_total'], 1)
+
+    def test_queued_request_times_out(self):
+        controller = make_controller()
+        with controller.admit('user-a'):
+            with self.assertRaisesMessage(AdmissionRejected, 'Timed out'):
+                with controller.admit('user-b'):
+                    pass
+        stats = controller.stats()
+        self.assertEqual(stats['timed_out_total'], 1)
+        self.assertEqual(stats['queued'], 0)
+        self.assertEqual(stats['active_users'], 0)
+
+    def test_queued_request_runs_when_slot_frees(self):
+        controller = make_controller(queue_timeout=5)
+        holding = threading.Event()
+        release = threading.Event()
+
+        def hold_slot():
+            with controller.admit('user-a'):
+                holding.set()
+                release.wait(5)
+
+        worker = threading.Thread(target=hold_slot)
+        worker.start()
+        holding.wait(5)
+        timer = threading.Timer(0.05, release.set)
+        timer.start()
+
+        with controller.admit('user-b'):
+            self.assertEqual(controller.stats()['active'], 1)
+        worker.join()
+        self.assertEqual(controller.stats()['active'], 0)
+
+
+class AdmissionControlledViewTestCase(TestCase):
+    """Test cases for the 429 behaviour of the generate endpoints"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+
+    def test_generate_meal_plan_returns_429_with_retry_after(self):
+        # Hold this user's only slot so the request is over the per-user cap
+        with ai_admission.admit(str(self.user.id)):
+            response = self.client.post(
+                '/api/generate-meal-plan/',
+                data=json.dumps({'user_id': str(self.user.id)}),
+                content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], str(ai_admission.retry_after))
+        self.assertFalse(json.loads(response.content)['success'])
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_admission_metrics_exposes_queue_depth(self):
+        response = self.client.get('/api/metrics/admission/', HTTP_X_METRICS_TOKEN='secret')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertIn('queued', data)
+        self.assertIn('active', data)
@@ -13,6 +13,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
 django.setup()
 
 from api.services import GeminiAIService
+from api.services.ai_schemas import WORKOUT_PLAN_SCHEMA, MEAL_PLAN_SCHEMA
 
 
 class TestGeminiAIService(TestCase):
@@ -135,6 +136,57 @@ class TestGeminiAIService(TestCase):
         self.assertIn("API Error", error_msg)
         print("✅ Connection failure handling test passed")
 
+    @patch('api.services.ai_service.config')
+    @patch('api.services.ai_service.genai.configure')
+    @patch('api.services.ai_service.genai.GenerativeModel')
+    def test_generation_sends_response_schema(self, mock_generative_model, mock_configure, mock_config):
+        """Test that both generation methods send a structured-output schema."""
+        mock_config.return_value = "fake-api-key-for-testing"
+        mock_response = MagicMock()
+        mock_response.text = json.dumps({"plan_name": "P", "plan_description": "D", "days": []})
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content.return_value = mock_response
+        mock_generative_model.return_value = mock_model_instance
+
+        ai_service = GeminiAIService()
+        ai_service.generate_exercise_plan("build muscle", "beginner", 3, {})
+        ai_service.generate_meal_plan("lose weight", 1800, [], {})
+
+        schemas = [call.kwargs['generation_config'].response_schema
+                   for call in mock_model_instance.generate_content.call_args_list]
+        self.assertEqual(schemas, [WORKOUT_PLAN_SCHEMA, MEAL_PLAN_SCHEMA])
+        print("✅ Response schema configuration test passed")
+
+    @patch('api.services.ai_service.config')
+    @patch('api.services.ai_service.genai.configure')
+    @patch('api.services.ai_service.genai.GenerativeModel')
+    def test_response_failing_schema_is_rejected(self, mock_generative_model, mock_configure, mock_config):
+        """Test that JSON which does not match the schema is reported as a failure."""
+        mock_config.return_value = "fake-api-key-for-testing"
+        ai_service = GeminiAIService()
+
+        response_text = json.dumps({"plan_name": "P", "plan_description": "D",
+                                    "days": [{"day_number": "one", "day_name": "A", "exercises": []}]})
+        result = ai_service._parse_json_response(response_text, "exercise_plan", WORKOUT_PLAN_SCHEMA)
+
+        self.assertFalse(result['success'])
+        self.assertIn("$.days[0].day_number", result['error'])
+        print("✅ Schema rejection test passed")
+
+    @patch('api.services.ai_service.config')
+    @patch('api.services.ai_service.genai.configure')
+    @patch('api.services.ai_service.genai.GenerativeModel')
+    def test_truncated_response_uses_repair_path(self, mock_generative_model, mock_configure, mock_config):
+        """Test that truncated JSON still goes through the brace-repair fallback."""
+        mock_config.return_value = "fake-api-key-for-testing"
+        ai_service = GeminiAIService()
+
+        result = ai_service._parse_json_response('{"plan_name": "P", "plan_description": "D", "days": []', "exercise_plan", WORKOUT_PLAN_SCHEMA)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['data']['plan_name'], "P")
+        print("✅ Truncated response repair test passed")
+
 
 def run_manual_test():
     """
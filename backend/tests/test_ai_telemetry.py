@@ -0,0 +1,193 @@
+"""
+Test cases for Gemini call telemetry
+Covers the ring buffer aggregates, service instrumentation and the metrics endpoint
+"""
+
+import os
+import sys
+import django
+import json
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.test import TestCase, Client, override_settings
+from rest_framework import status
+
+from google.generativeai.types import BlockedPromptException, StopCandidateException
+
+from api.models import AICallLog
+from api.services.ai_service import GeminiAIService
+from api.services.ai_telemetry import AITelemetry, ai_telemetry, estimate_cost
+
+
+def make_call(**overrides):
+    call = {
+        'model': 'gemini-2.5-flash',
+        'method': 'generate_meal_plan',
+        'prompt_tokens': 1000,
+        'output_tokens': 4000,
+        'ttfb_ms': 500.0,
+        'latency_ms': 2000.0,
+        'finish_reason': 'STOP',
+        'parse_outcome': 'full',
+    }
+    call.update(overrides)
+    return call
+
+
+class AITelemetryBufferTestCase(TestCase):
+    """Test cases for the in-process ring buffer"""
+
+    def test_buffer_keeps_only_newest_records(self):
+        telemetry = AITelemetry(maxlen=3)
+        for latency in range(5):
+            telemetry.record(make_call(latency_ms=float(latency)))
+
+        self.assertEqual([c['latency_ms'] for c in telemetry.recent()], [4.0, 3.0, 2.0])
+
+    def test_summary_percentiles_and_outcomes(self):
+        telemetry = AITelemetry(maxlen=200)
+        for latency in range(1, 101):
+            telemetry.record(make_call(latency_ms=float(latency)))
+        telemetry.record(make_call(method='generate_exercise_plan', parse_outcome='partial', finish_reason='MAX_TOKENS'))
+
+        summary = {s['method']: s for s in telemetry.summary()['by_method']}
+        meal = summary['generate_meal_plan']
+        self.assertEqual(meal['calls'], 100)
+        self.assertEqual(meal['latency_ms']['p50'], 50.0)
+        self.assertEqual(meal['latency_ms']['p95'], 95.0)
+        self.assertEqual(meal['latency_ms']['p99'], 99.0)
+        self.assertEqual(meal['parse_outcomes']['full'], 100)
+        self.assertEqual(summary['generate_exercise_plan']['parse_outcomes']['partial'], 1)
+        self.assertEqual(summary['generate_exercise_plan']['finish_reasons'], {'MAX_TOKENS': 1})
+
+    def test_cost_estimate_uses_configured_prices(self):
+        # 1000 * 0.30 / 1M + 4000 * 2.50 / 1M
+        self.assertEqual(estimate_cost('gemini-2.5-flash', 1000, 4000), Decimal('0.010300'))
+        self.assertIsNone(estimate_cost('unknown-model', 1000, 4000))
+        self.assertIsNone(estimate_cost('gemini-2.5-flash', None, 4000))
+
+    @override_settings(AI_TELEMETRY_PERSIST=True)
+    def test_records_are_persisted_when_enabled(self):
+        AITelemetry(maxlen=10).record(make_call())
+
+        log = AICallLog.objects.get()
+        self.assertEqual(log.method, 'generate_meal_plan')
+        self.assertEqual(log.estimated_cost_usd, Decimal('0.010300'))
+
+    def test_records_are_not_persisted_by_default(self):
+        AITelemetry(maxlen=10).record(make_call())
+        self.assertFalse(AICallLog.objects.exists())
+
+
+class GeminiAIServiceTelemetryTestCase(TestCase):
+    """Test cases for the instrumentation inside GeminiAIService"""
+
+    def setUp(self):
+        ai_telemetry.clear()
+
+    @patch('api.services.ai_service.config')
+    @patch('api.services.ai_service.genai.configure')
+    @patch('api.services.ai_service.genai.GenerativeModel')
+    def test_generation_records_tokens_and_outcome(self, mock_generative_model, mock_configure, mock_config):
+        mock_config.return_value = "fake-api-key-for-testing"
+        mock_response = MagicMock()
+        mock_response.__iter__.return_value = iter([MagicMock(), MagicMock()])
+        mock_response.text = json.dumps({"plan_name": "P", "plan_description": "D", "days": []})
+        mock_response.usage_metadata.prompt_token_count = 120
+        mock_response.usage_metadata.candidates_token_count = 900
+        mock_response.candidates[0].finish_reason.name = "STOP"
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content.return_value = mock_response
+        mock_generative_model.return_value = mock_model_instance
+
+        GeminiAIService().generate_exercise_plan("build muscle", "beginner", 3, {})
+
+        call = ai_telemetry.recent()[0]
+        self.assertEqual(call['method'], 'generate_exercise_plan')
+        self.assertEqual(call['model'], 'gemini-2.5-flash')
+        self.assertEqual(call['prompt_tokens'], 120)
+        self.assertEqual(call['output_tokens'], 900)
+        self.assertEqual(call['finish_reason'], 'STOP')
+        self.assertEqual(call['parse_outcome'], 'full')
+        self.assertIsNotNone(call['ttfb_ms'])
+        self.assertLessEqual(call['ttfb_ms'], call['latency_ms'])
+        self.assertTrue(mock_model_instance.generate_content.call_args.kwargs['stream'])
+
+    @patch('api.services.ai_service.config')
+    @patch('api.services.ai_service.genai.configure')
+    @patch('api.services.ai_service.genai.GenerativeModel')
+    def test_failed_call_is_recorded_as_error(self, mock_generative_model, mock_configure, mock_config):
+        mock_config.return_value = "fake-api-key-for-testing"
+        mock_model_instance = MagicMock()
+        mock_model_instance.generate_content.side_effect = Exception("API Error")
+        mock_generative_model.return_value = mock_model_instance
+
+        with self.assertRaises(Exception):
+            GeminiAIService().generate_meal_plan("lose weight", 1800, [], {})
+
+        call = ai_telemetry.recent()[0]
+        self.assertEqual(call['parse_outcome'], 'error')
+        self.assertIsNone(call['prompt_tokens'])
+
+    @patch('api.services.ai_service.config')
+    @patch('api.services.ai_service.genai.configure')
+    @patch('api.services.ai_service.genai.GenerativeModel')
+    def test_blocked_stream_returns_failure_and_is_recorded(self, mock_generative_model, mock_configure, mock_config):
+        mock_config.return_value = "fake-api-key-for-testing"
+        prompt_feedback = MagicMock()
+        prompt_feedback.block_reason.name = "SAFETY"
+        candidate = MagicMock()
+        candidate.finish_reason.name = "RECITATION"
+
+        def blocked_stream(exc):
+            yield MagicMock()
+            raise exc
+
+        mock_model_instance = MagicMock()
+        mock_generative_model.return_value = mock_model_instance
+        cases = [
+            (BlockedPromptException(prompt_feedback), 'generate_meal_plan', ("lose weight", 1800, [], {}), 'SAFETY'),
+            (StopCandidateException(candidate), 'generate_exercise_plan', ("build muscle", "beginner", 3, {}), 'RECITATION'),
+        ]
+        for exc, method, args, reason in cases:
+            mock_response = MagicMock()
+            mock_response.__iter__.return_value = blocked_stream(exc)
+            mock_model_instance.generate_content.return_value = mock_response
+
+            result = getattr(GeminiAIService(), method)(*args)
+
+            self.assertEqual(result, {"success": False, "error": "Response was blocked by safety filters"})
+            call = ai_telemetry.recent()[0]
+            self.assertEqual(call['method'], method)
+            self.assertEqual(call['parse_outcome'], 'failed')
+            self.assertEqual(call['finish_reason'], reason)
+            self.assertIsNotNone(call['latency_ms'])
+
+
+class AIMetricsEndpointTestCase(TestCase):
+    """Test cases for the /api/metrics/ai/ endpoint"""
+
+    def setUp(self):
+        self.client = Client()
+        ai_telemetry.clear()
+        ai_telemetry.record(make_call())
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_requires_metrics_token(self):
+        response = self.client.get('/api/metrics/ai/')
+        self.assertIn(response.status_code, [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN])
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_returns_summary_with_token(self):
+        response = self.client.get('/api/metrics/ai/?recent=5', HTTP_X_METRICS_TOKEN='secret')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data['by_method'][0]['calls'], 1)
+        self.assertEqual(len(data['recent_calls']), 1)
+        self.assertEqual(data['recent_calls'][0]['estimated_cost_usd'], '0.010300')
@@ -0,0 +1,80 @@
+"""
+Test cases for the authenticated user cache
+Covers cross-request caching, invalidation on user changes and deleted users
+"""
+
+import os
+import sys
+import django
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.authentication import get_cached_user, user_cache_key
+from api.models import User, Goal
+
+
+def user_queries(context):
+    return [q['sql'] for q in context.captured_queries if 'FROM "users"' in q['sql']]
+
+
+class AuthUserCacheTestCase(TestCase):
+    """Test cases for SessionAuthentication user caching"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+
+    def test_repeat_requests_skip_user_query(self):
+        self.client.get('/api/goals/')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/goals/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries(context), [])
+
+    def test_create_uses_request_user_without_refetch(self):
+        self.client.get('/api/users/session/')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                '/api/goals/',
+                data=json.dumps({'goal_type': 'weight_loss', 'description': 'Lose 5kg'}),
+                content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        self.assertTrue(Goal.objects.filter(user=self.user).exists())
+        self.assertEqual(user_queries(context), [])
+
+    def test_user_save_invalidates_cache(self):
+        get_cached_user(self.user.id)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.id)))
+
+        self.user.email = 'changed@example.com'
+        self.user.save()
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.id)))
+        self.assertEqual(get_cached_user(self.user.id).email, 'changed@example.com')
+
+    def test_deleted_user_session_is_rejected(self):
+        self.client.get('/api/users/session/')
+        self.user.delete()
+
+        response = self.client.get('/api/users/session/')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIsNone(cache.get(user_cache_key(self.user.id)))
@@ -0,0 +1,120 @@
+"""
+Test cases for the batch exercise completion endpoint
+"""
+
+import os
+import sys
+import django
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import User, WorkoutPlan, WorkoutLog, ExerciseCompletion
+
+PLAN_DATA = {
+    'data': {
+        'days': [
+            {'day_number': 1, 'exercises': [
+                {'exercise_name': 'Squat', 'sets': 4, 'reps': '8-12'},
+                {'exercise_name': 'Lunge', 'sets': 3, 'reps': '10'},
+                {'exercise_name': 'Plank', 'sets': 3, 'reps': '30 seconds'},
+            ]},
+            {'day_number': 2, 'exercises': [{'exercise_name': 'Push Up', 'sets': 3, 'reps': '15'}]},
+        ]
+    }
+}
+
+
+class BatchExerciseCompletionTestCase(TestCase):
+    """Test cases for POST /api/workout-plans/<id>/mark_exercises_complete/"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        self.plan = WorkoutPlan.objects.create(user=self.user, name='Full Body', workout_plan_data=PLAN_DATA)
+        self.url = f'/api/workout-plans/{self.plan.id}/mark_exercises_complete/'
+
+    def post(self, payload):
+        return self.client.post(self.url, data=json.dumps(payload), content_type='application/json')
+
+    def day_one(self, completed=True):
+        return [{'day_number': 1, 'exercise_index': index, 'completed': completed} for index in range(3)]
+
+    def test_marks_whole_day_with_one_completion_write(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.post({'completions': self.day_one()})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(len(data['completions']), 3)
+        self.assertEqual(data['completed_exercise_count'], 3)
+        self.assertEqual(data['completion_percent'], 75.0)
+        self.assertEqual(data['workout_logs_created'], 0)
+        self.assertNotIn('workout_plan', data)
+        writes = [q for q in context.captured_queries if q['sql'].startswith('INSERT INTO "exercise_completions"')]
+        self.assertEqual(len(writes), 1)
+        self.assertFalse([q for q in context.captured_queries if 'workout_plan_data' in q['sql']])
+
+    def test_batch_updates_existing_rows(self):
+        self.post({'completions': self.day_one()})
+        data = json.loads(self.post({'completions': [{'day_number': 1, 'exercise_index': 1, 'completed': False}]}).content)
+
+        self.assertEqual(data['completed_exercise_count'], 2)
+        self.assertEqual(ExerciseCompletion.objects.filter(workout_plan=self.plan).count(), 3)
+        self.assertFalse(ExerciseCompletion.objects.get(workout_plan=self.plan, exercise_index=1).completed)
+
+    def test_last_entry_wins_for_repeated_exercise(self):
+        data = json.loads(self.post({'completions': [
+            {'day_number': 2, 'exercise_index': 0, 'completed': True},
+            {'day_number': 2, 'exercise_index': 0, 'completed': False},
+        ]}).content)
+        self.assertEqual(data['completed_exercise_count'], 0)
+        self.assertEqual(len(data['completions']), 1)
+
+    def test_log_workouts_creates_logs_from_plan(self):
+        completions = self.day_one()
+        completions[1]['completed'] = False
+        completions[2]['perceived_effort'] = 7
+
+        data = json.loads(self.post({'completions': completions, 'log_workouts': True}).content)
+
+        self.assertEqual(data['workout_logs_created'], 2)
+        logs = {log.exercise_name: log for log in WorkoutLog.objects.filter(user=self.user)}
+        self.assertEqual(set(logs), {'Squat', 'Plank'})
+        self.assertEqual((logs['Squat'].sets_performed, logs['Squat'].reps_performed), (4, 8))
+        self.assertEqual(logs['Plank'].reps_performed, 30)
+        self.assertEqual(logs['Plank'].perceived_effort, 7)
+
+    def test_invalid_payloads(self):
+        for payload in [{}, {'completions': []}, {'completions': [{'day_number': 1}]},
+                        {'completions': [{'day_number': 1, 'exercise_index': 0, 'perceived_effort': 11}]}]:
+            self.assertEqual(self.post(payload).status_code, status.HTTP_400_BAD_REQUEST, payload)
+        self.assertFalse(ExerciseCompletion.objects.exists())
+
+    def test_out_of_range_item_rejects_the_whole_batch(self):
+        response = self.post({'completions': self.day_one() + [{'day_number': 2, 'exercise_index': 1}]})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('day 2 exercise 1', response.json()['details'])
+        self.assertFalse(ExerciseCompletion.objects.exists())
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.completed_exercise_count, 0)
+
+    def test_other_users_plan_is_not_found(self):
+        other = User.objects.create(username='other', email='other@example.com', password_hash='x')
+        plan = WorkoutPlan.objects.create(user=other, name='Theirs', workout_plan_data=PLAN_DATA)
+        response = self.client.post(
+            f'/api/workout-plans/{plan.id}/mark_exercises_complete/',
+            data=json.dumps({'completions': self.day_one()}), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,156 @@
+"""
+Test cases for the workout and nutrition log bulk upload endpoints
+"""
+
+import os
+import sys
+import django
+import json
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.test import TestCase, Client, override_settings
+from rest_framework import status
+
+from api.models import User, NutritionLog, WorkoutLog
+from api.services.dashboard import dashboard_cache_key
+
+
+class BulkLogUploadTestCase(TestCase):
+    """Test cases for POST /api/workout-logs/bulk/ and /api/nutrition-logs/bulk/"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+
+    def post_json(self, url, payload):
+        return self.client.post(url, data=json.dumps(payload), content_type='application/json')
+
+    def workout_entries(self, count):
+        return [
+            {
+                'client_id': str(uuid.uuid4()),
+                'exercise_name': f'Exercise {i}',
+                'date_performed': f'2026-01-0{i + 1}T08:00:00Z',
+                'sets_performed': 3,
+                'reps_performed': 10,
+            }
+            for i in range(count)
+        ]
+
+    def test_json_array_creates_logs_with_client_times(self):
+        response = self.post_json('/api/workout-logs/bulk/', self.workout_entries(3))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = json.loads(response.content)
+        self.assertEqual(data['created'], 3)
+        self.assertEqual(data['duplicates'], [])
+        self.assertEqual(WorkoutLog.objects.filter(user=self.user).count(), 3)
+        first = WorkoutLog.objects.get(exercise_name='Exercise 0')
+        self.assertEqual(first.date_performed.isoformat(), '2026-01-01T08:00:00+00:00')
+
+    def test_entries_object_is_accepted(self):
+        response = self.post_json('/api/workout-logs/bulk/', {'entries': self.workout_entries(2)})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(WorkoutLog.objects.count(), 2)
+
+    def test_ndjson_body(self):
+        lines = [
+            {'client_id': str(uuid.uuid4()), 'food_name': 'Oats', 'date_eaten': '2026-01-01T08:00:00Z', 'calories': 300},
+            {'client_id': str(uuid.uuid4()), 'food_name': 'Apple', 'date_eaten': '2026-01-01T12:00:00Z', 'calories': 95},
+        ]
+        body = '\n'.join(json.dumps(line) for line in lines) + '\n'
+        response = self.client.post('/api/nutrition-logs/bulk/', data=body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            set(NutritionLog.objects.filter(user=self.user).values_list('food_name', flat=True)),
+            {'Oats', 'Apple'}
+        )
+
+    def test_malformed_ndjson_reports_line(self):
+        body = '{"food_name": "Oats"}\n{not json\n'
+        response = self.client.post('/api/nutrition-logs/bulk/', data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('line 2', json.loads(response.content)['detail'])
+
+    def test_retry_does_not_duplicate(self):
+        entries = self.workout_entries(3)
+        self.post_json('/api/workout-logs/bulk/', entries[:2])
+
+        response = self.post_json('/api/workout-logs/bulk/', entries)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = json.loads(response.content)
+        self.assertEqual(data['created'], 1)
+        self.assertEqual(sorted(data['duplicates']), sorted(e['client_id'] for e in entries[:2]))
+        self.assertEqual(WorkoutLog.objects.count(), 3)
+
+        response = self.post_json('/api/workout-logs/bulk/', entries)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(WorkoutLog.objects.count(), 3)
+
+    def test_repeated_client_id_within_request_is_inserted_once(self):
+        entry = self.workout_entries(1)[0]
+        response = self.post_json('/api/workout-logs/bulk/', [entry, entry])
+        self.assertEqual(json.loads(response.content)['created'], 1)
+        self.assertEqual(WorkoutLog.objects.count(), 1)
+
+    def test_client_ids_are_scoped_per_user(self):
+        other = User.objects.create(username='other', email='other@example.com', password_hash='x')
+        entries = self.workout_entries(1)
+        WorkoutLog.objects.create(user=other, exercise_name='Theirs', client_id=entries[0]['client_id'])
+
+        response = self.post_json('/api/workout-logs/bulk/', entries)
+
+        self.assertEqual(json.loads(response.content)['created'], 1)
+        self.assertEqual(WorkoutLog.objects.filter(user=self.user).count(), 1)
+
+    def test_invalid_entry_rejects_whole_batch(self):
+        entries = self.workout_entries(2)
+        entries[1]['sets_performed'] = 'many'
+
+        response = self.post_json('/api/workout-logs/bulk/', entries)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = json.loads(response.content)['errors']
+        self.assertEqual(errors[0], {})
+        self.assertIn('sets_performed', errors[1])
+        self.assertEqual(WorkoutLog.objects.count(), 0)
+
+    def test_empty_and_non_list_payloads(self):
+        self.assertEqual(self.post_json('/api/workout-logs/bulk/', []).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post_json('/api/workout-logs/bulk/', {'x': 1}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(BULK_LOG_MAX_ENTRIES=2)
+    def test_batch_size_is_capped(self):
+        response = self.post_json('/api/workout-logs/bulk/', self.workout_entries(3))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(WorkoutLog.objects.count(), 0)
+
+    def test_invalidates_dashboard(self):
+        cache.set(dashboard_cache_key(self.user.id), {'stale': True})
+        self.post_json('/api/workout-logs/bulk/', self.workout_entries(1))
+        self.assertIsNone(cache.get(dashboard_cache_key(self.user.id)))
+
+    def test_requires_authentication(self):
+        response = Client().post('/api/workout-logs/bulk/', data='[]', content_type='application/json')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_single_post_with_duplicate_client_id_is_400(self):
+        entry = {'user': str(self.user.id), 'exercise_name': 'Squat', 'client_id': str(uuid.uuid4())}
+        first = self.post_json('/api/workout-logs/', entry)
+        second = self.post_json('/api/workout-logs/', entry)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED, first.content)
+        self.assertEqual(second.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('client_id', second.json())
+        self.assertEqual(WorkoutLog.objects.filter(user=self.user).count(), 1)
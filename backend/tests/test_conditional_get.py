@@ -0,0 +1,190 @@
+"""
+Test cases for ETag / conditional GET on plan details and the dashboard,
+and for JSON response compression
+"""
+
+import os
+import sys
+import django
+import gzip
+import json
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api import middleware
+from api.models import User, Goal, MealPlan, WorkoutPlan
+from api.serializers import MealPlanDetailSerializer
+
+MEAL_PLAN_DATA = {'days': [
+    {'day': day, 'meals': [{'name': f'Meal {day}-{meal}', 'ingredients': ['oats', 'milk', 'berries'] * 5}
+                           for meal in range(3)]}
+    for day in range(1, 6)
+]}
+WORKOUT_PLAN_DATA = {'days': [{'exercises': [{'exercise_name': 'Squat'}, {'exercise_name': 'Bench'}]}]}
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+
+class PlanDetailConditionalGetTestCase(ConditionalGetTestCase):
+    """Test cases for ETags on plan retrieve and with_details"""
+
+    def setUp(self):
+        super().setUp()
+        self.meal_plan = MealPlan.objects.create(user=self.user, name='Cut', meal_plan_data=MEAL_PLAN_DATA)
+        self.workout_plan = WorkoutPlan.objects.create(user=self.user, name='Full Body', workout_plan_data=WORKOUT_PLAN_DATA)
+
+    def test_unchanged_plan_is_304_without_serializing_or_loading_json(self):
+        url = f'/api/meal-plans/{self.meal_plan.id}/with_details/'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertTrue(first['ETag'].startswith('W/"'))
+        self.assertIn('no-cache', first['Cache-Control'])
+        self.assertIn('private', first['Cache-Control'])
+
+        with mock.patch.object(MealPlanDetailSerializer, 'to_representation') as to_representation, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.revalidate(url, first['ETag'])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], first['ETag'])
+        to_representation.assert_not_called()
+        self.assertFalse(any('meal_plan_data' in query['sql'] for query in queries.captured_queries))
+
+    def test_changed_plan_gets_new_body_and_etag(self):
+        url = f'/api/meal-plans/{self.meal_plan.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.meal_plan.name = 'Bulk'
+        self.meal_plan.save()
+        response = self.revalidate(url, etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'Bulk')
+        self.assertEqual(response.json()['meal_plan_data'], MEAL_PLAN_DATA)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_retrieve_and_with_details_have_distinct_etags(self):
+        retrieve = self.client.get(f'/api/workout-plans/{self.workout_plan.id}/')
+        details = self.client.get(f'/api/workout-plans/{self.workout_plan.id}/with_details/')
+        self.assertNotEqual(retrieve['ETag'], details['ETag'])
+
+    def test_exercise_completion_changes_workout_plan_etag(self):
+        url = f'/api/workout-plans/{self.workout_plan.id}/with_details/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(
+            f'/api/workout-plans/{self.workout_plan.id}/mark_exercise_complete/',
+            data=json.dumps({'day_number': 1, 'exercise_index': 0, 'completed': True}),
+            content_type='application/json'
+        )
+        response = self.revalidate(url, etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('exercise_completions', response.json()['workout_plan_data'])
+
+    def test_partial_update_fields_save_changes_etag(self):
+        url = f'/api/workout-plans/{self.workout_plan.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.workout_plan.is_completed = True
+        self.workout_plan.save(update_fields=['is_completed'])
+
+        self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_if_none_match_lists_and_strong_form_match(self):
+        url = f'/api/meal-plans/{self.meal_plan.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.revalidate(url, f'"other", {etag}').status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.revalidate(url, etag[2:]).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.revalidate(url, '"other"').status_code, status.HTTP_200_OK)
+
+    def test_other_users_plan_is_still_404(self):
+        other = User.objects.create(username='other', email='other@example.com', password_hash='x')
+        plan = MealPlan.objects.create(user=other, name='Theirs')
+        response = self.client.get(f'/api/meal-plans/{plan.id}/with_details/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class DashboardConditionalGetTestCase(ConditionalGetTestCase):
+    """Test cases for ETags on the dashboard"""
+
+    def test_unchanged_dashboard_is_304_and_changes_invalidate(self):
+        url = f'/api/users/{self.user.id}/dashboard/'
+        etag = self.client.get(url)['ETag']
+
+        with mock.patch('api.services.dashboard.build_dashboard') as build_dashboard:
+            self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        build_dashboard.assert_not_called()
+
+        Goal.objects.create(user=self.user, title='Cut', is_active=True)
+        response = self.revalidate(url, etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['counts']['active_goals'], 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(DASHBOARD_CACHE_TTL=0)
+    def test_content_etag_without_cache(self):
+        url = f'/api/users/{self.user.id}/dashboard/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class JSONCompressionTestCase(ConditionalGetTestCase):
+    """Test cases for api.middleware.JSONCompressionMiddleware"""
+
+    def setUp(self):
+        super().setUp()
+        self.meal_plan = MealPlan.objects.create(user=self.user, name='Cut', meal_plan_data=MEAL_PLAN_DATA)
+        self.url = f'/api/meal-plans/{self.meal_plan.id}/with_details/'
+
+    def test_large_json_is_gzipped(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertEqual(json.loads(gzip.decompress(response.content))['meal_plan_data'], MEAL_PLAN_DATA)
+
+    def test_small_json_and_304_are_not_compressed(self):
+        small = self.client.get('/api/health/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(small.has_header('Content-Encoding'))
+
+        etag = self.client.get(self.url)['ETag']
+        not_modified = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(not_modified.has_header('Content-Encoding'))
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=10 ** 6)
+    def test_threshold_is_configurable(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @unittest.skipIf(middleware.brotli is None, 'brotli is not installed')
+    def test_brotli_preferred_when_accepted(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(middleware.brotli.decompress(response.content))['meal_plan_data'], MEAL_PLAN_DATA)
@@ -0,0 +1,72 @@
+"""
+Test cases for the cached dashboard read model
+Covers summary-only plan data, per-user caching and invalidation
+"""
+
+import os
+import sys
+import django
+import json
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import User, Goal, MealPlan, WorkoutPlan
+
+
+class DashboardTestCase(TestCase):
+    """Test cases for UserViewSet.dashboard"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        big_days = [{'day_number': i, 'exercises': [{'exercise_name': f'Exercise {j}'} for j in range(20)]} for i in range(7)]
+        WorkoutPlan.objects.create(user=self.user, name='Strength', workout_plan_data={'days': big_days})
+        MealPlan.objects.create(user=self.user, name='Cut', meal_plan_data={'days': big_days}, daily_calorie_target=1800)
+        self.url = f'/api/users/{self.user.id}/dashboard/'
+
+    def test_dashboard_returns_plan_summaries(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data['workout_plans'][0]['name'], 'Strength')
+        self.assertNotIn('workout_plan_data', data['workout_plans'][0])
+        self.assertNotIn('meal_plan_data', data['meal_plans'][0])
+        self.assertEqual(data['counts'], {'workout_plans': 1, 'meal_plans': 1, 'active_goals': 0})
+
+    def test_dashboard_never_loads_plan_json(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+
+        plan_queries = [q['sql'] for q in context.captured_queries if 'plan_data' in q['sql']]
+        self.assertEqual(plan_queries, [])
+
+    def test_dashboard_is_cached_until_data_changes(self):
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+        self.assertFalse([q for q in context.captured_queries if 'workout_plans' in q['sql']])
+
+        Goal.objects.create(user=self.user, title='Run a 5k')
+        data = json.loads(self.client.get(self.url).content)
+        self.assertEqual(data['active_goals'][0]['title'], 'Run a 5k')
+
+    def test_other_users_dashboard_is_forbidden(self):
+        other = User.objects.create(username='other', email='other@example.com', password_hash='test_hash')
+
+        self.assertEqual(self.client.get(f'/api/users/{other.id}/dashboard/').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(f'/api/users/{uuid.uuid4()}/dashboard/').status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,38 @@
+"""
+Test cases for the database connection budget system check
+"""
+
+import os
+import sys
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.test import SimpleTestCase, override_settings
+
+from api.checks import check_database_connection_budget
+
+
+class ConnectionBudgetCheckTestCase(SimpleTestCase):
+    """Test cases for check_database_connection_budget"""
+
+    @override_settings(DB_POOL_MODE='persistent', WEB_CONCURRENCY=4, WEB_THREADS=8, DB_CONNECTION_LIMIT=20)
+    def test_warns_when_workers_exceed_connection_limit(self):
+        messages = check_database_connection_budget(None)
+
+        self.assertEqual([m.id for m in messages], ['api.W001'])
+        self.assertIn('32 persistent database connections', messages[0].msg)
+
+    @override_settings(DB_POOL_MODE='persistent', WEB_CONCURRENCY=2, WEB_THREADS=4, DB_CONNECTION_LIMIT=20)
+    def test_within_budget_passes(self):
+        self.assertEqual(check_database_connection_budget(None), [])
+
+    @override_settings(DB_POOL_MODE='none', WEB_CONCURRENCY=100, WEB_THREADS=100, DB_CONNECTION_LIMIT=20)
+    def test_no_pooling_has_no_budget(self):
+        self.assertEqual(check_database_connection_budget(None), [])
+
+    @override_settings(DB_POOL_MODE='pooled')
+    def test_unknown_mode_is_an_error(self):
+        self.assertEqual([m.id for m in check_database_connection_budget(None)], ['api.E001'])
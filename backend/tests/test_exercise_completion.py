@@ -0,0 +1,167 @@
+"""
+Test cases for incremental exercise completion tracking
+"""
+
+import os
+import sys
+import django
+import importlib
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import User, WorkoutPlan, ExerciseCompletion
+
+PLAN_DATA = {
+    'days': [
+        {'day_number': 1, 'exercises': [{'exercise_name': 'Squat'}, {'exercise_name': 'Lunge'}]},
+        {'day_number': 2, 'exercises': [{'exercise_name': 'Push Up'}, {'exercise_name': 'Row'}]},
+    ]
+}
+
+
+class ExerciseCompletionTestCase(TestCase):
+    """Test cases for mark_exercise_complete backed by ExerciseCompletion rows"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        self.plan = WorkoutPlan.objects.create(user=self.user, name='Full Body', workout_plan_data=PLAN_DATA)
+
+    def tick(self, day_number, exercise_index, completed=True):
+        return self.client.post(
+            f'/api/workout-plans/{self.plan.id}/mark_exercise_complete/',
+            data=json.dumps({'day_number': day_number, 'exercise_index': exercise_index, 'completed': completed}),
+            content_type='application/json'
+        )
+
+    def test_tick_returns_compact_delta(self):
+        response = self.tick(1, 0)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertNotIn('workout_plan', data)
+        self.assertEqual(data['completion']['day_number'], 1)
+        self.assertTrue(data['completion']['completed'])
+        self.assertIsNotNone(data['completion']['completed_at'])
+        self.assertEqual(data['completed_exercise_count'], 1)
+        self.assertEqual(data['exercise_count'], 4)
+        self.assertEqual(data['completion_percent'], 25.0)
+
+    def test_tick_never_reads_or_writes_plan_json(self):
+        with CaptureQueriesContext(connection) as context:
+            self.tick(1, 0)
+        self.assertFalse([q for q in context.captured_queries if 'workout_plan_data' in q['sql']])
+        self.plan.refresh_from_db()
+        self.assertNotIn('exercise_completions', self.plan.workout_plan_data)
+
+    def test_untick_and_retick_keep_counter_in_step(self):
+        self.tick(1, 0)
+        self.tick(1, 1)
+        self.tick(1, 0, completed=False)
+        data = json.loads(self.tick(1, 1).content)
+
+        self.assertEqual(data['completed_exercise_count'], 1)
+        self.assertEqual(ExerciseCompletion.objects.filter(workout_plan=self.plan).count(), 2)
+        completion = ExerciseCompletion.objects.get(workout_plan=self.plan, day_number=1, exercise_index=0)
+        self.assertFalse(completion.completed)
+        self.assertIsNone(completion.completed_at)
+
+    def test_plan_detail_merges_completions_into_json(self):
+        self.tick(2, 1)
+        for url in [f'/api/workout-plans/{self.plan.id}/', f'/api/workout-plans/{self.plan.id}/with_details/']:
+            data = json.loads(self.client.get(url).content)['workout_plan_data']
+            self.assertTrue(data['exercise_completions']['day_2']['exercise_1']['completed'])
+            self.assertEqual(data['days'], PLAN_DATA['days'])
+
+    def test_stale_full_save_keeps_counter(self):
+        stale = WorkoutPlan.objects.get(pk=self.plan.pk)
+        self.tick(1, 0)
+
+        stale.name = 'Renamed'
+        stale.save()
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.name, 'Renamed')
+        self.assertEqual(self.plan.completed_exercise_count, 1)
+
+    def test_echoed_completions_are_not_stored_in_json(self):
+        self.tick(1, 0)
+        data = json.loads(self.client.get(f'/api/workout-plans/{self.plan.id}/').content)['workout_plan_data']
+        data['exercise_completions']['day_1']['exercise_0']['completed'] = False
+
+        self.client.patch(
+            f'/api/workout-plans/{self.plan.id}/',
+            data=json.dumps({'workout_plan_data': data}),
+            content_type='application/json'
+        )
+
+        self.plan.refresh_from_db()
+        self.assertNotIn('exercise_completions', self.plan.workout_plan_data)
+        self.assertTrue(ExerciseCompletion.objects.get(workout_plan=self.plan).completed)
+
+    def test_invalid_input(self):
+        for payload in [{}, {'day_number': 1}, {'day_number': 'x', 'exercise_index': 0}, {'day_number': 1, 'exercise_index': -1}]:
+            response = self.client.post(
+                f'/api/workout-plans/{self.plan.id}/mark_exercise_complete/',
+                data=json.dumps(payload), content_type='application/json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, payload)
+
+    def test_positions_outside_the_plan_are_rejected(self):
+        for day_number, exercise_index in [(1, 2), (3, 0), (0, 0), (1, 10 ** 6)]:
+            response = self.tick(day_number, exercise_index)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, (day_number, exercise_index))
+            self.assertIn('No such exercise', response.json()['error'])
+        self.assertFalse(ExerciseCompletion.objects.exists())
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.completed_exercise_count, 0)
+
+    def test_positions_follow_plan_edits(self):
+        self.plan.workout_plan_data = {'days': [{'exercises': [{'exercise_name': 'Squat'}]}]}
+        self.plan.save()
+        self.assertEqual(self.plan.day_exercise_counts, {'1': 1})
+
+        self.assertEqual(self.tick(1, 0).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.tick(1, 1).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.tick(2, 0).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_migration_moves_json_completions_to_rows(self):
+        legacy = {**PLAN_DATA, 'exercise_completions': {
+            'day_1': {'exercise_0': {'completed': True, 'completed_at': '2026-01-01T10:00:00+00:00'},
+                      'exercise_1': {'completed': False, 'completed_at': None}},
+        }}
+        WorkoutPlan.objects.filter(pk=self.plan.pk).update(workout_plan_data=legacy)
+        migration = importlib.import_module('api.migrations.0014_exercise_completions')
+
+        migration.move_completions_to_table(apps, None)
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.workout_plan_data, PLAN_DATA)
+        self.assertEqual(self.plan.completed_exercise_count, 1)
+        self.assertEqual(self.plan.completion_map()['day_1']['exercise_0']['completed_at'], '2026-01-01T10:00:00+00:00')
+
+    def test_migration_reverse_restores_json_completions(self):
+        legacy = {**PLAN_DATA, 'exercise_completions': {
+            'day_1': {'exercise_0': {'completed': True, 'completed_at': '2026-01-01T10:00:00+00:00'},
+                      'exercise_1': {'completed': False, 'completed_at': None}},
+        }}
+        WorkoutPlan.objects.filter(pk=self.plan.pk).update(workout_plan_data=legacy)
+        migration = importlib.import_module('api.migrations.0014_exercise_completions')
+        migration.move_completions_to_table(apps, None)
+
+        migration.move_completions_to_json(apps, None)
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.workout_plan_data, legacy)
@@ -0,0 +1,107 @@
+"""
+Test cases for the streaming data export endpoint and command
+"""
+
+import os
+import sys
+import django
+import csv
+import gzip
+import io
+import json
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import User, UserMetrics, WorkoutLog, NutritionLog, WorkoutPlan
+from api.services import export
+
+
+class ExportTestCase(TestCase):
+    """Test cases for GET /api/export/"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        for i in range(5):
+            WorkoutLog.objects.create(user=self.user, exercise_name=f'Exercise {i}', sets_performed=3, reps_performed=10)
+        NutritionLog.objects.create(user=self.user, food_name='Oats, rolled', date_eaten=timezone.now(), calories=Decimal('300.50'))
+        UserMetrics.objects.create(user=self.user, date_recorded=date(2026, 1, 1), weight_kg=Decimal('80.5'))
+        WorkoutPlan.objects.create(user=self.user, name='Plan', workout_plan_data={'days': [{'exercises': []}]})
+        other = User.objects.create(username='other', email='other@example.com', password_hash='x')
+        WorkoutLog.objects.create(user=other, exercise_name='Theirs')
+
+    def content(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_ndjson_streams_every_type_for_user_only(self):
+        response = self.client.get('/api/export/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="easyfitness-testuser.ndjson"', response['Content-Disposition'])
+        records = [json.loads(line) for line in self.content(response).decode().splitlines()]
+        by_type = {}
+        for record in records:
+            by_type.setdefault(record['type'], []).append(record)
+        self.assertEqual(len(by_type['workout_logs']), 5)
+        self.assertNotIn('Theirs', [r['exercise_name'] for r in by_type['workout_logs']])
+        self.assertNotIn('user_id', by_type['workout_logs'][0])
+        self.assertEqual(by_type['nutrition_logs'][0]['calories'], '300.50')
+        self.assertEqual(by_type['user_metrics'][0]['date_recorded'], '2026-01-01')
+        self.assertEqual(by_type['workout_plans'][0]['workout_plan_data'], {'days': [{'exercises': []}]})
+
+    def test_csv_single_type(self):
+        response = self.client.get('/api/export/?output=csv&type=nutrition_logs')
+
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(self.content(response).decode())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['food_name'], 'Oats, rolled')
+        self.assertEqual(rows[0]['calories'], '300.50')
+
+    def test_gzip(self):
+        response = self.client.get('/api/export/?type=workout_logs&gzip=true')
+
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('.ndjson.gz', response['Content-Disposition'])
+        lines = gzip.decompress(self.content(response)).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+
+    def test_output_is_buffered_into_chunks(self):
+        for i in range(300):
+            WorkoutLog.objects.create(user=self.user, exercise_name='Row' * 20)
+        chunks = list(export._buffered(export.ndjson_lines(self.user, ['workout_logs']), size=4096))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) >= 4096 for chunk in chunks[:-1]))
+        self.assertEqual(sum(chunk.count(b'\n') for chunk in chunks), 305)
+
+    def test_invalid_params(self):
+        for query in ['output=xml', 'type=passwords', 'output=csv', 'output=csv&type=goals,workout_logs']:
+            response = self.client.get(f'/api/export/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    def test_requires_authentication(self):
+        response = Client().get('/api/export/')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'export.csv.gz')
+            call_command('export_user_data', 'testuser', '--format', 'csv', '--type', 'workout_logs', '--gzip',
+                         '--output', path, stderr=io.StringIO())
+            with gzip.open(path, 'rt') as handle:
+                rows = list(csv.DictReader(handle))
+        self.assertEqual(len(rows), 5)
@@ -0,0 +1,113 @@
+"""
+Test cases for the goal progress endpoint
+"""
+
+import os
+import sys
+import django
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import User, Goal, UserMetrics
+
+
+class GoalProgressTestCase(TestCase):
+    """Test cases for GET /api/goals/<id>/progress/"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        self.start = date(2026, 1, 1)
+        self.goal = Goal.objects.create(
+            user=self.user, title='Cut', target_weight_kg=Decimal('80'),
+            start_date=self.start, target_date=self.start + timedelta(weeks=20)
+        )
+
+    def weigh(self, weeks, kg):
+        return UserMetrics.objects.create(
+            user=self.user, date_recorded=self.start + timedelta(weeks=weeks), weight_kg=Decimal(str(kg))
+        )
+
+    def progress(self, goal=None):
+        response = self.client.get(f'/api/goals/{(goal or self.goal).id}/progress/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_linear_loss_projects_completion(self):
+        UserMetrics.objects.create(user=self.user, date_recorded=self.start - timedelta(days=1), weight_kg=Decimal('99'))
+        for week, kg in enumerate([90, 89, 88, 87]):
+            self.weigh(week, kg)
+
+        data = self.progress()
+
+        self.assertEqual(data['start_weight_kg'], 90.0)
+        self.assertEqual(data['current_weight_kg'], 87.0)
+        self.assertEqual(data['percent_complete'], 30.0)
+        self.assertEqual(data['weekly_change_kg'], -1.0)
+        self.assertEqual(data['data_points'], 4)
+        self.assertEqual(data['projected_completion_date'], str(self.start + timedelta(weeks=10)))
+        self.assertTrue(data['on_track'])
+
+    def test_moving_away_from_target_has_no_projection(self):
+        for week, kg in enumerate([90, 91, 92]):
+            self.weigh(week, kg)
+        data = self.progress()
+        self.assertEqual(data['percent_complete'], 0.0)
+        self.assertIsNone(data['projected_completion_date'])
+        self.assertFalse(data['on_track'])
+
+    def test_target_passed(self):
+        self.weigh(0, 90)
+        self.weigh(8, 79)
+        data = self.progress()
+        self.assertEqual(data['percent_complete'], 100.0)
+        self.assertEqual(data['projected_completion_date'], str(self.start + timedelta(weeks=8)))
+
+    def test_without_metrics_or_target(self):
+        data = self.progress()
+        self.assertEqual(data['data_points'], 0)
+        self.assertIsNone(data['percent_complete'])
+
+        goal = Goal.objects.create(user=self.user, title='Feel better', start_date=self.start)
+        self.weigh(0, 90)
+        self.weigh(1, 89)
+        data = self.progress(goal)
+        self.assertIsNone(data['percent_complete'])
+        self.assertEqual(data['weekly_change_kg'], -1.0)
+
+    def test_cached_until_metrics_or_goal_change(self):
+        self.weigh(0, 90)
+        self.weigh(1, 89)
+        self.assertEqual(self.progress()['current_weight_kg'], 89.0)
+
+        with CaptureQueriesContext(connection) as context:
+            self.progress()
+        self.assertFalse([q for q in context.captured_queries if 'user_metrics' in q['sql']])
+
+        self.weigh(2, 85)
+        self.assertEqual(self.progress()['current_weight_kg'], 85.0)
+
+        self.goal.target_weight_kg = Decimal('85')
+        self.goal.save()
+        self.assertEqual(self.progress()['percent_complete'], 100.0)
+
+    def test_other_users_goal_is_not_found(self):
+        other = User.objects.create(username='other', email='other@example.com', password_hash='x')
+        goal = Goal.objects.create(user=other, title='Theirs', target_weight_kg=Decimal('70'))
+        response = self.client.get(f'/api/goals/{goal.id}/progress/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,187 @@
+"""
+Test cases for the streaming log import endpoint and command
+"""
+
+import os
+import sys
+import django
+import gzip
+import io
+import json
+import tempfile
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, Client
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import User, WorkoutLog, NutritionLog, DailyNutritionSummary
+from api.services import log_import
+
+
+def ndjson(records):
+    return ''.join(json.dumps(record) + '\n' for record in records).encode()
+
+
+def nutrition_record(day, calories='100.00', **extra):
+    eaten = timezone.make_aware(datetime(2024, 1, day, 12, 0))
+    return {'food_name': f'Food {day}', 'date_eaten': eaten.isoformat(), 'calories': calories, 'meal_type': 'lunch', **extra}
+
+
+class ImportLogsServiceTestCase(TestCase):
+    """Test cases for log_import.import_logs"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+
+    def test_ndjson_imports_in_chunks_and_refreshes_rollups_once(self):
+        records = [nutrition_record(day % 5 + 1, type='nutrition_logs') for day in range(12)]
+
+        with mock.patch('api.services.bulk_logs.nutrition_rollup.refresh_days') as refresh_days:
+            summary = log_import.import_logs(self.user, io.BytesIO(ndjson(records)), chunk_size=5)
+
+        self.assertEqual(summary['processed'], 12)
+        self.assertEqual(summary['created'], 12)
+        self.assertEqual(NutritionLog.objects.filter(user=self.user).count(), 12)
+        refresh_days.assert_called_once()
+        self.assertEqual(refresh_days.call_args[0][1], {date(2024, 1, day) for day in range(1, 6)})
+
+    def test_rollups_match_imported_logs(self):
+        records = [nutrition_record(1, '100.00'), nutrition_record(1, '50.50'), nutrition_record(2, '10.00')]
+        log_import.import_logs(self.user, io.BytesIO(ndjson(records)), record_type='nutrition_logs')
+
+        summary = DailyNutritionSummary.objects.get(user=self.user, date=date(2024, 1, 1))
+        self.assertEqual(summary.calories, Decimal('150.50'))
+        self.assertEqual(summary.entry_count, 2)
+        self.assertTrue(DailyNutritionSummary.objects.filter(user=self.user, date=date(2024, 1, 2)).exists())
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        body = ndjson([
+            {'type': 'workout_logs', 'exercise_name': 'Squat', 'sets_performed': 3},
+            {'type': 'workout_logs', 'exercise_name': 'Bench', 'sets_performed': 'many'},
+        ]) + b'not json\n\n' + ndjson([{'exercise_name': 'No type'}])
+
+        summary = log_import.import_logs(self.user, io.BytesIO(body))
+
+        self.assertEqual(summary['created'], 1)
+        self.assertEqual(summary['invalid'], 3)
+        self.assertEqual([error['line'] for error in summary['errors']], [2, 3, 5])
+        self.assertIn('sets_performed', summary['errors'][0]['errors'])
+        self.assertIn('type', summary['errors'][2]['errors'])
+        self.assertEqual(list(WorkoutLog.objects.values_list('exercise_name', flat=True)), ['Squat'])
+
+    def test_error_details_are_capped(self):
+        body = ndjson([{'type': 'workout_logs', 'sets_performed': 'x'}] * 5)
+        with mock.patch.object(log_import, 'MAX_REPORTED_ERRORS', 2):
+            summary = log_import.import_logs(self.user, io.BytesIO(body))
+
+        self.assertEqual(summary['invalid'], 5)
+        self.assertEqual(len(summary['errors']), 2)
+        self.assertTrue(summary['errors_truncated'])
+
+    def test_other_types_are_skipped_and_client_ids_deduplicated(self):
+        client_id = str(uuid.uuid4())
+        body = ndjson([
+            {'type': 'workout_logs', 'exercise_name': 'Row', 'client_id': client_id},
+            {'type': 'goals', 'goal_type': 'weight_loss'},
+            nutrition_record(1, type='nutrition_logs'),
+        ])
+
+        first = log_import.import_logs(self.user, io.BytesIO(body), record_type='workout_logs')
+        second = log_import.import_logs(self.user, io.BytesIO(body), record_type='workout_logs')
+
+        self.assertEqual((first['created'], first['skipped']), (1, 2))
+        self.assertEqual((second['created'], second['duplicates']), (0, 1))
+        self.assertEqual(NutritionLog.objects.count(), 0)
+
+    def test_gzipped_csv_with_empty_cells(self):
+        body = gzip.compress(
+            b'exercise_name,date_performed,sets_performed,duration_minutes\n'
+            b'Deadlift,2024-01-03T08:00:00Z,5,\n'
+            b'Plank,,1,2\n'
+        )
+        summary = log_import.import_logs(self.user, io.BytesIO(body), 'csv', 'workout_logs')
+
+        self.assertEqual(summary['created'], 2)
+        deadlift = WorkoutLog.objects.get(exercise_name='Deadlift')
+        self.assertEqual(deadlift.sets_performed, 5)
+        self.assertIsNone(deadlift.duration_minutes)
+
+    def test_csv_requires_type(self):
+        with self.assertRaises(ValueError):
+            log_import.import_logs(self.user, io.BytesIO(b''), 'csv')
+
+
+class ImportEndpointTestCase(TestCase):
+    """Test cases for POST /api/import/"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+
+    def test_multipart_csv_upload(self):
+        upload = SimpleUploadedFile('history.csv', b'food_name,date_eaten,calories\nEgg,2024-01-01T08:00:00Z,70\n')
+
+        response = self.client.post('/api/import/?type=nutrition_logs', {'file': upload})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual(NutritionLog.objects.get(user=self.user).food_name, 'Egg')
+
+    def test_raw_ndjson_body(self):
+        body = ndjson([{'type': 'workout_logs', 'exercise_name': 'Squat'}])
+
+        response = self.client.post('/api/import/', body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(WorkoutLog.objects.filter(user=self.user).count(), 1)
+
+    def test_nothing_created_returns_200(self):
+        response = self.client.post('/api/import/', b'{"type": "goals"}\n', content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['skipped'], 1)
+
+    def test_rejects_bad_parameters(self):
+        body = ndjson([{'exercise_name': 'Squat'}])
+        for query in ('?type=goals', '?input=xml', '?input=csv'):
+            response = self.client.post(f'/api/import/{query}', body, content_type='application/x-ndjson')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    def test_requires_authentication(self):
+        response = Client().post('/api/import/', b'{}\n', content_type='application/x-ndjson')
+        self.assertIn(response.status_code, [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN])
+
+
+class ImportCommandTestCase(TestCase):
+    """Test cases for the import_user_logs management command"""
+
+    def test_round_trips_an_export(self):
+        user = User.objects.create(username='testuser', email='test@example.com', password_hash='x')
+        WorkoutLog.objects.create(user=user, exercise_name='Squat', client_id=uuid.uuid4())
+        WorkoutLog.objects.create(user=user, exercise_name='Bench')
+        new_user = User.objects.create(username='newuser', email='new@example.com', password_hash='x')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'export.ndjson.gz')
+            call_command('export_user_data', 'testuser', '--gzip', '--output', path, stderr=io.StringIO())
+            out = io.StringIO()
+            call_command('import_user_logs', 'newuser', path, stdout=out, stderr=io.StringIO())
+
+        self.assertIn('Imported 2 of', out.getvalue())
+        self.assertEqual(
+            sorted(WorkoutLog.objects.filter(user=new_user).values_list('exercise_name', flat=True)),
+            ['Bench', 'Squat']
+        )
@@ -0,0 +1,47 @@
+"""
+Test cases for lazy loading of the heavy service modules
+Covers that startup does not import the Gemini SDK and that the lazy attributes resolve
+"""
+
+import os
+import subprocess
+import sys
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.test import SimpleTestCase
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LazyServiceImportTestCase(SimpleTestCase):
+    """Test cases for api.services lazy attributes"""
+
+    def run_fresh(self, code):
+        return subprocess.run(
+            [sys.executable, '-c', code], cwd=BACKEND_DIR, env=dict(os.environ),
+            capture_output=True, text=True, timeout=60
+        )
+
+    def test_startup_does_not_import_gemini_sdk(self):
+        result = self.run_fresh(
+            "import sys, django; django.setup(); "
+            "from django.urls import get_resolver; get_resolver().url_patterns; "
+            "print('google.generativeai' in sys.modules, 'api.services.ai_service' in sys.modules)"
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), 'False False')
+
+    def test_lazy_attributes_resolve(self):
+        import api.services
+        from api.services.ai_service import GeminiAIService
+        from api.services.exercise_service import ExerciseDBService
+
+        self.assertIs(api.services.GeminiAIService, GeminiAIService)
+        self.assertIs(api.services.ExerciseDBService, ExerciseDBService)
+        with self.assertRaises(AttributeError):
+            api.services.NotAService
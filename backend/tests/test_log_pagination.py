@@ -0,0 +1,77 @@
+"""
+Test cases for keyset cursor pagination on the log endpoints
+"""
+
+import os
+import sys
+import django
+import json
+from datetime import timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import User, NutritionLog, WorkoutLog
+
+
+class LogCursorPaginationTestCase(TestCase):
+    """Test cases for KeysetCursorPagination"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        now = timezone.now()
+        # Pairs of logs share a timestamp so the id tie-break is exercised
+        for i in range(25):
+            NutritionLog.objects.create(user=self.user, food_name=f'Food {i}', date_eaten=now - timedelta(minutes=i // 2))
+
+    def fetch_all(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            data = json.loads(response.content)
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return seen
+
+    def test_pages_cover_every_log_once_newest_first(self):
+        ids = self.fetch_all('/api/nutrition-logs/?page_size=4')
+
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(set(ids)), 25)
+        expected = [str(pk) for pk in NutritionLog.objects.order_by('-date_eaten', '-id').values_list('id', flat=True)]
+        self.assertEqual(ids, expected)
+
+    def test_count_is_only_computed_on_request(self):
+        with CaptureQueriesContext(connection) as context:
+            data = json.loads(self.client.get('/api/nutrition-logs/').content)
+        self.assertNotIn('count', data)
+        self.assertFalse([q for q in context.captured_queries if 'COUNT(' in q['sql'].upper()])
+
+        data = json.loads(self.client.get('/api/nutrition-logs/?count=true').content)
+        self.assertEqual(data['count'], 25)
+        self.assertNotIn('count=', data['next'])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get('/api/workout-logs/?cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_workout_logs_use_cursor_pagination(self):
+        WorkoutLog.objects.create(user=self.user, exercise_name='Squat')
+
+        data = json.loads(self.client.get('/api/workout-logs/').content)
+
+        self.assertEqual(len(data['results']), 1)
+        self.assertIsNone(data['next'])
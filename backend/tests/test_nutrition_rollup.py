@@ -0,0 +1,135 @@
+"""
+Test cases for the daily nutrition rollup table and endpoint
+"""
+
+import os
+import sys
+import django
+import json
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import User, NutritionLog, DailyNutritionSummary
+
+
+def at(day, hour=12):
+    return datetime(2026, 3, day, hour, tzinfo=dt_timezone.utc)
+
+
+class NutritionRollupTestCase(TestCase):
+    """Test cases for incremental maintenance of DailyNutritionSummary"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+
+    def log(self, day, calories, quantity=1, meal_type='lunch', **fields):
+        return NutritionLog.objects.create(
+            user=self.user, food_name='Food', date_eaten=at(day), quantity=Decimal(str(quantity)),
+            meal_type=meal_type, calories=Decimal(str(calories)), **fields
+        )
+
+    def summary(self, day):
+        return DailyNutritionSummary.objects.get(user=self.user, date=date(2026, 3, day))
+
+    def test_create_adds_quantity_weighted_totals(self):
+        self.log(1, 200, quantity=1.5, meal_type='breakfast', protein=Decimal('10'))
+        self.log(1, 300, meal_type='lunch')
+
+        summary = self.summary(1)
+        self.assertEqual(summary.calories, Decimal('600'))
+        self.assertEqual(summary.protein, Decimal('15'))
+        self.assertEqual(summary.carbs, Decimal('0'))
+        self.assertEqual(summary.entry_count, 2)
+        self.assertEqual(summary.breakfast_count, 1)
+        self.assertEqual(summary.lunch_count, 1)
+
+    def test_update_moving_day_refreshes_both_days(self):
+        self.log(1, 100)
+        moved = self.log(1, 250)
+
+        moved.date_eaten = at(2)
+        moved.save()
+
+        self.assertEqual(self.summary(1).calories, Decimal('100'))
+        self.assertEqual(self.summary(2).calories, Decimal('250'))
+
+    def test_delete_last_log_removes_row(self):
+        log = self.log(1, 100)
+        log.delete()
+        self.assertFalse(DailyNutritionSummary.objects.filter(user=self.user).exists())
+
+    def test_bulk_upload_updates_rollup(self):
+        client = Client()
+        session = client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        entries = [
+            {'client_id': str(uuid.uuid4()), 'food_name': 'Oats', 'date_eaten': at(3, 8).isoformat(), 'calories': '300', 'meal_type': 'breakfast'},
+            {'client_id': str(uuid.uuid4()), 'food_name': 'Rice', 'date_eaten': at(3, 13).isoformat(), 'calories': '400', 'meal_type': 'lunch'},
+        ]
+        client.post('/api/nutrition-logs/bulk/', data=json.dumps(entries), content_type='application/json')
+
+        summary = self.summary(3)
+        self.assertEqual(summary.calories, Decimal('700'))
+        self.assertEqual(summary.entry_count, 2)
+
+    def test_rebuild_command_restores_drifted_rows(self):
+        self.log(1, 100)
+        self.log(2, 200, meal_type='snack')
+        DailyNutritionSummary.objects.all().delete()
+        DailyNutritionSummary.objects.create(user=self.user, date=date(2026, 3, 9), calories=999, entry_count=1)
+
+        out = StringIO()
+        call_command('rebuild_nutrition_rollups', '--user', str(self.user.id), stdout=out)
+
+        self.assertIn('Wrote 2', out.getvalue())
+        self.assertEqual(
+            list(DailyNutritionSummary.objects.filter(user=self.user).order_by('date').values_list('date', 'calories', 'snack_count')),
+            [(date(2026, 3, 1), Decimal('100'), 0), (date(2026, 3, 2), Decimal('200'), 1)]
+        )
+
+
+class DailyNutritionEndpointTestCase(TestCase):
+    """Test cases for GET /api/nutrition-logs/daily/"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        for day, calories in [(1, 500), (1, 250), (3, 800)]:
+            NutritionLog.objects.create(user=self.user, food_name='Food', date_eaten=at(day), calories=calories)
+        other = User.objects.create(username='other', email='other@example.com', password_hash='x')
+        NutritionLog.objects.create(user=other, food_name='Food', date_eaten=at(2), calories=1000)
+
+    def test_range_is_zero_filled_and_scoped_to_user(self):
+        response = self.client.get('/api/nutrition-logs/daily/?start=2026-03-01&end=2026-03-04')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        days = json.loads(response.content)['days']
+        self.assertEqual([d['date'] for d in days], ['2026-03-01', '2026-03-02', '2026-03-03', '2026-03-04'])
+        self.assertEqual([Decimal(d['calories']) for d in days], [Decimal('750'), 0, Decimal('800'), 0])
+        self.assertEqual(days[0]['entry_count'], 2)
+
+    def test_reads_rollup_without_touching_logs(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get('/api/nutrition-logs/daily/?start=2026-03-01&end=2026-03-31')
+        self.assertFalse([q for q in context.captured_queries if 'nutrition_log' in q['sql'].replace('daily_nutrition', '')])
+
+    def test_invalid_ranges(self):
+        for query in ['start=nope', 'end=nope', 'end=2026-02-30', 'start=2026-03-05&end=2026-03-01', 'start=2024-01-01&end=2026-03-01']:
+            response = self.client.get(f'/api/nutrition-logs/daily/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
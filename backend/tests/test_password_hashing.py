@@ -0,0 +1,89 @@
+"""
+Test cases for password hashing and rehash-on-login
+Covers Argon2 hashing, legacy SHA-256 and PBKDF2 upgrades and the login endpoint
+"""
+
+import os
+import sys
+import django
+import hashlib
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.test import TestCase, Client, override_settings
+from rest_framework import status
+
+from api.models import User
+from api.passwords import hash_password, verify_password, verify_and_upgrade
+
+PASSWORD = 'TestPass123!'
+
+
+def legacy_hash(password, salt='abc123'):
+    return f"{salt}${hashlib.sha256((password + salt).encode()).hexdigest()}"
+
+
+class PasswordHashingTestCase(TestCase):
+    """Test cases for api.passwords"""
+
+    def make_user(self, password_hash):
+        return User.objects.create(username='testuser', email='test@example.com', password_hash=password_hash)
+
+    def test_new_hashes_use_argon2id(self):
+        hashed = hash_password(PASSWORD)
+
+        self.assertTrue(hashed.startswith('argon2$argon2id$'))
+        self.assertTrue(verify_password(PASSWORD, hashed))
+        self.assertFalse(verify_password('wrong', hashed))
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        user = self.make_user(legacy_hash(PASSWORD))
+
+        self.assertTrue(verify_and_upgrade(user, PASSWORD))
+
+        user.refresh_from_db()
+        self.assertTrue(user.password_hash.startswith('argon2$'))
+        self.assertTrue(verify_password(PASSWORD, user.password_hash))
+
+    def test_pbkdf2_hash_is_upgraded_on_login(self):
+        user = self.make_user(PBKDF2PasswordHasher().encode(PASSWORD, 'somesalt', iterations=1000))
+
+        self.assertTrue(verify_and_upgrade(user, PASSWORD))
+
+        user.refresh_from_db()
+        self.assertTrue(user.password_hash.startswith('argon2$'))
+
+    def test_outdated_argon2_parameters_are_upgraded(self):
+        with override_settings(ARGON2_TIME_COST=1):
+            user = self.make_user(hash_password(PASSWORD))
+
+        self.assertIn('t=1', user.password_hash)
+        self.assertTrue(verify_and_upgrade(user, PASSWORD))
+        user.refresh_from_db()
+        self.assertIn('t=2', user.password_hash)
+
+    def test_wrong_password_does_not_upgrade(self):
+        original = legacy_hash(PASSWORD)
+        user = self.make_user(original)
+
+        self.assertFalse(verify_and_upgrade(user, 'wrong-password'))
+
+        user.refresh_from_db()
+        self.assertEqual(user.password_hash, original)
+
+    def test_login_endpoint_upgrades_legacy_hash(self):
+        user = self.make_user(legacy_hash(PASSWORD))
+
+        response = Client().post(
+            '/api/users/login/',
+            data=json.dumps({'username': 'testuser', 'password': PASSWORD}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password_hash.startswith('argon2$'))
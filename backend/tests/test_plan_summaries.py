@@ -0,0 +1,84 @@
+"""
+Test cases for plan summary columns and the lightweight list endpoints
+"""
+
+import os
+import sys
+import django
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import User, MealPlan, WorkoutPlan
+
+PLAN_DATA = {
+    'days': [
+        {'day_number': 1, 'exercises': [{'exercise_name': 'Squat'}, {'exercise_name': 'Lunge'}]},
+        {'day_number': 2, 'exercises': [{'exercise_name': 'Push Up'}, {'exercise_name': 'Row'}]},
+    ]
+}
+
+
+class WorkoutPlanSummaryTestCase(TestCase):
+    """Test cases for WorkoutPlan summary columns"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        self.plan = WorkoutPlan.objects.create(user=self.user, name='Full Body', workout_plan_data=PLAN_DATA)
+
+    def test_summary_columns_computed_on_save(self):
+        self.assertEqual(self.plan.day_count, 2)
+        self.assertEqual(self.plan.exercise_count, 4)
+        self.assertEqual(self.plan.completed_exercise_count, 0)
+
+        nested = WorkoutPlan.objects.create(user=self.user, name='Enriched', workout_plan_data={'data': PLAN_DATA})
+        self.assertEqual(nested.exercise_count, 4)
+
+    def test_exercise_completion_updates_summary(self):
+        response = self.client.post(
+            f'/api/workout-plans/{self.plan.id}/mark_exercise_complete/',
+            data=json.dumps({'day_number': 1, 'exercise_index': 0}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.completed_exercise_count, 1)
+
+    def test_list_returns_summaries_without_loading_json(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/workout-plans/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        plan = json.loads(response.content)['results'][0]
+        self.assertNotIn('workout_plan_data', plan)
+        self.assertEqual(plan['exercise_count'], 4)
+        self.assertEqual(plan['completion_percent'], 0.0)
+        self.assertFalse([q for q in context.captured_queries if 'workout_plan_data' in q['sql']])
+
+    def test_retrieve_still_returns_full_plan(self):
+        response = self.client.get(f'/api/workout-plans/{self.plan.id}/')
+
+        self.assertEqual(json.loads(response.content)['workout_plan_data'], PLAN_DATA)
+
+    def test_meal_plan_list_defers_json(self):
+        MealPlan.objects.create(user=self.user, name='Cut', meal_plan_data=PLAN_DATA, daily_calorie_target=1800, days_count=2)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/api/meal-plans/user/{self.user.id}/')
+
+        plan = json.loads(response.content)[0]
+        self.assertNotIn('meal_plan_data', plan)
+        self.assertEqual(plan['daily_calorie_target'], 1800)
+        self.assertFalse([q for q in context.captured_queries if 'meal_plan_data' in q['sql']])
@@ -0,0 +1,231 @@
+"""
+Test cases for the plan template library
+Covers template keys, meal plan scaling and the generate-view fast path
+"""
+
+import os
+import sys
+import django
+import copy
+import json
+from io import StringIO
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from api.models import User, MealPlan, PlanTemplate, WorkoutPlan
+from api.services import plan_templates
+
+
+WORKOUT_PLAN = {
+    "plan_name": "3-Day Beginner Muscle Plan",
+    "plan_description": "Full body",
+    "days": [{"day_number": 1, "day_name": "Full Body", "exercises": [{"exercise_name": "Squat", "sets": 3, "reps": "8-10"}]}]
+}
+
+MEAL_PLAN = {
+    "plan_name": "2000 kcal Plan",
+    "plan_description": "Balanced",
+    "days": [{
+        "day_number": 1,
+        "meals": {
+            "breakfast": {
+                "recipe_name": "Oats",
+                "ingredients": [{"ingredient_name": "Oats", "measure": "1 cup", "calories": 300, "protein": 10, "carbs": 54}],
+                "meal_totals": {"calories": 300, "protein": 10, "carbs": 54}
+            }
+        },
+        "daily_totals": {"calories": 2000, "protein": 150, "carbs": 200}
+    }]
+}
+
+
+class PlanTemplateKeyTestCase(SimpleTestCase):
+    """Test cases for template key normalization and scaling"""
+
+    def test_workout_key_normalizes_parameters(self):
+        self.assertEqual(
+            plan_templates.workout_template_key('Build_Muscle', ' Beginner ', '3'),
+            plan_templates.workout_template_key('build muscle', 'beginner', 3)
+        )
+        self.assertIsNone(plan_templates.workout_template_key('build muscle', 'beginner', 'often'))
+
+    def test_meal_key_ignores_preference_order(self):
+        self.assertEqual(
+            plan_templates.meal_template_key('lose weight', 1800, ['Vegetarian', 'no nuts']),
+            plan_templates.meal_template_key('lose weight', 1800, ['no nuts', 'vegetarian'])
+        )
+
+    def test_nearest_calorie_target_respects_tolerance(self):
+        self.assertEqual(plan_templates.nearest_calorie_target(2100), 2000)
+        self.assertEqual(plan_templates.nearest_calorie_target('1850'), 1800)
+        self.assertIsNone(plan_templates.nearest_calorie_target(3500))
+
+    def test_scale_meal_plan_scales_all_nutrition_levels(self):
+        scaled = plan_templates.scale_meal_plan(MEAL_PLAN, 1.1)
+
+        day = scaled['days'][0]
+        self.assertEqual(day['daily_totals']['calories'], 2200.0)
+        self.assertEqual(day['meals']['breakfast']['meal_totals']['protein'], 11.0)
+        self.assertEqual(day['meals']['breakfast']['ingredients'][0]['carbs'], 59.4)
+        # The stored template is left untouched
+        self.assertEqual(MEAL_PLAN['days'][0]['daily_totals']['calories'], 2000)
+
+    def test_scale_measure_scales_leading_quantity(self):
+        cases = {'150 g': '165 g', '3 large': '3.3 large', '1/2 cup': '0.55 cup', '1 1/2 cups': '1.65 cups',
+                 '2-3 cloves': '2.2-3.3 cloves', '100g': '110g'}
+        for measure, expected in cases.items():
+            self.assertEqual(plan_templates.scale_measure(measure, 1.1), expected, measure)
+        for measure in ['a pinch', 'to taste', '', None]:
+            self.assertIsNone(plan_templates.scale_measure(measure, 1.1), measure)
+
+    def test_scaled_portions_stay_in_proportion_with_calories(self):
+        plan = copy.deepcopy(MEAL_PLAN)
+        plan['days'][0]['meals']['breakfast']['ingredients'].append(
+            {"ingredient_name": "Milk", "measure": "250 ml", "calories": 160, "protein": 8, "carbs": 12}
+        )
+        factor = 2100 / 2000
+        scaled = plan_templates.scale_meal_plan(plan, factor)
+
+        original = plan['days'][0]['meals']['breakfast']['ingredients']
+        for before, after in zip(original, scaled['days'][0]['meals']['breakfast']['ingredients']):
+            quantity = float(after['measure'].split()[0]) / float(before['measure'].split()[0])
+            self.assertAlmostEqual(quantity, factor, delta=0.01)
+            self.assertAlmostEqual(after['calories'] / before['calories'], quantity, delta=0.01)
+
+    def test_unscalable_measure_limits_the_scale_factor(self):
+        plan = copy.deepcopy(MEAL_PLAN)
+        plan['days'][0]['meals']['breakfast']['ingredients'][0]['measure'] = 'a handful'
+
+        small = plan_templates.scale_meal_plan(plan, 1.03)
+        self.assertEqual(small['days'][0]['meals']['breakfast']['ingredients'][0]['measure'], 'a handful')
+        self.assertIsNone(plan_templates.scale_meal_plan(plan, 1.08))
+
+
+class PlanTemplateFastPathTestCase(TestCase):
+    """Test cases for serving templates from the generate endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        self.workout_template = plan_templates.store_workout_template('build muscle', 'beginner', 3, WORKOUT_PLAN, {'total_exercises': 1})
+        self.meal_template = plan_templates.store_meal_template('lose weight', 2000, [], MEAL_PLAN)
+
+    def post(self, url, payload):
+        return self.client.post(url, data=json.dumps(payload), content_type='application/json')
+
+    @patch('api.services.ai_service.GeminiAIService')
+    def test_workout_template_served_without_gemini(self, mock_ai_service):
+        response = self.post('/api/generate-workout-plan/', {
+            'user_id': str(self.user.id),
+            'user_goal': 'Build Muscle',
+            'experience_level': 'beginner',
+            'days_per_week': 3,
+            'save_plan': True,
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertTrue(data['from_template'])
+        self.assertEqual(data['data']['plan_name'], WORKOUT_PLAN['plan_name'])
+        self.assertTrue(WorkoutPlan.objects.filter(id=data['saved_plan_id'], user=self.user).exists())
+        mock_ai_service.assert_not_called()
+
+    @patch('api.services.ai_service.GeminiAIService')
+    def test_hits_are_counted_in_cache_and_flushed(self, mock_ai_service):
+        payload = {'user_id': str(self.user.id), 'user_goal': 'build muscle', 'experience_level': 'beginner', 'days_per_week': 3}
+        with CaptureQueriesContext(connection) as context:
+            self.post('/api/generate-workout-plan/', payload)
+        self.assertFalse([q for q in context.captured_queries if q['sql'].startswith('UPDATE "plan_templates"')])
+        self.post('/api/generate-workout-plan/', payload)
+        self.workout_template.refresh_from_db()
+        self.assertEqual(self.workout_template.times_served, 0)
+
+        out = StringIO()
+        call_command('flush_template_stats', stdout=out)
+        self.assertIn('Flushed 2 plan template hits', out.getvalue())
+        self.workout_template.refresh_from_db()
+        self.assertEqual(self.workout_template.times_served, 2)
+
+        call_command('flush_template_stats', stdout=StringIO())
+        self.workout_template.refresh_from_db()
+        self.assertEqual(self.workout_template.times_served, 2)
+
+    @patch('api.services.ai_service.GeminiAIService')
+    def test_meal_template_scaled_and_saved(self, mock_ai_service):
+        response = self.post('/api/generate-meal-plan/', {
+            'user_id': str(self.user.id),
+            'goal': 'lose weight',
+            'daily_calorie_target': 2100,
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = json.loads(response.content)
+        self.assertTrue(data['from_template'])
+        meal_plan = MealPlan.objects.get(id=data['saved_plan_id'])
+        self.assertEqual(meal_plan.daily_calorie_target, 2100)
+        self.assertEqual(meal_plan.meal_plan_data['days'][0]['daily_totals']['calories'], 2100.0)
+        mock_ai_service.assert_not_called()
+
+    @patch('api.services.ai_service.GeminiAIService')
+    def test_unscalable_meal_template_goes_to_live_generation(self, mock_ai_service):
+        plan = copy.deepcopy(MEAL_PLAN)
+        plan['days'][0]['meals']['breakfast']['ingredients'][0]['measure'] = 'a bowl'
+        plan_templates.store_meal_template('lose weight', 1800, [], plan)
+        mock_ai_service.return_value.generate_meal_plan.return_value = {'success': False, 'error': 'mocked'}
+
+        self.post('/api/generate-meal-plan/', {'user_id': str(self.user.id), 'goal': 'lose weight', 'daily_calorie_target': 1900})
+
+        mock_ai_service.return_value.generate_meal_plan.assert_called_once()
+        self.assertEqual(plan_templates.flush_served_counts(), 0)
+
+    @patch('api.services.ai_service.GeminiAIService')
+    def test_uncommon_request_goes_to_live_generation(self, mock_ai_service):
+        mock_ai_service.return_value.generate_meal_plan.return_value = {'success': False, 'error': 'mocked'}
+
+        response = self.post('/api/generate-meal-plan/', {
+            'user_id': str(self.user.id),
+            'goal': 'lose weight',
+            'daily_calorie_target': 2000,
+            'dietary_preferences': ['keto'],
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        mock_ai_service.return_value.generate_meal_plan.assert_called_once()
+
+    @patch('api.services.ai_service.GeminiAIService')
+    def test_use_template_false_forces_live_generation(self, mock_ai_service):
+        mock_ai_service.return_value.generate_exercise_plan.return_value = {'success': False, 'error': 'mocked'}
+
+        self.post('/api/generate-workout-plan/', {
+            'user_id': str(self.user.id),
+            'user_goal': 'build muscle',
+            'experience_level': 'beginner',
+            'days_per_week': 3,
+            'use_template': False,
+        })
+
+        mock_ai_service.return_value.generate_exercise_plan.assert_called_once()
+
+    def test_build_command_dry_run_lists_missing_cells(self):
+        out = StringIO()
+        call_command('build_plan_templates', '--type', 'workout', '--dry-run', stdout=out)
+
+        output = out.getvalue()
+        expected = len(list(plan_templates.workout_grid())) - 1
+        self.assertIn(f'{expected} workout and 0 meal templates to generate', output)
+        self.assertNotIn(self.workout_template.template_key, output)
+        self.assertEqual(PlanTemplate.objects.count(), 2)
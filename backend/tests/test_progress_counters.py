@@ -0,0 +1,198 @@
+"""
+Test cases for denormalized plan and user progress counters
+"""
+
+import os
+import sys
+import django
+import json
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, Client
+from rest_framework import status
+
+from api.authentication import get_cached_user
+from api.models import ExerciseCompletion, User, WorkoutPlan
+from api.services.plan_completion import advance_streak
+
+PLAN_DATA = {
+    'days': [
+        {'day_number': 1, 'exercises': [{'exercise_name': 'Squat'}, {'exercise_name': 'Lunge'}]},
+        {'day_number': 2, 'exercises': [{'exercise_name': 'Push Up'}, {'exercise_name': 'Row'}]},
+    ]
+}
+
+DAY = date(2026, 5, 4)
+
+
+class AdvanceStreakTestCase(TestCase):
+    """Test cases for the streak arithmetic"""
+
+    def test_same_day_is_unchanged(self):
+        self.assertEqual(advance_streak(3, 5, DAY, DAY), (3, 5, DAY))
+
+    def test_next_day_extends(self):
+        self.assertEqual(advance_streak(5, 5, DAY, DAY + timedelta(days=1)), (6, 6, DAY + timedelta(days=1)))
+
+    def test_gap_restarts_and_keeps_longest(self):
+        self.assertEqual(advance_streak(3, 5, DAY, DAY + timedelta(days=2)), (1, 5, DAY + timedelta(days=2)))
+        self.assertEqual(advance_streak(0, 0, None, DAY), (1, 1, DAY))
+
+
+class ProgressCountersTestCase(TestCase):
+    """Test cases for counters kept in step by the completion endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        self.plan = WorkoutPlan.objects.create(user=self.user, name='Full Body', workout_plan_data=PLAN_DATA)
+
+    def tick(self, day_number, exercise_index, on=DAY, completed=True, plan=None):
+        with mock.patch('django.utils.timezone.localdate', return_value=on):
+            return self.client.post(
+                f'/api/workout-plans/{(plan or self.plan).id}/mark_exercise_complete/',
+                data=json.dumps({'day_number': day_number, 'exercise_index': exercise_index, 'completed': completed}),
+                content_type='application/json'
+            )
+
+    def test_tick_updates_plan_and_user_counters(self):
+        data = json.loads(self.tick(1, 0).content)
+
+        self.assertEqual(data['completion_percent'], 25.0)
+        self.assertEqual(data['current_streak'], 1)
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.completion_percent, 25.0)
+        self.assertEqual(self.plan.last_completed_on, DAY)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.completed_exercise_count, 1)
+        self.assertEqual((self.user.workout_streak, self.user.longest_workout_streak), (1, 1))
+        self.assertEqual(get_cached_user(self.user.id).completed_exercise_count, 1)
+
+    def test_streaks_over_several_days(self):
+        self.tick(1, 0, on=DAY)
+        self.tick(1, 1, on=DAY + timedelta(days=1))
+        self.tick(2, 0, on=DAY + timedelta(days=1))
+        self.tick(2, 1, on=DAY + timedelta(days=3))
+
+        self.plan.refresh_from_db()
+        self.assertEqual((self.plan.current_streak, self.plan.longest_streak), (1, 2))
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.workout_streak, self.user.longest_workout_streak), (1, 2))
+        self.assertEqual(self.user.last_workout_date, DAY + timedelta(days=3))
+
+    def test_untick_lowers_counts_but_not_streaks(self):
+        self.tick(1, 0)
+        self.tick(1, 0, completed=False, on=DAY + timedelta(days=1))
+
+        self.plan.refresh_from_db()
+        self.assertEqual((self.plan.completed_exercise_count, self.plan.completion_percent), (0, 0.0))
+        self.assertEqual((self.plan.current_streak, self.plan.last_completed_on), (1, DAY))
+
+    def test_user_total_spans_plans_and_drops_deleted_plans(self):
+        other = WorkoutPlan.objects.create(user=self.user, name='Upper', workout_plan_data=PLAN_DATA)
+        self.tick(1, 0)
+        self.tick(1, 0, plan=other)
+        self.tick(1, 1, plan=other)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.completed_exercise_count, 3)
+
+        other.delete()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.completed_exercise_count, 1)
+
+    def test_batch_updates_counters(self):
+        with mock.patch('django.utils.timezone.localdate', return_value=DAY):
+            self.client.post(
+                f'/api/workout-plans/{self.plan.id}/mark_exercises_complete/',
+                data=json.dumps({'completions': [{'day_number': 1, 'exercise_index': 0}, {'day_number': 1, 'exercise_index': 1}]}),
+                content_type='application/json'
+            )
+        self.plan.refresh_from_db()
+        self.assertEqual((self.plan.completion_percent, self.plan.current_streak), (50.0, 1))
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.completed_exercise_count, self.user.workout_streak), (2, 1))
+
+    def test_editing_plan_rescales_percent(self):
+        self.tick(1, 0)
+        plan = WorkoutPlan.objects.get(pk=self.plan.pk)
+        plan.workout_plan_data = {'days': PLAN_DATA['days'][:1]}
+        plan.save()
+
+        plan.refresh_from_db()
+        self.assertEqual(plan.exercise_count, 2)
+        self.assertEqual(plan.completion_percent, 50.0)
+
+    def test_stale_user_save_keeps_counters(self):
+        stale = User.objects.get(pk=self.user.pk)
+        self.tick(1, 0)
+        stale.gender = 'female'
+        stale.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.gender, 'female')
+        self.assertEqual(self.user.completed_exercise_count, 1)
+
+    def test_list_sorts_and_filters_by_progress(self):
+        other = WorkoutPlan.objects.create(user=self.user, name='Upper', workout_plan_data=PLAN_DATA)
+        self.tick(1, 0)
+        self.tick(1, 0, plan=other)
+        self.tick(1, 1, plan=other)
+
+        results = json.loads(self.client.get('/api/workout-plans/?ordering=-completion_percent').content)['results']
+        self.assertEqual([(p['name'], p['completion_percent']) for p in results], [('Upper', 50.0), ('Full Body', 25.0)])
+        self.assertEqual(results[0]['current_streak'], 1)
+
+        results = json.loads(self.client.get('/api/workout-plans/?min_completion=30').content)['results']
+        self.assertEqual([p['name'] for p in results], ['Upper'])
+
+        for query in ['ordering=workout_plan_data', 'min_completion=lots']:
+            response = self.client.get(f'/api/workout-plans/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    def test_command_resets_stale_streaks_and_rebuilds(self):
+        self.tick(1, 0, on=DAY - timedelta(days=5))
+        WorkoutPlan.objects.filter(pk=self.plan.pk).update(completed_exercise_count=4, completion_percent=100)
+
+        out = StringIO()
+        call_command('refresh_progress_counters', '--rebuild', stdout=out)
+
+        self.assertIn('Reset 1 plan streaks and 1 user streaks', out.getvalue())
+        self.plan.refresh_from_db()
+        self.assertEqual((self.plan.completed_exercise_count, self.plan.completion_percent), (1, 25.0))
+        self.assertEqual((self.plan.current_streak, self.plan.longest_streak), (0, 1))
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.workout_streak, self.user.longest_workout_streak), (0, 1))
+
+    def test_rows_outside_the_plan_are_not_counted(self):
+        # Left by ticks that were accepted before positions were validated
+        for day_number, exercise_index in [(1, 5), (9, 0), (2, 2)]:
+            ExerciseCompletion.objects.create(
+                workout_plan=self.plan, day_number=day_number, exercise_index=exercise_index, completed=True
+            )
+        self.tick(1, 0)
+        self.plan.refresh_from_db()
+        self.assertEqual((self.plan.completed_exercise_count, self.plan.completion_percent), (1, 25.0))
+
+        WorkoutPlan.objects.filter(pk=self.plan.pk).update(completed_exercise_count=4, completion_percent=100)
+        empty = WorkoutPlan.objects.create(user=self.user, name='Empty', workout_plan_data={})
+        ExerciseCompletion.objects.create(workout_plan=empty, day_number=1, exercise_index=0, completed=True)
+        call_command('refresh_progress_counters', '--rebuild', stdout=StringIO())
+
+        self.plan.refresh_from_db()
+        self.assertEqual((self.plan.completed_exercise_count, self.plan.completion_percent), (1, 25.0))
+        empty.refresh_from_db()
+        self.assertEqual((empty.completed_exercise_count, empty.completion_percent), (0, 0))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.completed_exercise_count, 1)
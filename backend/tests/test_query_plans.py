@@ -0,0 +1,68 @@
+"""
+Query-plan regression tests for the per-user, time-ordered hot queries
+On Postgres sequential scans are disabled so the planner must show the
+index it would use once tables grow; SQLite reports its chosen index directly.
+"""
+
+import os
+import sys
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.db import connection
+from django.test import TestCase
+
+from api.models import User, Goal, NutritionLog, UserMetrics, WorkoutLog, WorkoutPlan, WorkoutPlanCompletionLog
+
+
+class HotQueryIndexTestCase(TestCase):
+    """Each hot query must be answered from its composite/partial index"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"Expected {index_name} in plan:\n{plan}")
+
+    def test_workout_logs_by_user_and_date(self):
+        self.assertUsesIndex(
+            WorkoutLog.objects.filter(user=self.user).order_by('-date_performed')[:10],
+            'workout_log_user_date_idx'
+        )
+
+    def test_nutrition_logs_by_user_and_date(self):
+        self.assertUsesIndex(
+            NutritionLog.objects.filter(user=self.user).order_by('-date_eaten')[:20],
+            'nutrition_log_user_date_idx'
+        )
+
+    def test_latest_user_metrics(self):
+        self.assertUsesIndex(
+            UserMetrics.objects.filter(user=self.user).order_by('-date_recorded')[:1],
+            'user_metrics_user_date_idx'
+        )
+
+    def test_user_completion_logs(self):
+        self.assertUsesIndex(
+            WorkoutPlanCompletionLog.objects.filter(user=self.user).order_by('-logged_at')[:20],
+            'completion_logs_user_idx'
+        )
+
+    def test_active_goals(self):
+        self.assertUsesIndex(
+            Goal.objects.filter(user=self.user, is_active=True).order_by('-created_at'),
+            'goals_user_active_idx'
+        )
+
+    def test_active_workout_plan(self):
+        self.assertUsesIndex(
+            WorkoutPlan.objects.filter(user=self.user, is_active=True),
+            'workout_plans_user_active_idx'
+        )
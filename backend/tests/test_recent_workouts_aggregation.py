@@ -0,0 +1,82 @@
+"""
+Test cases for the database-side aggregation in recent_workouts
+Log dates are set with update() because date_performed is auto_now_add
+"""
+
+import os
+import sys
+import django
+import json
+from datetime import timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import User, WorkoutLog
+
+
+class RecentWorkoutsAggregationTestCase(TestCase):
+    """Test cases for grouping, de-duplication and limits"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        self.now = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0)
+
+    def log(self, name, days_ago, minutes=0, **fields):
+        log = WorkoutLog.objects.create(user=self.user, exercise_name=name, **fields)
+        performed = self.now - timedelta(days=days_ago) + timedelta(minutes=minutes)
+        WorkoutLog.objects.filter(id=log.id).update(date_performed=performed)
+        return performed
+
+    def get(self, query=''):
+        response = self.client.get(f'/api/workout-logs/recent-workouts/{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)['recent_workouts']
+
+    def test_sessions_grouped_by_day_with_latest_distinct_exercises(self):
+        self.log('Squats', 0, minutes=0, sets_performed=3)
+        latest = self.log('squats', 0, minutes=30, sets_performed=5)
+        self.log('Lunges', 0, minutes=10)
+        self.log('Bench Press', 1)
+        self.log('Old Exercise', 40)
+
+        sessions = self.get()
+
+        self.assertEqual([s['date'] for s in sessions], [self.now.date().isoformat(), (self.now - timedelta(days=1)).date().isoformat()])
+        today = sessions[0]
+        self.assertEqual(today['timestamp'], latest.isoformat())
+        self.assertEqual([e['exercise_name'] for e in today['exercises']], ['squats', 'Lunges'])
+        self.assertEqual(today['exercises'][0]['sets_performed'], 5)
+        self.assertEqual(today['exercise_count'], 2)
+
+    def test_limit_applies_to_sessions(self):
+        for days_ago in range(6):
+            self.log(f'Exercise {days_ago}', days_ago)
+
+        sessions = self.get('?limit=3')
+
+        self.assertEqual([s['exercises'][0]['exercise_name'] for s in sessions], ['Exercise 0', 'Exercise 1', 'Exercise 2'])
+
+    def test_query_count_does_not_grow_with_log_count(self):
+        for days_ago in range(20):
+            for i in range(5):
+                self.log(f'Exercise {i}', days_ago, minutes=i)
+        self.get('?limit=2')
+
+        with CaptureQueriesContext(connection) as context:
+            sessions = self.get('?limit=2')
+
+        log_queries = [q for q in context.captured_queries if 'workout_log' in q['sql']]
+        self.assertEqual(len(log_queries), 2)
+        self.assertEqual(sum(s['exercise_count'] for s in sessions), 10)
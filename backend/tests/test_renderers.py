@@ -0,0 +1,143 @@
+"""
+Test cases for the orjson renderer and parser
+"""
+
+import os
+import sys
+import django
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.test import TestCase, Client
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.models import User, MealPlan
+from api.parsers import NDJSONParser, ORJSONParser
+from api.renderers import ORJSONRenderer
+from api.serializers import MealPlanDetailSerializer
+
+
+class ORJSONRendererTestCase(TestCase):
+    """Test cases for api.renderers.ORJSONRenderer"""
+
+    def assertRendersLikeStock(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_model_types_match_stock_renderer(self):
+        self.assertRendersLikeStock({
+            'id': uuid.uuid4(),
+            'weight': Decimal('80.50'),
+            'utc': datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=dt_timezone.utc),
+            'naive': datetime(2024, 1, 2, 3, 4, 5),
+            'day': date(2024, 1, 2),
+            'at': time(7, 30),
+            'label': gettext_lazy('Breakfast'),
+            'nested': [{1: 'int key'}, ('tuple',), 'ünïcode'],
+        })
+
+    def test_meal_plan_detail_payload_matches_stock_renderer(self):
+        user = User.objects.create(username='testuser', email='test@example.com', password_hash='x')
+        plan = MealPlan.objects.create(
+            user=user, name='Plan',
+            meal_plan_data={'days': [{'meals': [{'name': 'Oats', 'calories': 350.5, 'ingredients': ['oats']}]}]},
+        )
+        self.assertRendersLikeStock(MealPlanDetailSerializer(plan).data)
+
+    def test_indent_and_none_fall_back(self):
+        data = {'a': 1}
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+    def test_line_separators_are_escaped_like_stock(self):
+        self.assertRendersLikeStock({'note': 'line\u2028break\u2029end'})
+
+    def test_documented_float_differences(self):
+        self.assertEqual(json.loads(ORJSONRenderer().render({'x': 1e16})), {'x': 1e16})
+        self.assertEqual(ORJSONRenderer().render({'x': 1e16}), b'{"x":1e16}')
+        self.assertEqual(ORJSONRenderer().render({'x': float('nan')}), b'{"x":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({'x': float('nan')})
+
+    def test_integers_beyond_64_bits_fall_back_to_stock(self):
+        self.assertRendersLikeStock({'meal_plan_data': {'id': 2 ** 70}})
+
+    def test_big_integer_in_plan_json_is_served(self):
+        user = User.objects.create(username='testuser', email='test@example.com', password_hash='x')
+        plan = MealPlan.objects.create(user=user, name='Plan', meal_plan_data={'seed': 2 ** 70})
+        client = Client()
+        session = client.session
+        session['user_id'] = str(user.id)
+        session.save()
+
+        response = client.get(f'/api/meal-plans/{plan.id}/with_details/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['meal_plan_data']['seed'], 2 ** 70)
+
+
+class ORJSONParserTestCase(TestCase):
+    """Test cases for api.parsers.ORJSONParser"""
+
+    def test_parses_utf8(self):
+        body = json.dumps({'food_name': 'Crème brûlée', 'calories': 350.5}).encode()
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), {'food_name': 'Crème brûlée', 'calories': 350.5})
+
+    def test_rejects_invalid_json_and_nan(self):
+        for body in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+    def test_integers_beyond_64_bits_stay_exact(self):
+        body = b'{"a": 123456789012345678901234, "b": -9223372036854775809}'
+        data = ORJSONParser().parse(io.BytesIO(body))
+        self.assertEqual(data, {'a': 123456789012345678901234, 'b': -9223372036854775809})
+        self.assertIsInstance(data['a'], int)
+
+    def test_ndjson_integers_beyond_64_bits_stay_exact(self):
+        body = b'{"a": 1}\n{"a": 123456789012345678901234}\n'
+        self.assertEqual(NDJSONParser().parse(io.BytesIO(body)), [{'a': 1}, {'a': 123456789012345678901234}])
+
+    def test_other_encodings_use_stock_parser(self):
+        body = '{"food_name": "Crème"}'.encode('latin-1')
+        data = ORJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(data, {'food_name': 'Crème'})
+
+
+class JSONApiTestCase(TestCase):
+    """The configured renderer/parser through the API"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='x')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+
+    def test_json_round_trip(self):
+        response = self.client.post(
+            '/api/goals/',
+            json.dumps({'user': str(self.user.id), 'goal_type': 'weight_loss', 'title': 'Cut', 'target_weight_kg': '70.50'}),
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['goal_type'], 'weight_loss')
+
+    def test_malformed_json_is_400(self):
+        response = self.client.post('/api/goals/', '{"goal_type": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('JSON parse error', response.json()['detail'])
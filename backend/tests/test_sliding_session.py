@@ -0,0 +1,72 @@
+"""
+Test cases for sliding session expiry
+Covers that authenticated requests only re-save the session near expiry
+"""
+
+import os
+import sys
+import time
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+
+from api.middleware import SESSION_REFRESHED_AT_KEY
+from api.models import User
+
+
+def session_writes(context):
+    return [
+        q['sql'] for q in context.captured_queries
+        if 'django_session' in q['sql'] and not q['sql'].startswith('SELECT')
+    ]
+
+
+class SlidingSessionTestCase(TestCase):
+    """Test cases for SlidingSessionMiddleware"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+
+    def set_refreshed_at(self, timestamp):
+        session = self.client.session
+        session[SESSION_REFRESHED_AT_KEY] = timestamp
+        session.save()
+
+    def test_fresh_session_is_not_rewritten(self):
+        self.set_refreshed_at(int(time.time()))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/goals/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session_writes(context), [])
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_session_near_expiry_is_refreshed(self):
+        stale = int(time.time()) - (settings.SESSION_COOKIE_AGE - settings.SESSION_REFRESH_THRESHOLD) - 60
+        self.set_refreshed_at(stale)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/goals/')
+
+        self.assertNotEqual(session_writes(context), [])
+        self.assertIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertGreater(self.client.session[SESSION_REFRESHED_AT_KEY], stale)
+        self.assertEqual(self.client.session['user_id'], str(self.user.id))
+
+    def test_anonymous_requests_do_not_create_sessions(self):
+        client = Client()
+        response = client.get('/api/health/')
+
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
@@ -0,0 +1,134 @@
+"""
+Test cases for the training volume analytics endpoint
+"""
+
+import os
+import sys
+import django
+import json
+import unittest
+from unittest import mock
+from datetime import datetime, time, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import User, WorkoutLog
+from api.services import timeseries
+from api.services.training_analytics import period_start
+
+
+class TrainingVolumeTestCase(TestCase):
+    """Test cases for GET /api/workout-logs/volume/"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create(username='testuser', email='test@example.com', password_hash='test_hash')
+        session = self.client.session
+        session['user_id'] = str(self.user.id)
+        session.save()
+        self.this_week = period_start(timezone.localdate(), 'week')
+
+    def log(self, weeks_ago, name, sets, reps, rpe=None, **fields):
+        day = self.this_week - timedelta(weeks=weeks_ago) + timedelta(days=1)
+        return WorkoutLog.objects.create(
+            user=self.user, exercise_name=name, sets_performed=sets, reps_performed=reps, perceived_effort=rpe,
+            date_performed=timezone.make_aware(datetime.combine(day, time(9))), **fields
+        )
+
+    def get(self, query=''):
+        response = self.client.get(f'/api/workout-logs/volume/{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content)
+
+    def test_weekly_buckets(self):
+        self.log(0, 'Squat', 5, 5, rpe=8, duration_minutes=30, calories_burned=200)
+        self.log(0, 'Bench', 3, 10, rpe=6)
+        self.log(2, 'Squat', 3, 5)
+        self.log(20, 'Squat', 10, 10)  # outside the window
+
+        data = self.get('?periods=4')
+
+        self.assertEqual([b['period_start'] for b in data['buckets']],
+                         [str(self.this_week - timedelta(weeks=n)) for n in (3, 2, 1, 0)])
+        self.assertEqual([b['volume'] for b in data['buckets']], [0, 15, 0, 55])
+        current = data['buckets'][-1]
+        self.assertEqual(current['sets'], 8)
+        self.assertEqual(current['duration_minutes'], 30)
+        self.assertEqual(current['calories_burned'], 200)
+        self.assertEqual(current['avg_rpe'], 7)
+        self.assertEqual(current['log_count'], 2)
+        self.assertEqual([(e['exercise_name'], e['volume']) for e in data['exercises']], [('Squat', 40), ('Bench', 30)])
+
+    def test_monthly_period(self):
+        self.log(0, 'Squat', 5, 5)
+        data = self.get('?period=month&periods=3')
+        self.assertEqual(len(data['buckets']), 3)
+        self.assertEqual(data['buckets'][-1]['period_start'], str(timezone.localdate().replace(day=1)))
+        self.assertEqual(sum(b['volume'] for b in data['buckets']), 25)
+
+    def test_query_count_does_not_grow_with_history(self):
+        for weeks_ago in range(60):
+            self.log(weeks_ago, 'Row', 3, 10)
+        with CaptureQueriesContext(connection) as context:
+            self.get('?periods=52')
+        self.assertLessEqual(len([q for q in context.captured_queries if 'workout_log' in q['sql']]), 2)
+
+    def test_cached_until_logs_change(self):
+        self.log(0, 'Squat', 5, 5)
+        self.assertEqual(self.get()['buckets'][-1]['volume'], 25)
+
+        with CaptureQueriesContext(connection) as context:
+            self.get()
+        self.assertFalse([q for q in context.captured_queries if 'workout_log' in q['sql']])
+
+        self.log(0, 'Squat', 1, 5)
+        self.assertEqual(self.get()['buckets'][-1]['volume'], 30)
+
+    def test_trend(self):
+        for weeks_ago, reps in [(3, 10), (2, 20), (1, 30), (0, 40)]:
+            self.log(weeks_ago, 'Squat', 1, reps)
+        trend = self.get('?periods=4&trend=true')['trend']
+        self.assertEqual(trend['rolling_average'], [None, None, None, 25.0])
+        self.assertEqual(trend['slope'], 10.0)
+
+    def test_invalid_params(self):
+        for query in ['?period=year', '?periods=0', '?periods=abc', '?periods=500']:
+            response = self.client.get(f'/api/workout-logs/volume/{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+
+class TimeseriesTestCase(unittest.TestCase):
+    """The NumPy and pure Python paths of api.services.timeseries agree"""
+
+    volumes = [120, 0, 150, 180, 90, 210, 240]
+
+    def test_python_path(self):
+        with mock.patch.object(timeseries, 'np', None):
+            slope, _ = timeseries.linear_fit(list(range(7)), self.volumes)
+            rolling = timeseries.rolling_mean(self.volumes, 3)
+        self.assertAlmostEqual(slope, 25.714, places=3)
+        self.assertEqual(rolling, [None, None, 90.0, 110.0, 140.0, 160.0, 180.0])
+
+    @unittest.skipIf(timeseries.np is None, 'NumPy is not installed')
+    def test_numpy_matches_python(self):
+        xs = list(range(100))
+        ys = [x * 1.5 + (x % 7) for x in xs]
+        with mock.patch.object(timeseries, 'np', None):
+            expected = (timeseries.linear_fit(xs, ys), timeseries.rolling_mean(ys, 5))
+        slope, intercept = timeseries.linear_fit(xs, ys)
+        self.assertAlmostEqual(slope, expected[0][0])
+        self.assertAlmostEqual(intercept, expected[0][1])
+        for actual, wanted in zip(timeseries.rolling_mean(ys, 5), expected[1]):
+            self.assertEqual(actual is None, wanted is None)
+            if actual is not None:
+                self.assertAlmostEqual(actual, wanted)
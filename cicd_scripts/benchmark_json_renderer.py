@@ -0,0 +1,108 @@
+"""
+Compare the stock DRF JSONRenderer with api.renderers.ORJSONRenderer on
+MealPlanDetailSerializer payloads.
+
+Builds an in-memory meal plan (days x 3 meals x ingredients, nothing is
+written to the database), serializes it once and times rendering it with
+each renderer. Prints the median render time, bytes per response and the
+speedup, and checks both renderers produce equivalent JSON (the bytes may
+differ, e.g. in float formatting).
+
+Usage: python cicd_scripts/benchmark_json_renderer.py [days] [ingredients_per_meal] [iterations]
+"""
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from decimal import Decimal
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.models import MealPlan, User  # noqa: E402
+from api.renderers import ORJSONRenderer  # noqa: E402
+from api.serializers import MealPlanDetailSerializer  # noqa: E402
+
+DAYS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+INGREDIENTS = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+ITERATIONS = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+
+def build_meal_plan(days, ingredients):
+    def meal(day, meal_type):
+        return {
+            'id': str(uuid.uuid4()),
+            'meal_type': meal_type,
+            'name': f'Day {day} {meal_type} bowl',
+            'description': 'High-protein bowl with seasonal vegetables and a light dressing. ' * 2,
+            'calories': 520 + day,
+            'macros': {'protein': 38.5, 'carbs': 54.25, 'fat': 16.75, 'fiber': 9.5},
+            'prep_time_minutes': 15,
+            'cook_time_minutes': 20,
+            'ingredients': [
+                {'name': f'Ingredient {i}', 'quantity': 120 + i, 'unit': 'g', 'calories': 45.5 + i, 'notes': 'chopped'}
+                for i in range(ingredients)
+            ],
+            'instructions': [f'Step {step}: prepare and combine the ingredients carefully.' for step in range(1, 7)],
+            'tags': ['high-protein', 'gluten-free', 'meal-prep'],
+        }
+
+    user = User(id=uuid.uuid4(), username='benchmark', email='benchmark@example.com')
+    return MealPlan(
+        id=uuid.uuid4(),
+        user=user,
+        name='Benchmark plan',
+        description='Synthetic plan for renderer benchmarks',
+        meal_plan_data={
+            'days': [
+                {'day': day, 'meals': [meal(day, t) for t in ('breakfast', 'lunch', 'dinner')],
+                 'daily_totals': {'calories': 1850, 'protein': 140}}
+                for day in range(1, days + 1)
+            ],
+            'generated_at': timezone.now().isoformat(),
+        },
+        daily_calorie_target=1850,
+        days_count=days,
+        dietary_preferences=['high-protein'],
+        goal='muscle_gain',
+        created_at=timezone.now(),
+    )
+
+
+def time_render(renderer, data, iterations):
+    samples = []
+    output = b''
+    for _ in range(iterations):
+        start = time.perf_counter()
+        output = renderer.render(data, 'application/json', {})
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, output
+
+
+data = MealPlanDetailSerializer(build_meal_plan(DAYS, INGREDIENTS)).data
+# Raw model values the serializers normally stringify, to exercise the fallbacks
+data['benchmark_raw'] = {'uuid': uuid.uuid4(), 'decimal': Decimal('12.50'), 'datetime': timezone.now()}
+
+stock_ms, stock_bytes = time_render(JSONRenderer(), data, ITERATIONS)
+fast_ms, fast_bytes = time_render(ORJSONRenderer(), data, ITERATIONS)
+
+print(f"MealPlanDetailSerializer payload: {DAYS} days x 3 meals x {INGREDIENTS} ingredients, {ITERATIONS} renders")
+print(f"  {'renderer':<16}{'median ms':>12}{'bytes':>12}")
+print(f"  {'JSONRenderer':<16}{stock_ms:>12.3f}{len(stock_bytes):>12}")
+print(f"  {'ORJSONRenderer':<16}{fast_ms:>12.3f}{len(fast_bytes):>12}")
+print(f"  speedup: {stock_ms / fast_ms:.1f}x")
+
+if json.loads(stock_bytes) != json.loads(fast_bytes):
+    print('❌ Renderers produced different JSON')
+    sys.exit(1)
+print('✅ Renderers produced equivalent JSON')
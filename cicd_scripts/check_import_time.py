@@ -0,0 +1,61 @@
+"""
+Measure backend cold-start import time with ``python -X importtime``.
+
+Runs django.setup() and loads the URLconf in a fresh interpreter, prints the
+slowest imports and fails if the total exceeds the budget or if a module that
+should be imported lazily (the Gemini SDK / gRPC) was pulled in at startup.
+
+Usage: python cicd_scripts/check_import_time.py [budget_ms] [top_n]
+"""
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+BUDGET_MS = float(sys.argv[1]) if len(sys.argv) > 1 else 1500
+TOP_N = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+FORBIDDEN_PREFIXES = ('google.generativeai', 'grpc')
+
+STARTUP_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+env = dict(os.environ)
+env.setdefault('DJANGO_SETTINGS_MODULE', 'easyfitness_backend.settings')
+proc = subprocess.run(
+    [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+    cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+)
+if proc.returncode != 0:
+    print(proc.stderr)
+    sys.exit(proc.returncode)
+
+# Lines look like: "import time:  self [us] | cumulative | imported package"
+imports = []
+for line in proc.stderr.splitlines():
+    if not line.startswith('import time:') or 'imported package' in line:
+        continue
+    self_us, cumulative_us, name = line.split(':', 1)[1].split('|', 2)
+    imports.append((name[1:], int(self_us) / 1000, int(cumulative_us) / 1000))
+
+# Top-level imports (no leading indentation in the name column) sum to the total
+total_ms = sum(cumulative for name, _, cumulative in imports if not name.startswith(' '))
+names = {name.strip() for name, _, _ in imports}
+forbidden = sorted(n for n in names if n.startswith(FORBIDDEN_PREFIXES))
+
+print(f"Backend startup imports: {total_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)")
+print(f"\nTop {TOP_N} imports by cumulative time:")
+for name, self_ms, cumulative_ms in sorted(imports, key=lambda i: i[2], reverse=True)[:TOP_N]:
+    print(f"  {cumulative_ms:8.1f} ms  {self_ms:7.1f} ms self  {name.strip()}")
+
+failed = False
+if forbidden:
+    print(f"\n❌ Eagerly imported modules that should be lazy: {', '.join(forbidden[:5])}")
+    failed = True
+if total_ms > BUDGET_MS:
+    print(f"\n❌ Startup import time {total_ms:.0f} ms exceeds budget of {BUDGET_MS:.0f} ms")
+    failed = True
+if not failed:
+    print("\n✅ Startup import time within budget")
+sys.exit(1 if failed else 0)
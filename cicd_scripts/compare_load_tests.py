@@ -0,0 +1,62 @@
+"""
+Compare two load_test.py result files (e.g. before/after a configuration change).
+
+Usage: python cicd_scripts/compare_load_tests.py <before.json> <after.json>
+
+Example (connection pooling benchmark):
+    DB_POOL_MODE=none       -> LOAD_TEST_LABEL=before python3 load_test.py auth
+    DB_POOL_MODE=persistent -> LOAD_TEST_LABEL=after  python3 load_test.py auth
+    python cicd_scripts/compare_load_tests.py load_test_results_authenticated_before.json \\
+        load_test_results_authenticated_after.json
+"""
+import json
+import statistics
+import sys
+
+if len(sys.argv) != 3:
+    print(__doc__)
+    sys.exit(1)
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def endpoint_averages(results):
+    times = {}
+    for r in results['detailed_results']:
+        if r['success']:
+            times.setdefault(f"{r['method']} {r['endpoint']}", []).append(r['response_time_ms'])
+    return {key: statistics.mean(values) for key, values in times.items()}
+
+
+def change(before, after):
+    if not before:
+        return 'n/a'
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+before = load(sys.argv[1])
+after = load(sys.argv[2])
+
+rows = [
+    ('Requests/Second', before['summary']['requests_per_second'], after['summary']['requests_per_second']),
+    ('Avg Response (ms)', before['statistics']['average_response_time_ms'], after['statistics']['average_response_time_ms']),
+    ('Median Response (ms)', before['statistics']['median_response_time_ms'], after['statistics']['median_response_time_ms']),
+    ('Max Response (ms)', before['statistics']['max_response_time_ms'], after['statistics']['max_response_time_ms']),
+    ('Successful Requests', before['summary']['successful_requests'], after['summary']['successful_requests']),
+]
+
+print(f"{'Metric':<24} {'Before':>12} {'After':>12} {'Change':>10}")
+print(f"{'-'*24} {'-'*12} {'-'*12} {'-'*10}")
+for name, b, a in rows:
+    print(f"{name:<24} {b:>12.2f} {a:>12.2f} {change(b, a):>10}")
+
+before_endpoints = endpoint_averages(before)
+after_endpoints = endpoint_averages(after)
+print(f"\n{'Endpoint':<40} {'Before (ms)':>12} {'After (ms)':>12} {'Change':>10}")
+print(f"{'-'*40} {'-'*12} {'-'*12} {'-'*10}")
+for key in sorted(set(before_endpoints) & set(after_endpoints)):
+    b, a = before_endpoints[key], after_endpoints[key]
+    print(f"{key:<40} {b:>12.2f} {a:>12.2f} {change(b, a):>10}")
@@ -89,6 +89,19 @@ export interface WorkoutPlan {
   created_at: string;
 }
 
+export interface ExerciseCompletionUpdate {
+  workout_plan_id: string;
+  completion: {
+    day_number: number;
+    exercise_index: number;
+    completed: boolean;
+    completed_at: string | null;
+  };
+  completed_exercise_count: number;
+  exercise_count: number;
+  completion_percent: number;
+}
+
 export interface CompletionLog {
   id: string;
   action: 'completed' | 'incomplete';
@@ -338,7 +351,7 @@ export async function markExerciseComplete(
   dayNumber: number,
   exerciseIndex: number,
   completed: boolean = true
-): Promise<WorkoutPlan> {
+): Promise<ExerciseCompletionUpdate> {
   try {
     const response = await fetch(`${API_BASE_URL}/workout-plans/${planId}/mark_exercise_complete/`, {
       method: 'POST',
@@ -358,8 +371,7 @@ export async function markExerciseComplete(
       throw new Error(`Failed to mark exercise as complete: ${JSON.stringify(errorData)}`);
     }
 
-    const data = await response.json();
-    return data.workout_plan;
+    return await response.json();
   } catch (error) {
     console.error('Error marking exercise as complete:', error);
     throw error;
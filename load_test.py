@@ -13,10 +13,13 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Tuple
 from datetime import datetime
 import json
+import os
 import uuid
 
 # Configuration
-BASE_URL = "http://localhost:8000/api"
+BASE_URL = os.environ.get("LOAD_TEST_BASE_URL", "http://localhost:8000/api")
+# Optional suffix for the results file, e.g. LOAD_TEST_LABEL=before-pooling
+RESULTS_LABEL = os.environ.get("LOAD_TEST_LABEL", "")
 CONCURRENT_USERS = 20
 REQUESTS_PER_USER = 5
 
@@ -329,10 +332,12 @@ class LoadTester:
 
         # Save detailed results to JSON
         mode_suffix = "authenticated" if self.authenticated else "unauthenticated"
-        filename = f'/Users/ivanflores/capstone/load_test_results_{mode_suffix}.json'
+        if RESULTS_LABEL:
+            mode_suffix += f"_{RESULTS_LABEL}"
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), f'load_test_results_{mode_suffix}.json')
 
         print(f"\n{'='*80}")
-        print(f"💾 Saving detailed results to {filename.split('/')[-1]}")
+        print(f"💾 Saving detailed results to {os.path.basename(filename)}")
 
         with open(filename, 'w') as f:
             json.dump({